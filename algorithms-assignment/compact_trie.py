@@ -0,0 +1,291 @@
+import os
+import threading
+from array import array
+from bisect import bisect_left
+
+from practical import (
+    DICTIONARY_FILE_LOC,
+    MORSE_SYMBOL_INDEX,
+    load_morse_dictionary,
+)
+
+
+class CompactMorseTrie:
+    """
+    A minimized (DAWG) Morse trie stored in flat arrays instead of TrieNode objects.
+
+    Nodes are integers. The children of node n are the edges child_offsets[n]..child_offsets[n + 1],
+    sorted by symbol; each edge has a symbol (index in MORSE_SYMBOLS) and a target node.
+    Shared suffixes are merged, so a node no longer identifies a single word. Words are
+    numbered by the order of their Morse code (perfect hashing): walking from the root, the
+    number of a word is the number of words that sort before it, accumulated from the
+    word_counts of the skipped siblings. The words themselves live in a separate string table.
+
+    Attributes:
+        child_offsets (array): uint32[node_count + 1], start of each node's edges.
+        child_symbols (array): uint8[edge_count], symbol index of each edge.
+        child_nodes (array): uint32[edge_count], target node of each edge.
+        is_final (bytearray): 1 if a word ends at the node.
+        word_counts (array): uint32[node_count], number of words ending at or below the node.
+        word_offsets (array): uint32[word_count + 1], start of each word in word_table.
+        word_table (bytes): all words, concatenated in Morse code order.
+        root (int): The root node.
+    """
+
+    def __init__(self, dictionary: list[tuple[str, list[str]]]):
+        """
+        Builds the minimized trie from the same (word, morse_code) pairs as build_morse_trie.
+        As in build_morse_trie, a later word with the same Morse code replaces an earlier one.
+
+        Args:
+            dictionary (list[tuple[str, list[str]]]): A list of tuples containing English words and their Morse code.
+        """
+        words_by_code = {}
+        for english_word, morse_code in dictionary:
+            code = bytes(MORSE_SYMBOL_INDEX[letter] for letter in morse_code)
+            words_by_code[code] = english_word
+        sorted_codes = sorted(words_by_code)
+
+        node_edges, node_final, root = self._build_minimized(sorted_codes)
+
+        self.child_offsets = array("I", [0])
+        self.child_symbols = array("B")
+        self.child_nodes = array("I")
+        self.is_final = bytearray(node_final)
+        self.word_counts = array("I", bytes(4 * len(node_edges)))
+        for node, edges in enumerate(node_edges):
+            word_count = node_final[node]
+            for symbol, child in edges:
+                self.child_symbols.append(symbol)
+                self.child_nodes.append(child)
+                # children are numbered before their parents
+                word_count += self.word_counts[child]
+            self.child_offsets.append(len(self.child_nodes))
+            self.word_counts[node] = word_count
+        self.root = root
+
+        encoded_words = [words_by_code[code].encode() for code in sorted_codes]
+        self.word_offsets = array("I", [0])
+        position = 0
+        for encoded_word in encoded_words:
+            position += len(encoded_word)
+            self.word_offsets.append(position)
+        self.word_table = b"".join(encoded_words)
+
+    @staticmethod
+    def _build_minimized(sorted_codes: list[bytes]) -> tuple[list, list, int]:
+        """
+        Incremental construction of a minimal automaton from sorted input (Daciuk et al.).
+
+        Only the path of the last inserted code is kept as mutable nodes; every other node
+        is registered by its signature (final flag, edges) so equal subtrees are shared.
+
+        Returns:
+            tuple[list, list, int]: Edges of each node as ((symbol, child), ...), the final
+            flag of each node, and the root node.
+        """
+        node_edges = []
+        node_final = []
+        register = {}
+
+        def register_node(node) -> int:
+            final, edges = node
+            # codes arrive sorted, so edges were inserted in increasing symbol order
+            signature = (final, tuple(edges.items()))
+            node_id = register.get(signature)
+            if node_id is None:
+                node_id = len(node_edges)
+                register[signature] = node_id
+                node_edges.append(signature[1])
+                node_final.append(final)
+            return node_id
+
+        # a mutable node is [is_final, {symbol: child node id or mutable node}]
+        root = [0, {}]
+        # (parent, symbol, child) for every node on the last inserted path
+        unchecked = []
+
+        def minimize(down_to: int):
+            while len(unchecked) > down_to:
+                parent, symbol, child = unchecked.pop()
+                parent[1][symbol] = register_node(child)
+
+        previous_code = b""
+        for code in sorted_codes:
+            common_prefix = 0
+            for a, b in zip(code, previous_code):
+                if a != b:
+                    break
+                common_prefix += 1
+            minimize(common_prefix)
+
+            node = unchecked[-1][2] if unchecked else root
+            for symbol in code[common_prefix:]:
+                next_node = [0, {}]
+                node[1][symbol] = next_node
+                unchecked.append((node, symbol, next_node))
+                node = next_node
+            node[0] = 1
+            previous_code = code
+
+        minimize(0)
+        return node_edges, node_final, register_node(root)
+
+    def __len__(self) -> int:
+        return len(self.word_offsets) - 1
+
+    @property
+    def node_count(self) -> int:
+        return len(self.is_final)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of all arrays and tables in bytes"""
+        return (
+            sum(
+                len(values) * values.itemsize
+                for values in (
+                    self.child_offsets,
+                    self.child_symbols,
+                    self.child_nodes,
+                    self.word_counts,
+                    self.word_offsets,
+                )
+            )
+            + len(self.is_final)
+            + len(self.word_table)
+        )
+
+    def child(self, node: int, symbol: int, rank: int) -> tuple[int, int]:
+        """
+        Follows the edge labelled `symbol` out of `node`.
+
+        Args:
+            node (int): The current node.
+            symbol (int): The symbol index (position in MORSE_SYMBOLS).
+            rank (int): The number of words sorting before the current node's subtree.
+
+        Returns:
+            tuple[int, int]: The child node and its rank, or (-1, -1) if there is no such edge.
+        """
+        start, end = self.child_offsets[node], self.child_offsets[node + 1]
+        edge = bisect_left(self.child_symbols, symbol, start, end)
+        if edge == end or self.child_symbols[edge] != symbol:
+            return -1, -1
+        rank += self.is_final[node]
+        for sibling in range(start, edge):
+            rank += self.word_counts[self.child_nodes[sibling]]
+        return self.child_nodes[edge], rank
+
+    def word_at(self, rank: int) -> str:
+        """
+        Returns a word from the string table.
+
+        Args:
+            rank (int): The number of the word (its position in Morse code order).
+
+        Returns:
+            str: The word.
+        """
+        return self.word_table[
+            self.word_offsets[rank] : self.word_offsets[rank + 1]
+        ].decode()
+
+    def lookup(self, morse_code: list[str]) -> str:
+        """
+        Returns the dictionary word with the given Morse code.
+
+        Args:
+            morse_code (list[str]): The Morse code of each letter.
+
+        Returns:
+            str: The word, or None if no dictionary word has this code.
+        """
+        node, rank = self.root, 0
+        for letter in morse_code:
+            symbol = MORSE_SYMBOL_INDEX.get(letter)
+            if symbol is None:
+                return None
+            node, rank = self.child(node, symbol, rank)
+            if node == -1:
+                return None
+        return self.word_at(rank) if self.is_final[node] else None
+
+    def __contains__(self, morse_code: list[str]) -> bool:
+        return self.lookup(morse_code) is not None
+
+
+def generate_morse_strings_with_compact_trie(
+    morse_sequence: list[str], trie: CompactMorseTrie
+) -> list[str]:
+    """
+    Same as practical.generate_morse_strings_with_trie, over a CompactMorseTrie.
+
+    Args:
+        morse_sequence (list[str]): The morse code sequence, with 'x' for the unknown symbols.
+        trie (CompactMorseTrie): The compact trie of the morse code dictionary.
+
+    Returns:
+        list: A list of English words formed by translating the morse code sequence.
+    """
+    # the two candidate symbols of each letter, dash first as in the TrieNode version
+    candidates = []
+    for letter in morse_sequence:
+        letter_candidates = []
+        for candidate in (letter.replace("x", "-"), letter.replace("x", ".")):
+            symbol = MORSE_SYMBOL_INDEX.get(candidate)
+            if symbol is not None and symbol not in letter_candidates:
+                letter_candidates.append(symbol)
+        candidates.append(letter_candidates)
+
+    result = []
+    stack = [(0, trie.root, 0)]
+    while stack:
+        index, node, rank = stack.pop()
+        if index == len(morse_sequence):
+            if trie.is_final[node]:
+                result.append(trie.word_at(rank))
+            continue
+        # pushed in reverse so the dash branch is explored first
+        for symbol in reversed(candidates[index]):
+            child, child_rank = trie.child(node, symbol, rank)
+            if child != -1:
+                stack.append((index + 1, child, child_rank))
+    return result
+
+
+# dictionary file path -> compact trie, filled lazily like practical.get_morse_trie
+_compact_trie_cache = {}
+_compact_trie_lock = threading.Lock()
+
+
+def get_compact_morse_trie(
+    dictionary_file_loc: str = DICTIONARY_FILE_LOC,
+) -> CompactMorseTrie:
+    """
+    Returns the shared compact trie of the dictionary, building it on the first call only.
+
+    Args:
+        dictionary_file_loc (str): The path of the dictionary file.
+
+    Returns:
+        CompactMorseTrie: The compact trie of the dictionary.
+    """
+    key = os.path.abspath(dictionary_file_loc)
+    trie = _compact_trie_cache.get(key)
+    if trie is None:
+        with _compact_trie_lock:
+            trie = _compact_trie_cache.get(key)
+            if trie is None:
+                trie = CompactMorseTrie(load_morse_dictionary(dictionary_file_loc))
+                _compact_trie_cache[key] = trie
+    return trie
+
+
+def compactMorsePartialDecode(inputStringList: list[str]) -> list[str]:
+    """
+    Same as practical.morsePartialDecode, answered from the compact trie of './dictionary.txt'.
+    """
+    return generate_morse_strings_with_compact_trie(
+        inputStringList, get_compact_morse_trie()
+    )
@@ -0,0 +1,74 @@
+import os
+import random
+from collections import deque
+
+import pytest
+
+import practical
+from practical import Maze
+
+ASSIGNMENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SMALL_DICTIONARY = ["test", "eese", "dance", "a", "an", "tea", "eat", "ate", "Tea"]
+
+
+@pytest.fixture
+def assignment_dir(monkeypatch):
+    """Runs a test from this directory, where './dictionary.txt' is"""
+    monkeypatch.chdir(ASSIGNMENT_DIR)
+
+
+@pytest.fixture
+def small_dictionary(tmp_path) -> str:
+    """Writes a small dictionary file and forgets the cached tries built from it"""
+    dictionary_file_loc = str(tmp_path / "dictionary.txt")
+    with open(dictionary_file_loc, "w") as f:
+        f.write("\n".join(SMALL_DICTIONARY) + "\n")
+    yield dictionary_file_loc
+    practical._morse_trie_cache.pop(os.path.abspath(dictionary_file_loc), None)
+    practical._morse_suffix_index_cache.pop(os.path.abspath(dictionary_file_loc), None)
+
+
+def random_grid(grid_height: int, grid_width: int, seed: int, wall_ratio: float = 0.3):
+    """Draws a grid of cell values (1 for a wall), row by row"""
+    rng = random.Random(seed)
+    return [
+        [1 if rng.random() < wall_ratio else 0 for _ in range(grid_width)]
+        for _ in range(grid_height)
+    ]
+
+
+def maze_from_grid(grid: list[list[int]]) -> Maze:
+    maze = Maze()
+    for x, row in enumerate(grid):
+        for y, block_type in enumerate(row):
+            maze.addCoordinate(x, y, block_type)
+    return maze
+
+
+def shortest_route_length(grid: list[list[int]], start: tuple, destination: tuple) -> int:
+    """Number of cells of a shortest route over the open cells, 0 if there is none"""
+    distances = {start: 1}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        if (x, y) == destination:
+            return distances[(x, y)]
+        for next_x, next_y in ((x - 1, y), (x, y + 1), (x + 1, y), (x, y - 1)):
+            if (
+                0 <= next_x < len(grid)
+                and 0 <= next_y < len(grid[0])
+                and grid[next_x][next_y] == 0
+                and (next_x, next_y) not in distances
+            ):
+                distances[(next_x, next_y)] = distances[(x, y)] + 1
+                queue.append((next_x, next_y))
+    return 0
+
+
+def assert_valid_route(grid: list[list[int]], route: list, start: tuple, destination: tuple):
+    """Checks a route goes from start to destination in unit steps over open cells"""
+    assert route[0] == start and route[-1] == destination
+    for (x, y), (next_x, next_y) in zip(route, route[1:]):
+        assert abs(x - next_x) + abs(y - next_y) == 1
+        assert grid[next_x][next_y] == 0
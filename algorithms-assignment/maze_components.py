@@ -0,0 +1,282 @@
+import re
+from array import array
+
+from practical import OPEN_SPACE, Maze, MazeGridListener
+
+# runs of open cells in a row of the grid
+OPEN_RUN_PATTERN = re.compile(re.escape(bytes([OPEN_SPACE])) + b"+")
+
+# component label of walls (and of every cell while the labels are being built)
+NO_COMPONENT = 0
+
+
+class MazeComponents(MazeGridListener):
+    """
+    Connected-component labelling of the open cells of a Maze.
+
+    labels holds, for every node hash value, the id of the component of the cell
+    (NO_COMPONENT for walls), so whether two cells are connected is a single comparison.
+
+    The labelling is built from the runs of open cells of every row: runs overlapping
+    a run of the previous row are joined with union-find, then each run's label is
+    written with one slice assignment. It is then kept up to date as the grid changes:
+    - opening a cell joins the components around it, relabelling the smaller ones;
+    - closing a cell shrinks its component, unless it may split it (its open neighbours
+      aren't connected through the 8 cells around it): then the labelling is marked stale
+      and rebuilt by the next query;
+    - a resize that changes the row stride marks the labelling stale too.
+
+    Attributes:
+        maze (Maze): The maze.
+        labels (array): The component id of every node, None while stale.
+        sizes (dict): The number of cells of every component, by id.
+    """
+
+    def __init__(self, maze: Maze):
+        self.maze = maze
+        self.labels = None
+        self.sizes = {}
+        self.next_component_id = NO_COMPONENT + 1
+        maze.add_grid_listener(self)
+
+    def close(self):
+        """Stops following the changes of the maze."""
+        self.maze.remove_grid_listener(self)
+
+    def ensure_labels(self) -> array:
+        """
+        Returns the labels, rebuilding them first if they are stale.
+
+        Returns:
+            array: The component id of every node.
+        """
+        if self.labels is None:
+            self.build_labels()
+        return self.labels
+
+    def build_labels(self):
+        """Labels every open cell of the maze, from the runs of open cells of its rows."""
+        maze = self.maze
+        cells, row_stride = maze.cells, maze.row_stride
+
+        # union-find over the runs, which are numbered in row order
+        run_parents = array("i")
+        run_starts = array("q")
+        run_ends = array("q")
+
+        def find(run: int) -> int:
+            root = run
+            while run_parents[root] != root:
+                root = run_parents[root]
+            while run_parents[run] != root:
+                run_parents[run], run = root, run_parents[run]
+            return root
+
+        previous_row_runs = range(0)
+        for x in range(maze.grid_height):
+            row_start = (x + 1) * row_stride + 1
+            first_run = len(run_starts)
+            row_end = row_start + maze.grid_width
+            for match in OPEN_RUN_PATTERN.finditer(cells, row_start, row_end):
+                run = len(run_starts)
+                run_parents.append(run)
+                run_starts.append(match.start())
+                run_ends.append(match.end())
+            row_runs = range(first_run, len(run_starts))
+
+            # two pointer sweep over the runs of both rows, joining the overlapping ones
+            above_runs, above_index, index = previous_row_runs, 0, 0
+            while above_index < len(above_runs) and index < len(row_runs):
+                above_run, run = above_runs[above_index], row_runs[index]
+                above_start = run_starts[above_run] + row_stride
+                above_end = run_ends[above_run] + row_stride
+                if above_start < run_ends[run] and run_starts[run] < above_end:
+                    above_root, root = find(above_run), find(run)
+                    if above_root != root:
+                        run_parents[max(above_root, root)] = min(above_root, root)
+                if above_end <= run_ends[run]:
+                    above_index += 1
+                else:
+                    index += 1
+            previous_row_runs = row_runs
+
+        labels = array("i", bytes(4 * len(cells)))
+        sizes = {}
+        component_ids = {}
+        for run in range(len(run_starts)):
+            root = find(run)
+            component_id = component_ids.get(root)
+            if component_id is None:
+                component_id = component_ids[root] = len(component_ids) + 1
+                sizes[component_id] = 0
+            start, end = run_starts[run], run_ends[run]
+            labels[start:end] = array("i", [component_id]) * (end - start)
+            sizes[component_id] += end - start
+
+        self.labels = labels
+        self.sizes = sizes
+        self.next_component_id = len(component_ids) + 1
+
+    def component_of(self, node_hash_value: int) -> int:
+        """
+        Returns the component id of a node.
+
+        Args:
+            node_hash_value (int): The hash value of the node.
+
+        Returns:
+            int: The component id, NO_COMPONENT for walls.
+        """
+        return self.ensure_labels()[node_hash_value]
+
+    def is_connected(self, start_node: int, destination_node: int) -> bool:
+        """
+        Check if there is a route between two open nodes.
+
+        Args:
+            start_node (int): The hash value of the start node.
+            destination_node (int): The hash value of the destination node.
+
+        Returns:
+            bool: True if both nodes are open and in the same component, False otherwise.
+        """
+        labels = self.ensure_labels()
+        return (
+            labels[start_node] != NO_COMPONENT
+            and labels[start_node] == labels[destination_node]
+        )
+
+    def component_size(self, node_hash_value: int) -> int:
+        """
+        Returns the number of open cells reachable from a node, itself included.
+
+        Args:
+            node_hash_value (int): The hash value of the node.
+
+        Returns:
+            int: The size of the component of the node, 0 for walls.
+        """
+        component_id = self.ensure_labels()[node_hash_value]
+        return self.sizes[component_id] if component_id != NO_COMPONENT else 0
+
+    def component_count(self) -> int:
+        """
+        Returns the number of connected components of open cells.
+
+        Returns:
+            int: The number of components.
+        """
+        self.ensure_labels()
+        return len(self.sizes)
+
+    def component_sizes(self) -> list[int]:
+        """
+        Returns the sizes of every component, largest first.
+
+        Returns:
+            list[int]: The component sizes.
+        """
+        self.ensure_labels()
+        return sorted(self.sizes.values(), reverse=True)
+
+    def cell_changed(self, node_hash_value: int, old_block_type: int, new_block_type: int):
+        if self.labels is None:
+            return
+        if new_block_type == OPEN_SPACE:
+            self._open_cell(node_hash_value)
+        elif old_block_type == OPEN_SPACE:
+            self._close_cell(node_hash_value)
+
+    def grid_resized(self, old_row_stride: int):
+        if self.labels is None:
+            return
+        if self.maze.row_stride != old_row_stride:
+            self.labels = None
+        else:
+            # new rows are walls
+            self.labels.frombytes(bytes(4 * (len(self.maze.cells) - len(self.labels))))
+
+    def _open_cell(self, node_hash_value: int):
+        labels = self.labels
+        neighbor_ids = {
+            labels[node_hash_value + offset] for offset in self.maze.neighbor_offsets
+        }
+        neighbor_ids.discard(NO_COMPONENT)
+
+        if not neighbor_ids:
+            component_id = self.next_component_id
+            self.next_component_id += 1
+            self.sizes[component_id] = 0
+        else:
+            # the largest component keeps its id, the others are relabelled into it
+            component_id = max(neighbor_ids, key=self.sizes.__getitem__)
+            neighbor_ids.discard(component_id)
+            for other_id in neighbor_ids:
+                self._relabel(node_hash_value, other_id, component_id)
+                self.sizes[component_id] += self.sizes.pop(other_id)
+
+        labels[node_hash_value] = component_id
+        self.sizes[component_id] += 1
+
+    def _relabel(self, node_hash_value: int, old_id: int, new_id: int):
+        """Flood fills a component from the neighbours of a node with a new id."""
+        labels, neighbor_offsets = self.labels, self.maze.neighbor_offsets
+        stack = []
+        for offset in neighbor_offsets:
+            if labels[node_hash_value + offset] == old_id:
+                labels[node_hash_value + offset] = new_id
+                stack.append(node_hash_value + offset)
+        while stack:
+            current_node = stack.pop()
+            for offset in neighbor_offsets:
+                neighbor_node = current_node + offset
+                if labels[neighbor_node] == old_id:
+                    labels[neighbor_node] = new_id
+                    stack.append(neighbor_node)
+
+    def _close_cell(self, node_hash_value: int):
+        labels = self.labels
+        component_id = labels[node_hash_value]
+        labels[node_hash_value] = NO_COMPONENT
+        self.sizes[component_id] -= 1
+        if self.sizes[component_id] == 0:
+            del self.sizes[component_id]
+        elif not self._neighbors_connected_around(node_hash_value):
+            self.labels = None
+
+    def _neighbors_connected_around(self, node_hash_value: int) -> bool:
+        """
+        Check if the open neighbours of a (closed) node are connected through the ring of
+        the 8 cells around it, in which case closing the node can't split its component.
+        """
+        row_stride = self.maze.row_stride
+        # clockwise from up; the 4 neighbours are at the even positions
+        ring_offsets = (
+            -row_stride,
+            -row_stride + 1,
+            1,
+            row_stride + 1,
+            row_stride,
+            row_stride - 1,
+            -1,
+            -row_stride - 1,
+        )
+        cells = self.maze.cells
+        ring_open = [
+            cells[node_hash_value + offset] == OPEN_SPACE for offset in ring_offsets
+        ]
+        if all(ring_open):
+            return True
+
+        # count the open arcs of the ring holding a neighbour, starting after a closed cell
+        first_closed = ring_open.index(False)
+        arcs_with_neighbor = 0
+        arc_has_neighbor = False
+        for step in range(1, 9):
+            position = (first_closed + step) % 8
+            if ring_open[position]:
+                arc_has_neighbor = arc_has_neighbor or position % 2 == 0
+            else:
+                arcs_with_neighbor += arc_has_neighbor
+                arc_has_neighbor = False
+        return arcs_with_neighbor <= 1
@@ -0,0 +1,426 @@
+import heapq
+
+from practical import OPEN_SPACE, Maze, MazeGridListener
+
+# side of the square clusters the grid is split into
+DEFAULT_CLUSTER_SIZE = 16
+
+# openings between two clusters at least this wide get an entrance at each end,
+# narrower ones a single entrance in the middle
+MIN_DOUBLE_ENTRANCE_WIDTH = 6
+
+
+class MazeHierarchy(MazeGridListener):
+    """
+    Hierarchical pathfinding (HPA*) over a Maze.
+
+    The grid is split into square clusters. Along the border of two neighbouring clusters,
+    every run of cells open on both sides is an opening, and gets one or two entrances:
+    pairs of facing cells, which are the nodes of the abstract graph. Entrance cells are
+    joined across the border (distance 1) and, inside each cluster, to the other entrance
+    cells of the cluster by their distance within the cluster.
+
+    A query connects the start and destination to the entrance cells of their clusters,
+    searches the abstract graph with A* (only a few nodes per cluster along the route),
+    then refines every abstract edge into cells with a search inside one cluster. The cost
+    of a query grows with the route length, not with the size of the map. The route found
+    is close to a shortest one, but unlike the cell level strategies not always the shortest.
+
+    A changed cell only marks its cluster as dirty; dirty clusters get their borders and
+    distances recomputed by the next query. A resize rebuilds everything on the next query.
+
+    Attributes:
+        maze (Maze): The maze.
+        cluster_size (int): The side of the clusters, in cells.
+        border_entrances (dict): The entrance cell pairs of each border, by pair of clusters.
+        entrance_partners (dict): The entrance cells facing an entrance cell, by node.
+        cluster_nodes (dict): The entrance cells of each cluster.
+        intra_edges (dict): For each cluster, the distances between its entrance cells.
+    """
+
+    def __init__(self, maze: Maze, cluster_size: int = DEFAULT_CLUSTER_SIZE):
+        if cluster_size < 2:
+            raise ValueError("clusters must be at least 2 cells wide")
+        self.maze = maze
+        self.cluster_size = cluster_size
+        self.border_entrances = {}
+        self.entrance_partners = {}
+        self.cluster_nodes = {}
+        self.intra_edges = {}
+        self.dirty_clusters = set()
+        self.is_built = False
+        maze.add_grid_listener(self)
+
+    def close(self):
+        """Stops following the changes of the maze."""
+        self.maze.remove_grid_listener(self)
+
+    def cluster_of(self, node_hash_value: int) -> tuple[int, int]:
+        """
+        Returns the cluster of a node.
+
+        Args:
+            node_hash_value (int): The hash value of the node.
+
+        Returns:
+            tuple[int, int]: The cluster row and column.
+        """
+        x, y = self.maze.node_inverse_hash_function(node_hash_value)
+        return x // self.cluster_size, y // self.cluster_size
+
+    def cluster_bounds(self, cluster: tuple[int, int]) -> tuple[int, int, int, int]:
+        """
+        Returns the coordinates a cluster covers.
+
+        Args:
+            cluster (tuple[int, int]): The cluster row and column.
+
+        Returns:
+            tuple[int, int, int, int]: The first and past the end x, then the same for y.
+        """
+        cluster_x, cluster_y = cluster
+        size = self.cluster_size
+        return (
+            cluster_x * size,
+            min((cluster_x + 1) * size, self.maze.grid_height),
+            cluster_y * size,
+            min((cluster_y + 1) * size, self.maze.grid_width),
+        )
+
+    def cluster_borders(self, cluster: tuple[int, int]) -> list[tuple]:
+        """
+        Returns the borders of a cluster with its neighbours. A border is a pair of
+        clusters, the second one below or to the right of the first one.
+
+        Args:
+            cluster (tuple[int, int]): The cluster row and column.
+
+        Returns:
+            list[tuple]: The borders.
+        """
+        cluster_x, cluster_y = cluster
+        cluster_rows = -(-self.maze.grid_height // self.cluster_size)
+        cluster_columns = -(-self.maze.grid_width // self.cluster_size)
+        borders = []
+        if cluster_x > 0:
+            borders.append(((cluster_x - 1, cluster_y), cluster))
+        if cluster_y > 0:
+            borders.append(((cluster_x, cluster_y - 1), cluster))
+        if cluster_x + 1 < cluster_rows:
+            borders.append((cluster, (cluster_x + 1, cluster_y)))
+        if cluster_y + 1 < cluster_columns:
+            borders.append((cluster, (cluster_x, cluster_y + 1)))
+        return borders
+
+    def find_border_entrances(self, border: tuple) -> list[tuple[int, int]]:
+        """
+        Finds the entrances of a border from its openings.
+
+        Args:
+            border (tuple): The pair of clusters.
+
+        Returns:
+            list[tuple[int, int]]: The pairs of facing cells, first cluster's cell first.
+        """
+        maze = self.maze
+        cells = maze.cells
+        (cluster_x, cluster_y), (other_x, other_y) = border
+        x_start, x_end, y_start, y_end = self.cluster_bounds((cluster_x, cluster_y))
+        hash_function = maze.node_hash_function
+        if other_y > cluster_y:
+            # the last column of the cluster faces the first column of the other one
+            facing_cells = [
+                (hash_function(x, y_end - 1), hash_function(x, y_end))
+                for x in range(x_start, x_end)
+            ]
+        else:
+            facing_cells = [
+                (hash_function(x_end - 1, y), hash_function(x_end, y))
+                for y in range(y_start, y_end)
+            ]
+
+        entrances = []
+        opening = []
+        for node, other_node in facing_cells + [(-1, -1)]:
+            if node != -1 and cells[node] == OPEN_SPACE == cells[other_node]:
+                opening.append((node, other_node))
+                continue
+            if len(opening) >= MIN_DOUBLE_ENTRANCE_WIDTH:
+                entrances.extend((opening[0], opening[-1]))
+            elif opening:
+                entrances.append(opening[len(opening) // 2])
+            opening = []
+        return entrances
+
+    def set_border_entrances(self, border: tuple, entrances: list[tuple[int, int]]):
+        """Replaces the entrances of a border, keeping entrance_partners up to date."""
+        for node, other_node in self.border_entrances.get(border, ()):
+            for entrance_node, partner_node in ((node, other_node), (other_node, node)):
+                partners = self.entrance_partners[entrance_node]
+                partners.discard(partner_node)
+                if not partners:
+                    del self.entrance_partners[entrance_node]
+        for node, other_node in entrances:
+            self.entrance_partners.setdefault(node, set()).add(other_node)
+            self.entrance_partners.setdefault(other_node, set()).add(node)
+        self.border_entrances[border] = entrances
+
+    def build_cluster(self, cluster: tuple[int, int]):
+        """Collects the entrance cells of a cluster and the distances between them."""
+        nodes = set()
+        for border in self.cluster_borders(cluster):
+            side = 0 if border[0] == cluster else 1
+            nodes.update(entrance[side] for entrance in self.border_entrances[border])
+        self.cluster_nodes[cluster] = nodes
+
+        edges = {}
+        for node in nodes:
+            _, distances = self.cluster_search(node, cluster)
+            edges[node] = {
+                other_node: distances[other_node]
+                for other_node in nodes
+                if other_node != node and other_node in distances
+            }
+        self.intra_edges[cluster] = edges
+
+    def build(self):
+        """Builds the whole abstract graph."""
+        self.border_entrances = {}
+        self.entrance_partners = {}
+        self.cluster_nodes = {}
+        self.intra_edges = {}
+        clusters = [
+            (cluster_x, cluster_y)
+            for cluster_x in range(-(-self.maze.grid_height // self.cluster_size))
+            for cluster_y in range(-(-self.maze.grid_width // self.cluster_size))
+        ]
+        for cluster in clusters:
+            for border in self.cluster_borders(cluster):
+                if border[0] == cluster:
+                    entrances = self.find_border_entrances(border)
+                    self.set_border_entrances(border, entrances)
+        for cluster in clusters:
+            self.build_cluster(cluster)
+        self.dirty_clusters.clear()
+        self.is_built = True
+
+    def refresh(self):
+        """Brings the abstract graph up to date with the grid, rebuilding dirty clusters."""
+        if not self.is_built:
+            self.build()
+            return
+        if not self.dirty_clusters:
+            return
+
+        dirty_clusters, self.dirty_clusters = self.dirty_clusters, set()
+        rebuilt_clusters = set(dirty_clusters)
+        borders = {
+            border
+            for cluster in dirty_clusters
+            for border in self.cluster_borders(cluster)
+        }
+        for border in borders:
+            entrances = self.find_border_entrances(border)
+            if entrances != self.border_entrances[border]:
+                self.set_border_entrances(border, entrances)
+                # the entrance cells of the neighbour changed too
+                rebuilt_clusters.update(border)
+        for cluster in rebuilt_clusters:
+            self.build_cluster(cluster)
+
+    def cluster_search(
+        self, source_node: int, cluster: tuple[int, int], destination_node: int = -1
+    ) -> tuple[dict, dict]:
+        """
+        Breadth first search from a node, staying inside a cluster.
+
+        Args:
+            source_node (int): The hash value of the source node.
+            cluster (tuple[int, int]): The cluster.
+            destination_node (int): The hash value of a node to stop at. Defaults to none.
+
+        Returns:
+            tuple[dict, dict]: The parent node map and the distance of every reached node.
+        """
+        maze = self.maze
+        cells, row_stride = maze.cells, maze.row_stride
+        x_start, x_end, y_start, y_end = self.cluster_bounds(cluster)
+        parents = {source_node: -1}
+        distances = {source_node: 0}
+        frontier = [source_node]
+        depth = 0
+        while frontier:
+            next_frontier = []
+            for current_node in frontier:
+                maze.expanded_nodes += 1
+                for offset in maze.neighbor_offsets:
+                    neighbor_node = current_node + offset
+                    if neighbor_node in parents or cells[neighbor_node] != OPEN_SPACE:
+                        continue
+                    x, y = divmod(neighbor_node, row_stride)
+                    if not (x_start < x <= x_end and y_start < y <= y_end):
+                        continue
+                    parents[neighbor_node] = current_node
+                    distances[neighbor_node] = depth + 1
+                    if neighbor_node == destination_node:
+                        return parents, distances
+                    next_frontier.append(neighbor_node)
+            frontier = next_frontier
+            depth += 1
+        return parents, distances
+
+    def search(self, start_node: int, destination_node: int) -> list[int]:
+        """
+        Finds a route between two nodes through the abstract graph.
+
+        Args:
+            start_node (int): The hash value of the start node.
+            destination_node (int): The hash value of the destination node.
+
+        Returns:
+            list[int]: The nodes of the route, None if there is none.
+        """
+        if start_node == destination_node:
+            return [start_node]
+        maze = self.maze
+        if maze.cells[destination_node] != OPEN_SPACE:
+            return None
+        if maze.cells[start_node] != OPEN_SPACE:
+            # a route may still leave a wall start cell, through an open neighbour
+            routes = [
+                self.search(neighbor_node, destination_node)
+                for neighbor_node in maze.get_node_neighbors(start_node)
+                if maze.cells[neighbor_node] == OPEN_SPACE
+            ]
+            routes = [route for route in routes if route is not None]
+            if not routes:
+                return None
+            return [start_node] + min(routes, key=len)
+        self.refresh()
+
+        start_cluster = self.cluster_of(start_node)
+        destination_cluster = self.cluster_of(destination_node)
+        _, start_distances = self.cluster_search(start_node, start_cluster)
+        _, destination_distances = self.cluster_search(
+            destination_node, destination_cluster
+        )
+        start_edges = {
+            node: start_distances[node]
+            for node in self.cluster_nodes[start_cluster]
+            if node != start_node and node in start_distances
+        }
+        if destination_node in start_distances:
+            start_edges[destination_node] = start_distances[destination_node]
+        # entrance cells of the destination cluster -> distance to the destination
+        destination_edges = {
+            node: destination_distances[node]
+            for node in self.cluster_nodes[destination_cluster]
+            if node in destination_distances
+        }
+
+        abstract_route = self._search_abstract_graph(
+            start_node, destination_node, start_edges, destination_edges
+        )
+        if abstract_route is None:
+            return None
+        return self._refine(abstract_route)
+
+    def _search_abstract_graph(
+        self,
+        start_node: int,
+        destination_node: int,
+        start_edges: dict,
+        destination_edges: dict,
+    ) -> list[int]:
+        maze = self.maze
+        destination_x, destination_y = maze.node_inverse_hash_function(destination_node)
+
+        def manhattan_distance(node_hash_value: int) -> int:
+            x, y = maze.node_inverse_hash_function(node_hash_value)
+            return abs(x - destination_x) + abs(y - destination_y)
+
+        parents = {start_node: -1}
+        distances = {start_node: 0}
+        closed_nodes = set()
+        heap = [(manhattan_distance(start_node), 0, start_node)]
+        while heap:
+            _, negative_distance, current_node = heapq.heappop(heap)
+            if current_node == destination_node:
+                route = []
+                while current_node != -1:
+                    route.append(current_node)
+                    current_node = parents[current_node]
+                return route[::-1]
+            if current_node in closed_nodes:
+                continue
+            closed_nodes.add(current_node)
+            maze.expanded_nodes += 1
+
+            if current_node == start_node:
+                edges = list(start_edges.items())
+            else:
+                cluster = self.cluster_of(current_node)
+                edges = list(self.intra_edges[cluster][current_node].items())
+                if current_node in destination_edges:
+                    edges.append((destination_node, destination_edges[current_node]))
+            edges.extend(
+                (partner_node, 1)
+                for partner_node in self.entrance_partners.get(current_node, ())
+            )
+
+            for neighbor_node, edge_distance in edges:
+                if neighbor_node in closed_nodes:
+                    continue
+                neighbor_distance = -negative_distance + edge_distance
+                if neighbor_distance < distances.get(
+                    neighbor_node, neighbor_distance + 1
+                ):
+                    distances[neighbor_node] = neighbor_distance
+                    parents[neighbor_node] = current_node
+                    heapq.heappush(
+                        heap,
+                        (
+                            neighbor_distance + manhattan_distance(neighbor_node),
+                            -neighbor_distance,
+                            neighbor_node,
+                        ),
+                    )
+        return None
+
+    def _refine(self, abstract_route: list[int]) -> list[int]:
+        """Turns an abstract route into cells, cutting any loop the segments make."""
+        route = [abstract_route[0]]
+        positions = {abstract_route[0]: 0}
+        for index in range(1, len(abstract_route)):
+            node, next_node = abstract_route[index - 1], abstract_route[index]
+            if next_node in self.entrance_partners.get(node, ()):
+                segment = [next_node]
+            else:
+                # an edge inside one cluster
+                parents, _ = self.cluster_search(node, self.cluster_of(node), next_node)
+                segment = []
+                current_node = next_node
+                while current_node != node:
+                    segment.append(current_node)
+                    current_node = parents[current_node]
+                segment.reverse()
+
+            for segment_node in segment:
+                position = positions.get(segment_node)
+                if position is not None:
+                    for removed_node in route[position + 1 :]:
+                        del positions[removed_node]
+                    del route[position + 1 :]
+                else:
+                    positions[segment_node] = len(route)
+                    route.append(segment_node)
+        return route
+
+    def cell_changed(
+        self, node_hash_value: int, old_block_type: int, new_block_type: int
+    ):
+        if self.is_built:
+            self.dirty_clusters.add(self.cluster_of(node_hash_value))
+
+    def grid_resized(self, old_row_stride: int):
+        self.is_built = False
@@ -0,0 +1,265 @@
+import mmap
+import os
+import struct
+from typing import BinaryIO, Iterable, TextIO, Union
+
+from practical import OPEN_SPACE, WALL, Maze
+
+# block types -> cell values: 0 is an open space, anything else a wall
+BLOCK_TYPE_TABLE = bytes([OPEN_SPACE]) + bytes([WALL]) * 255
+
+# printMaze characters -> cell values; "o" (a drawn route) is an open space
+ASCII_MAZE_TABLE = bytes.maketrans(b" o*", bytes([OPEN_SPACE, OPEN_SPACE, WALL]))
+ASCII_MAZE_CHARACTERS = b" o*"
+
+# bit strings of packed rows -> cell values
+BIT_STRING_TABLE = bytes.maketrans(b"01", bytes([OPEN_SPACE, WALL]))
+CELL_BITS_TABLE = bytes.maketrans(bytes([OPEN_SPACE, WALL]), b"01")
+
+# Packed maze file (".mazebits"): a header, then one bit per cell (1 for a wall),
+# row by row, each row padded to whole bytes, most significant bit first.
+#   header: magic, version, grid height, grid width
+PACKED_MAZE_MAGIC = b"MAZEBITS"
+PACKED_MAZE_VERSION = 1
+PACKED_MAZE_HEADER = struct.Struct("<8sB7xQQ")
+
+# Maze grid file (".mazegrid"): the Maze cells exactly as laid out in memory (one byte
+# per cell, with the wall border and the row stride), then a trailer. The cells come
+# first so the file can be memory-mapped from offset 0 and used as the grid as is.
+#   trailer: grid height, grid width, grid width capacity, version, magic
+MAZE_GRID_MAGIC = b"MAZEGRID"
+MAZE_GRID_VERSION = 1
+MAZE_GRID_TRAILER = struct.Struct("<QQQB7x8s")
+
+
+def maze_from_rows(rows: Iterable[bytes], grid_width: int = None) -> Maze:
+    """
+    Builds a maze from rows of cell values, one slice assignment per row.
+
+    Args:
+        rows (Iterable[bytes]): The rows, OPEN_SPACE or WALL bytes. Shorter rows are
+            padded with walls.
+        grid_width (int): The number of columns. Defaults to the longest row.
+
+    Raises:
+        ValueError: if a row is longer than grid_width.
+
+    Returns:
+        Maze: The maze.
+    """
+    rows = list(rows)
+    if grid_width is None:
+        grid_width = max((len(row) for row in rows), default=0)
+    row_stride = grid_width + 2
+    cells = bytearray([WALL]) * ((len(rows) + 2) * row_stride)
+    for x, row in enumerate(rows):
+        if len(row) > grid_width:
+            raise ValueError(f"row {x} of the maze is longer than {grid_width} columns")
+        row_start = (x + 1) * row_stride + 1
+        cells[row_start : row_start + len(row)] = row
+
+    maze = Maze()
+    maze.adopt_grid(cells, len(rows), grid_width, grid_width)
+    return maze
+
+
+def maze_from_block_types(block_types) -> Maze:
+    """
+    Builds a maze from a 2-D buffer of block types (0 open space, anything else a wall):
+    a 2-D memoryview, or anything exporting a 2-D buffer (e.g. a numpy array),
+    or a sequence of rows (bytes, lists of ints).
+    Buffers of 1 byte items are converted a row at a time with bytes.translate.
+
+    Args:
+        block_types: The block types, row by row.
+
+    Returns:
+        Maze: The maze.
+    """
+    try:
+        view = memoryview(block_types)
+    except TypeError:
+        view = None
+
+    if view is not None and view.ndim == 2:
+        grid_height, grid_width = view.shape
+        if view.itemsize == 1 and view.c_contiguous:
+            flat = view.cast("B")
+            rows = (
+                flat[x * grid_width : (x + 1) * grid_width]
+                .tobytes()
+                .translate(BLOCK_TYPE_TABLE)
+                for x in range(grid_height)
+            )
+        else:
+            rows = (
+                bytes(WALL if block_type else OPEN_SPACE for block_type in row)
+                for row in view.tolist()
+            )
+        return maze_from_rows(rows, grid_width)
+
+    return maze_from_rows(
+        bytes(WALL if block_type else OPEN_SPACE for block_type in row)
+        if not isinstance(row, (bytes, bytearray))
+        else row.translate(BLOCK_TYPE_TABLE)
+        for row in block_types
+    )
+
+
+def load_ascii_maze(source: Union[str, os.PathLike, TextIO, BinaryIO]) -> Maze:
+    """
+    Loads a maze in the printMaze format: one line per row, " " for an open space and
+    "*" for a wall ("o", a drawn route, is an open space). Trailing empty lines are ignored.
+
+    Args:
+        source (Union[str, os.PathLike, TextIO, BinaryIO]): A file path or file object.
+
+    Raises:
+        ValueError: if the map contains other characters.
+
+    Returns:
+        Maze: The maze.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            data = f.read()
+    else:
+        data = source.read()
+        if isinstance(data, str):
+            data = data.encode("ascii", errors="replace")
+
+    lines = data.replace(b"\r\n", b"\n").split(b"\n")
+    while lines and not lines[-1]:
+        lines.pop()
+    for x, line in enumerate(lines):
+        if line.translate(None, ASCII_MAZE_CHARACTERS):
+            raise ValueError(f"unexpected character in row {x} of the maze")
+    return maze_from_rows(line.translate(ASCII_MAZE_TABLE) for line in lines)
+
+
+def save_packed_maze(maze: Maze, file_loc: str):
+    """
+    Writes a maze to a packed maze file (one bit per cell).
+
+    Args:
+        maze (Maze): The maze.
+        file_loc (str): The path of the file.
+    """
+    grid_width = maze.grid_width
+    row_bytes = (grid_width + 7) // 8
+    padding = b"0" * (row_bytes * 8 - grid_width)
+
+    temporary_file_loc = f"{file_loc}.{os.getpid()}.tmp"
+    with open(temporary_file_loc, "wb") as f:
+        f.write(
+            PACKED_MAZE_HEADER.pack(
+                PACKED_MAZE_MAGIC, PACKED_MAZE_VERSION, maze.grid_height, grid_width
+            )
+        )
+        for x in range(maze.grid_height):
+            row_start = maze.node_hash_function(x, 0)
+            bits = bytes(maze.cells[row_start : row_start + grid_width])
+            bits = bits.translate(CELL_BITS_TABLE) + padding
+            f.write(int(bits, 2).to_bytes(row_bytes, "big") if row_bytes else b"")
+    os.replace(temporary_file_loc, file_loc)
+
+
+def load_packed_maze(file_loc: str) -> Maze:
+    """
+    Loads a packed maze file. Each row is unpacked through one int conversion and
+    one bytes.translate call.
+
+    Args:
+        file_loc (str): The path of the file.
+
+    Raises:
+        ValueError: if the file isn't a packed maze file.
+
+    Returns:
+        Maze: The maze.
+    """
+    with open(file_loc, "rb") as f:
+        data = f.read()
+    if len(data) < PACKED_MAZE_HEADER.size:
+        raise ValueError(f"{file_loc} is not a packed maze file")
+    magic, version, grid_height, grid_width = PACKED_MAZE_HEADER.unpack_from(data)
+    row_bytes = (grid_width + 7) // 8
+    if (
+        magic != PACKED_MAZE_MAGIC
+        or version != PACKED_MAZE_VERSION
+        or len(data) != PACKED_MAZE_HEADER.size + grid_height * row_bytes
+    ):
+        raise ValueError(f"{file_loc} is not a packed maze file")
+
+    bit_count = row_bytes * 8
+    rows = []
+    for x in range(grid_height):
+        row_start = PACKED_MAZE_HEADER.size + x * row_bytes
+        value = int.from_bytes(data[row_start : row_start + row_bytes], "big")
+        bits = format(value, "b").zfill(bit_count)[:grid_width]
+        rows.append(bits.encode("ascii").translate(BIT_STRING_TABLE))
+    return maze_from_rows(rows, grid_width)
+
+
+def save_maze_grid(maze: Maze, file_loc: str):
+    """
+    Writes the grid of a maze to a maze grid file, which open_maze_grid can memory-map.
+
+    Args:
+        maze (Maze): The maze.
+        file_loc (str): The path of the file.
+    """
+    temporary_file_loc = f"{file_loc}.{os.getpid()}.tmp"
+    with open(temporary_file_loc, "wb") as f:
+        f.write(maze.cells)
+        f.write(
+            MAZE_GRID_TRAILER.pack(
+                maze.grid_height,
+                maze.grid_width,
+                maze.grid_width_capacity,
+                MAZE_GRID_VERSION,
+                MAZE_GRID_MAGIC,
+            )
+        )
+    os.replace(temporary_file_loc, file_loc)
+
+
+def open_maze_grid(file_loc: str) -> Maze:
+    """
+    Memory-maps a maze grid file as the grid of a new maze, without reading it: pages
+    are loaded as routes touch them. The mapping is copy-on-write, so addCoordinate
+    works but never changes the file (growing the grid copies it to memory).
+
+    Args:
+        file_loc (str): The path of the file.
+
+    Raises:
+        ValueError: if the file isn't a maze grid file.
+
+    Returns:
+        Maze: The maze.
+    """
+    with open(file_loc, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+        if file_size < MAZE_GRID_TRAILER.size:
+            raise ValueError(f"{file_loc} is not a maze grid file")
+        f.seek(file_size - MAZE_GRID_TRAILER.size)
+        (
+            grid_height,
+            grid_width,
+            grid_width_capacity,
+            version,
+            magic,
+        ) = MAZE_GRID_TRAILER.unpack(f.read(MAZE_GRID_TRAILER.size))
+        cells_size = file_size - MAZE_GRID_TRAILER.size
+        if (
+            magic != MAZE_GRID_MAGIC
+            or version != MAZE_GRID_VERSION
+            or cells_size != (grid_height + 2) * (grid_width_capacity + 2)
+        ):
+            raise ValueError(f"{file_loc} is not a maze grid file")
+        cells = mmap.mmap(f.fileno(), cells_size, access=mmap.ACCESS_COPY)
+
+    maze = Maze()
+    maze.adopt_grid(cells, grid_height, grid_width, grid_width_capacity)
+    return maze
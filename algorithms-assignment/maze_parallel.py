@@ -0,0 +1,179 @@
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+from typing import Iterable
+
+from practical import ROUTE_STRATEGIES, Maze
+
+# below this many queries, starting a process pool costs more than it saves
+MIN_PARALLEL_BATCH_SIZE = 64
+
+# (dx, dy) of each neighbour offset of Maze.neighbor_offsets: up, right, down, left
+DIRECTION_STEPS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+# the worker side maze, over the grid in shared memory
+_worker_maze = None
+_worker_shared_memory = None
+_worker_strategy = None
+
+
+def encode_route(maze: Maze, parent_node_map: dict, destination_node: int) -> bytes:
+    """
+    Encodes the route to a node as the direction of every step (one byte each,
+    an index in Maze.neighbor_offsets), which is all a worker needs to send back.
+
+    Args:
+        maze (Maze): The maze.
+        parent_node_map (dict): The parent node map of the search.
+        destination_node (int): The hash value of the destination node.
+
+    Returns:
+        bytes: The directions, from the start.
+    """
+    direction_indices = {
+        offset: index for index, offset in enumerate(maze.neighbor_offsets)
+    }
+    directions = bytearray()
+    current_node = destination_node
+    while parent_node_map[current_node] != -1:
+        parent_node = parent_node_map[current_node]
+        directions.append(direction_indices[current_node - parent_node])
+        current_node = parent_node
+    directions.reverse()
+    return bytes(directions)
+
+
+def decode_route(start: tuple[int, int], directions: bytes) -> list[tuple[int, int]]:
+    """
+    Decodes a route encoded by encode_route.
+
+    Args:
+        start (tuple[int, int]): The (x, y) coordinates of the start.
+        directions (bytes): The directions of the steps, None if there is no route.
+
+    Returns:
+        list[tuple[int, int]]: The route, empty if there is none.
+    """
+    if directions is None:
+        return []
+    x, y = start
+    route = [(x, y)]
+    for direction in directions:
+        delta_x, delta_y = DIRECTION_STEPS[direction]
+        x += delta_x
+        y += delta_y
+        route.append((x, y))
+    return route
+
+
+def solve_route(maze: Maze, query: tuple[int, int, int, int], strategy: str) -> bytes:
+    """
+    Finds a route like Maze.findRoute, returning it encoded.
+
+    Args:
+        maze (Maze): The maze.
+        query (tuple[int, int, int, int]): The (x1, y1, x2, y2) coordinates.
+        strategy (str): The search strategy, see ROUTE_STRATEGIES.
+
+    Returns:
+        bytes: The encoded route (see encode_route), None if there is none.
+    """
+    x1, y1, x2, y2 = query
+    if not (
+        maze.is_coordinates_within_grid(x1, y1)
+        and maze.is_coordinates_within_grid(x2, y2)
+    ):
+        return None
+    destination_node = maze.node_hash_function(x2, y2)
+    search = getattr(maze, "search_" + strategy)
+    parent_node_map = search(maze.node_hash_function(x1, y1), destination_node)
+    if parent_node_map is None:
+        return None
+    return encode_route(maze, parent_node_map, destination_node)
+
+
+def _init_worker(
+    shared_memory_name: str,
+    grid_height: int,
+    grid_width: int,
+    grid_width_capacity: int,
+    strategy: str,
+):
+    global _worker_maze, _worker_shared_memory, _worker_strategy
+    _worker_shared_memory = shared_memory.SharedMemory(shared_memory_name)
+    cells_size = (grid_height + 2) * (grid_width_capacity + 2)
+    _worker_maze = Maze()
+    _worker_maze.adopt_grid(
+        _worker_shared_memory.buf[:cells_size],
+        grid_height,
+        grid_width,
+        grid_width_capacity,
+    )
+    _worker_strategy = strategy
+
+
+def _solve_in_worker(query: tuple[int, int, int, int]) -> bytes:
+    return solve_route(_worker_maze, query, _worker_strategy)
+
+
+def findRouteBatch(
+    maze: Maze,
+    queries: Iterable[tuple[int, int, int, int]],
+    strategy: str = None,
+    processes: int = None,
+    chunksize: int = 64,
+) -> list[list[tuple[int, int]]]:
+    """
+    Runs findRoute on many queries against one maze, returning the routes in query order.
+
+    The grid is copied once into a shared memory block, which every worker process
+    maps as the grid of its own Maze; only the queries and the routes (one byte per
+    step, see encode_route) go through the pool. The maze must not change during
+    the batch. Small batches are solved in this process.
+
+    Args:
+        maze (Maze): The maze.
+        queries (Iterable[tuple[int, int, int, int]]): The (x1, y1, x2, y2) queries.
+        strategy (str): The search strategy, see ROUTE_STRATEGIES.
+            Defaults to maze.route_strategy.
+        processes (int): Number of worker processes. Defaults to the number of CPUs.
+        chunksize (int): Number of queries sent to a worker at a time.
+
+    Returns:
+        list[list[tuple[int, int]]]: The route of every query, empty if there is none.
+    """
+    queries = list(queries)
+    if strategy is None:
+        strategy = maze.route_strategy
+    if strategy not in ROUTE_STRATEGIES:
+        raise ValueError(f"unknown route strategy {strategy!r}")
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if processes <= 1 or len(queries) < MIN_PARALLEL_BATCH_SIZE:
+        return [maze.findRoute(*query, strategy) for query in queries]
+
+    cells_size = len(maze.cells)
+    block = shared_memory.SharedMemory(create=True, size=cells_size)
+    try:
+        block.buf[:cells_size] = maze.cells
+        with multiprocessing.Pool(
+            processes,
+            initializer=_init_worker,
+            initargs=(
+                block.name,
+                maze.grid_height,
+                maze.grid_width,
+                maze.grid_width_capacity,
+                strategy,
+            ),
+        ) as pool:
+            encoded_routes = pool.map(_solve_in_worker, queries, chunksize)
+    finally:
+        block.close()
+        block.unlink()
+
+    return [
+        decode_route((query[0], query[1]), directions)
+        for query, directions in zip(queries, encoded_routes)
+    ]
@@ -0,0 +1,185 @@
+import io
+import sys
+from typing import BinaryIO, Iterator, TextIO, Union
+
+from practical import MAZE_RENDER_TABLE, WALL, Maze
+
+# route cells drawn over the maze
+ROUTE_CHARACTER = ord("o")
+
+# overview characters, by the share of walls in a block: under 1/4, 1/2, 3/4, then more
+OVERVIEW_CHARACTERS = b" .:*"
+
+# bytes of rendered rows gathered before each write
+RENDER_BUFFER_SIZE = 1 << 16
+
+
+def clip_viewport(
+    maze: Maze, viewport: tuple[int, int, int, int] = None
+) -> tuple[int, int, int, int]:
+    """
+    Clips a viewport to the grid.
+
+    Args:
+        maze (Maze): The maze.
+        viewport (tuple[int, int, int, int]): The first and past the end x, then the same
+            for y. Defaults to the whole grid.
+
+    Returns:
+        tuple[int, int, int, int]: The clipped viewport.
+    """
+    if viewport is None:
+        return 0, maze.grid_height, 0, maze.grid_width
+    x_start, x_end, y_start, y_end = viewport
+    x_start, y_start = max(x_start, 0), max(y_start, 0)
+    x_end, y_end = min(x_end, maze.grid_height), min(y_end, maze.grid_width)
+    return x_start, max(x_start, x_end), y_start, max(y_start, y_end)
+
+
+def iter_maze_rows(
+    maze: Maze,
+    viewport: tuple[int, int, int, int] = None,
+    route: list[tuple[int, int]] = None,
+    scale: int = 1,
+) -> Iterator[bytes]:
+    """
+    Lazily renders a maze row by row, in the printMaze format (" " open space, "*" wall).
+    Each row is sliced out of the grid and converted with a single bytes.translate call.
+
+    Args:
+        maze (Maze): The maze.
+        viewport (tuple[int, int, int, int]): The part of the grid to render, see
+            clip_viewport. Defaults to the whole grid.
+        route (list[tuple[int, int]]): A route to draw with ROUTE_CHARACTER.
+        scale (int): Side of the square blocks of cells rendered as one character.
+            Above 1, characters show the share of walls in a block, see OVERVIEW_CHARACTERS.
+
+    Yields:
+        bytes: The rows, each ending with a line break.
+    """
+    x_start, x_end, y_start, y_end = clip_viewport(maze, viewport)
+    if scale > 1:
+        yield from _iter_overview_rows(
+            maze, x_start, x_end, y_start, y_end, route, scale
+        )
+        return
+
+    route_columns = {}
+    for x, y in route or ():
+        if x_start <= x < x_end and y_start <= y < y_end:
+            route_columns.setdefault(x, []).append(y - y_start)
+
+    cells, width = maze.cells, y_end - y_start
+    for x in range(x_start, x_end):
+        row_start = maze.node_hash_function(x, y_start)
+        row = cells[row_start : row_start + width].translate(MAZE_RENDER_TABLE)
+        columns = route_columns.get(x)
+        if columns:
+            row = bytearray(row)
+            for column in columns:
+                row[column] = ROUTE_CHARACTER
+        yield bytes(row) + b"\n"
+
+
+def _iter_overview_rows(
+    maze: Maze,
+    x_start: int,
+    x_end: int,
+    y_start: int,
+    y_end: int,
+    route: list[tuple[int, int]],
+    scale: int,
+) -> Iterator[bytes]:
+    route_blocks = {
+        ((x - x_start) // scale, (y - y_start) // scale)
+        for x, y in route or ()
+        if x_start <= x < x_end and y_start <= y < y_end
+    }
+    cells, width = maze.cells, y_end - y_start
+    shades = len(OVERVIEW_CHARACTERS)
+    for block_x, x in enumerate(range(x_start, x_end, scale)):
+        block_height = min(scale, x_end - x)
+        rows = [
+            cells[row_start : row_start + width]
+            for row_start in (
+                maze.node_hash_function(row_x, y_start)
+                for row_x in range(x, x + block_height)
+            )
+        ]
+        overview_row = bytearray()
+        for block_y, y in enumerate(range(0, width, scale)):
+            if (block_x, block_y) in route_blocks:
+                overview_row.append(ROUTE_CHARACTER)
+                continue
+            block_end = min(y + scale, width)
+            walls = sum(row.count(WALL, y, block_end) for row in rows)
+            shade = walls * shades // (block_height * (block_end - y))
+            overview_row.append(OVERVIEW_CHARACTERS[min(shade, shades - 1)])
+        overview_row += b"\n"
+        yield bytes(overview_row)
+
+
+def is_text_stream(output) -> bool:
+    """
+    Tells whether a file object takes str (text mode) or bytes.
+
+    File objects of the io module are recognized by type, other file objects by their
+    mode; duck-typed streams with neither are sent an empty str, which a binary
+    stream rejects with a TypeError.
+
+    Args:
+        output: The file object.
+
+    Returns:
+        bool: True if the file object takes str.
+    """
+    if isinstance(output, io.TextIOBase):
+        return True
+    if isinstance(output, (io.RawIOBase, io.BufferedIOBase)):
+        return False
+    mode = getattr(output, "mode", None)
+    if isinstance(mode, str):
+        return "b" not in mode
+    try:
+        output.write("")
+    except TypeError:
+        return False
+    return True
+
+
+def write_maze(
+    maze: Maze,
+    output: Union[TextIO, BinaryIO] = None,
+    viewport: tuple[int, int, int, int] = None,
+    route: list[tuple[int, int]] = None,
+    scale: int = 1,
+):
+    """
+    Streams a rendering of a maze to a file object, a buffer of rows at a time,
+    so memory stays bounded whatever the size of the grid.
+
+    Args:
+        maze (Maze): The maze.
+        output (Union[TextIO, BinaryIO]): A text or binary file object (see is_text_stream).
+            Defaults to stdout.
+        viewport (tuple[int, int, int, int]): See iter_maze_rows.
+        route (list[tuple[int, int]]): See iter_maze_rows.
+        scale (int): See iter_maze_rows.
+    """
+    if output is None:
+        output = sys.stdout
+    is_text = is_text_stream(output)
+
+    buffer = []
+    buffered_size = 0
+    for row in iter_maze_rows(maze, viewport, route, scale):
+        buffer.append(row)
+        buffered_size += len(row)
+        if buffered_size >= RENDER_BUFFER_SIZE:
+            chunk = b"".join(buffer)
+            output.write(chunk.decode("ascii") if is_text else chunk)
+            buffer = []
+            buffered_size = 0
+    if buffer:
+        chunk = b"".join(buffer)
+        output.write(chunk.decode("ascii") if is_text else chunk)
@@ -0,0 +1,190 @@
+from collections import OrderedDict
+
+from practical import OPEN_SPACE, Maze, MazeGridListener
+
+# default number of BFS trees kept by a MazeRouteCache
+DEFAULT_MAX_TREES = 16
+
+# BFS tree entries: unreached, or the index + 1 of the neighbour offset the node was
+# reached through (so its parent is node - neighbor_offsets[entry - 1]), or the source
+UNREACHED = 0
+SOURCE = 255
+
+
+class MazeRouteCache(MazeGridListener):
+    """
+    Keeps complete BFS trees from recently used sources, so any route from a cached source
+    is read off its tree by walking parents back, with no search.
+
+    A tree is a bytearray with one byte per node of the grid (the direction of its parent),
+    so a tree costs as much memory as the grid itself; at most max_trees are kept, the least
+    recently used being dropped first. The routes are the ones findRoute returns with the
+    "bfs" strategy (a shortest route, ties broken the same way).
+
+    Trees follow the grid changes: a tree stays valid when the changed cell can't alter it
+    (a closed cell the source didn't reach, or an opened cell with no reached neighbour),
+    and is dropped otherwise.
+
+    Attributes:
+        maze (Maze): The maze.
+        max_trees (int): The maximum number of trees kept.
+        trees (OrderedDict): The BFS trees by source node, least recently used first.
+    """
+
+    def __init__(self, maze: Maze, max_trees: int = DEFAULT_MAX_TREES):
+        if max_trees < 1:
+            raise ValueError("a route cache needs room for at least one tree")
+        self.maze = maze
+        self.max_trees = max_trees
+        self.trees = OrderedDict()
+        maze.add_grid_listener(self)
+
+    def close(self):
+        """Drops every tree and stops following the changes of the maze."""
+        self.trees.clear()
+        self.maze.remove_grid_listener(self)
+
+    def get_tree(self, source_node: int) -> bytearray:
+        """
+        Returns the BFS tree of a source, searching the whole component of the source
+        if it isn't cached.
+
+        Args:
+            source_node (int): The hash value of the source node.
+
+        Returns:
+            bytearray: The parent direction of every node, see UNREACHED and SOURCE.
+        """
+        tree = self.trees.get(source_node)
+        if tree is not None:
+            self.trees.move_to_end(source_node)
+            return tree
+
+        tree = self.build_tree(source_node)
+        self.trees[source_node] = tree
+        if len(self.trees) > self.max_trees:
+            self.trees.popitem(last=False)
+        return tree
+
+    def build_tree(self, source_node: int) -> bytearray:
+        """
+        Runs a full breadth first search from a source node.
+
+        Args:
+            source_node (int): The hash value of the source node.
+
+        Returns:
+            bytearray: The parent direction of every node, see UNREACHED and SOURCE.
+        """
+        cells = self.maze.cells
+        directions = list(enumerate(self.maze.neighbor_offsets, start=1))
+        tree = bytearray(len(cells))
+        tree[source_node] = SOURCE
+
+        frontier = [source_node]
+        while frontier:
+            next_frontier = []
+            for current_node in frontier:
+                for direction, offset in directions:
+                    neighbor_node = current_node + offset
+                    if cells[neighbor_node] == OPEN_SPACE and not tree[neighbor_node]:
+                        tree[neighbor_node] = direction
+                        next_frontier.append(neighbor_node)
+            frontier = next_frontier
+        return tree
+
+    def route(self, source: tuple[int, int], destination: tuple[int, int]) -> list:
+        """
+        Returns a shortest route between two coordinates.
+
+        Args:
+            source (tuple[int, int]): The (x, y) coordinates of the start.
+            destination (tuple[int, int]): The (x, y) coordinates of the destination.
+
+        Returns:
+            list: The route as a list of (x, y) tuples, empty if there is none.
+        """
+        return self.routes_from(source, [destination])[0]
+
+    def routes_from(
+        self, source: tuple[int, int], destinations: list[tuple[int, int]]
+    ) -> list[list]:
+        """
+        Returns a shortest route from one source to each of many destinations,
+        with at most one search.
+
+        Args:
+            source (tuple[int, int]): The (x, y) coordinates of the start.
+            destinations (list[tuple[int, int]]): The (x, y) coordinates of the destinations.
+
+        Returns:
+            list[list]: The route to every destination, in order; empty if there is none.
+        """
+        maze = self.maze
+        if not maze.is_coordinates_within_grid(*source):
+            return [[] for _ in destinations]
+        tree = self.get_tree(maze.node_hash_function(*source))
+
+        routes = []
+        for destination in destinations:
+            if maze.is_coordinates_within_grid(*destination):
+                routes.append(
+                    self._read_route(tree, maze.node_hash_function(*destination))
+                )
+            else:
+                routes.append([])
+        return routes
+
+    def routes_between(
+        self, sources: list[tuple[int, int]], destinations: list[tuple[int, int]]
+    ) -> list[list[list]]:
+        """
+        Returns a shortest route from every source to every destination,
+        with at most one search per source.
+
+        Args:
+            sources (list[tuple[int, int]]): The (x, y) coordinates of the starts.
+            destinations (list[tuple[int, int]]): The (x, y) coordinates of the destinations.
+
+        Returns:
+            list[list[list]]: routes[i][j] is the route from sources[i] to destinations[j].
+        """
+        return [self.routes_from(source, destinations) for source in sources]
+
+    def _read_route(self, tree: bytearray, destination_node: int) -> list:
+        direction = tree[destination_node]
+        if direction == UNREACHED:
+            return []
+        maze = self.maze
+        neighbor_offsets = maze.neighbor_offsets
+        path = []
+        current_node = destination_node
+        while direction != SOURCE:
+            path.append(current_node)
+            current_node -= neighbor_offsets[direction - 1]
+            direction = tree[current_node]
+        path.append(current_node)
+        return [maze.node_inverse_hash_function(node) for node in reversed(path)]
+
+    def cell_changed(
+        self, node_hash_value: int, old_block_type: int, new_block_type: int
+    ):
+        neighbor_nodes = self.maze.get_node_neighbors(node_hash_value)
+        for source_node, tree in list(self.trees.items()):
+            if new_block_type == OPEN_SPACE:
+                # the opened cell may give shortcuts to nodes the tree reached
+                stale = any(tree[neighbor_node] for neighbor_node in neighbor_nodes)
+            else:
+                # the closed cell was on routes unless the tree didn't reach it
+                # (a route may still leave a source that became a wall)
+                stale = tree[node_hash_value] not in (UNREACHED, SOURCE)
+            if stale:
+                del self.trees[source_node]
+
+    def grid_resized(self, old_row_stride: int):
+        if self.maze.row_stride != old_row_stride:
+            self.trees.clear()
+            return
+        # new rows are walls
+        for tree in self.trees.values():
+            tree.extend(bytes(len(self.maze.cells) - len(tree)))
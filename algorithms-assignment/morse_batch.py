@@ -0,0 +1,70 @@
+import gc
+import multiprocessing
+import os
+from typing import Iterable
+
+from practical import (
+    DICTIONARY_FILE_LOC,
+    get_morse_suffix_index,
+    get_morse_trie,
+    is_first_symbol_unknown,
+    morsePartialDecode,
+)
+
+# below this many inputs, starting a process pool costs more than it saves
+MIN_PARALLEL_BATCH_SIZE = 256
+
+
+def warm_morse_dictionary(input_string_lists: list[list[str]]):
+    """
+    Builds the dictionary structures a batch needs, so they exist before any worker is forked.
+
+    Args:
+        input_string_lists (list[list[str]]): The inputs of the batch.
+    """
+    get_morse_suffix_index(DICTIONARY_FILE_LOC)
+    if not all(map(is_first_symbol_unknown, input_string_lists)):
+        get_morse_trie(DICTIONARY_FILE_LOC)
+
+
+def morsePartialDecodeBatch(
+    input_string_lists: Iterable[list[str]],
+    processes: int = None,
+    chunksize: int = 64,
+) -> list[list[str]]:
+    """
+    Runs morsePartialDecode on many inputs and returns the results in input order.
+
+    The dictionary structures are built once in this process. Workers are forked afterwards
+    and inherit them (copy-on-write), nothing is pickled but the inputs and results.
+    Where fork is unavailable, or the batch is small, the batch is decoded in this process.
+
+    Args:
+        input_string_lists (Iterable[list[str]]): The partial words, one list of letter strings each.
+        processes (int): Number of worker processes. Defaults to the number of CPUs.
+        chunksize (int): Number of inputs sent to a worker at a time.
+
+    Returns:
+        list[list[str]]: The valid words for each input.
+    """
+    input_string_lists = list(input_string_lists)
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    warm_morse_dictionary(input_string_lists)
+
+    if (
+        processes <= 1
+        or len(input_string_lists) < MIN_PARALLEL_BATCH_SIZE
+        or "fork" not in multiprocessing.get_all_start_methods()
+    ):
+        return [morsePartialDecode(input_string) for input_string in input_string_lists]
+
+    # move the dictionary structures to the permanent generation so the collector
+    # running in the workers doesn't write to (and so copy) their pages
+    gc.freeze()
+    try:
+        with multiprocessing.get_context("fork").Pool(processes) as pool:
+            return pool.map(morsePartialDecode, input_string_lists, chunksize)
+    finally:
+        gc.unfreeze()
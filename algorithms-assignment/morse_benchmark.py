@@ -0,0 +1,332 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+from compact_trie import CompactMorseTrie, generate_morse_strings_with_compact_trie
+from morse_batch import morsePartialDecodeBatch, warm_morse_dictionary
+from practical import (
+    DICTIONARY_FILE_LOC,
+    build_morse_suffix_index,
+    build_morse_trie,
+    generate_morse_strings_with_trie,
+    load_morse_dictionary,
+    morseDecode,
+    morse_encode,
+    morse_tails_key,
+)
+
+# rough English letter frequencies, used to draw synthetic words
+LETTER_WEIGHTS = {
+    "E": 12.7,
+    "T": 9.1,
+    "A": 8.2,
+    "O": 7.5,
+    "I": 7.0,
+    "N": 6.7,
+    "S": 6.3,
+    "H": 6.1,
+    "R": 6.0,
+    "D": 4.3,
+    "L": 4.0,
+    "C": 2.8,
+    "U": 2.8,
+    "M": 2.4,
+    "W": 2.4,
+    "F": 2.2,
+    "G": 2.0,
+    "Y": 2.0,
+    "P": 1.9,
+    "B": 1.5,
+    "V": 1.0,
+    "K": 0.8,
+    "J": 0.2,
+    "X": 0.2,
+    "Q": 0.1,
+    "Z": 0.1,
+}
+
+DEFAULT_SIZES = ["10000", "50000", "dictionary", "500000"]
+
+
+def synthetic_words(count: int, rng: random.Random) -> list[str]:
+    """
+    Draws distinct random upper-case words of 2 to 15 letters.
+
+    Args:
+        count (int): Number of words.
+        rng (random.Random): The random generator.
+
+    Returns:
+        list[str]: The words.
+    """
+    letters, weights = list(LETTER_WEIGHTS), list(LETTER_WEIGHTS.values())
+    words = set()
+    while len(words) < count:
+        length = rng.randint(2, 15)
+        words.add("".join(rng.choices(letters, weights, k=length)))
+    return sorted(words)
+
+
+def benchmark_dictionary(
+    size: str, rng: random.Random, dictionary_file_loc: str
+) -> tuple[str, list[tuple[str, list[str]]]]:
+    """
+    Returns the (word, morse_code) pairs of a benchmark dictionary.
+
+    Args:
+        size (str): "dictionary" for dictionary.txt, or a number of words. Numbers up to
+            the dictionary size sample dictionary.txt, larger ones add synthetic words.
+        rng (random.Random): The random generator.
+        dictionary_file_loc (str): The path of the dictionary file.
+
+    Returns:
+        tuple[str, list[tuple[str, list[str]]]]: A label and the pairs.
+    """
+    dictionary = load_morse_dictionary(dictionary_file_loc)
+    if size == "dictionary":
+        return "dictionary", dictionary
+    count = int(size)
+    if count <= len(dictionary):
+        return f"sample_{count}", rng.sample(dictionary, count)
+    extra_words = synthetic_words(count - len(dictionary), rng)
+    return f"synthetic_{count}", dictionary + [
+        (word, morse_encode(word)) for word in extra_words
+    ]
+
+
+def measure_build(build: Callable, dictionary: list) -> tuple[object, float, int]:
+    """
+    Builds a structure, measuring time and memory.
+
+    Returns:
+        tuple[object, float, int]: The structure, build seconds and bytes still allocated afterwards.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    structure = build(dictionary)
+    seconds = time.perf_counter() - start
+
+    # memory is measured in a second build, tracemalloc slows allocation down a lot
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    measured = build(dictionary)
+    footprint = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del measured
+    return structure, seconds, footprint
+
+
+def partial_query(morse_code: list[str], unknowns: int, rng: random.Random) -> list[str]:
+    """
+    Hides the first symbol of `unknowns` random letters of a word ('x').
+
+    Args:
+        morse_code (list[str]): The Morse code of the word.
+        unknowns (int): The number of letters to hide the first symbol of.
+        rng (random.Random): The random generator.
+
+    Returns:
+        list[str]: The partial word.
+    """
+    hidden = set(rng.sample(range(len(morse_code)), min(unknowns, len(morse_code))))
+    return [
+        "x" + letter[1:] if index in hidden else letter
+        for index, letter in enumerate(morse_code)
+    ]
+
+
+def time_queries(function: Callable, queries: list, repeat: int = 3) -> float:
+    """
+    Times a function over a list of queries, best of `repeat` runs.
+
+    Returns:
+        float: Mean seconds per query.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for query in queries:
+            function(query)
+        best = min(best, time.perf_counter() - start)
+    return best / len(queries)
+
+
+def run_benchmarks(
+    sizes: list[str],
+    queries_per_case: int,
+    seed: int,
+    dictionary_file_loc: str,
+    emit: Callable[[dict], None],
+    processes: int = None,
+):
+    """
+    Runs every benchmark and passes each result record to `emit`.
+
+    Records have a "benchmark" field: "build" (time and memory of every variant),
+    "query" (latency by word length and unknown letters), "throughput" (queries per
+    second of every variant over a mixed batch, one query at a time), "batch"
+    (morsePartialDecodeBatch over the same batch, serial and with a process pool)
+    and "decode" (morseDecode latency).
+
+    morsePartialDecodeBatch always decodes against DICTIONARY_FILE_LOC, so the "batch"
+    records are only produced for the "dictionary" size of that file.
+
+    Args:
+        processes (int): Worker processes of the pool batch. Defaults to the number of CPUs.
+    """
+    rng = random.Random(seed)
+    for size in sizes:
+        label, dictionary = benchmark_dictionary(size, rng, dictionary_file_loc)
+
+        builders = {
+            "trie": build_morse_trie,
+            "compact_trie": CompactMorseTrie,
+            "suffix_index": build_morse_suffix_index,
+        }
+        structures = {}
+        for variant, build in builders.items():
+            structure, seconds, footprint = measure_build(build, dictionary)
+            structures[variant] = structure
+            emit(
+                {
+                    "benchmark": "build",
+                    "dictionary": label,
+                    "words": len(dictionary),
+                    "variant": variant,
+                    "seconds": seconds,
+                    "bytes": footprint,
+                }
+            )
+
+        trie, compact_trie = structures["trie"], structures["compact_trie"]
+        suffix_index = structures["suffix_index"]
+        query_functions = {
+            "trie": lambda query: generate_morse_strings_with_trie(query, trie),
+            "compact_trie": lambda query: generate_morse_strings_with_compact_trie(
+                query, compact_trie
+            ),
+            "suffix_index": lambda query: suffix_index.get(morse_tails_key(query), []),
+        }
+
+        words_by_length = {}
+        for word, morse_code in dictionary:
+            words_by_length.setdefault(len(morse_code), []).append(morse_code)
+
+        batch = []
+        for length in (2, 4, 6, 8, 10, 12, 15):
+            codes = words_by_length.get(length)
+            if not codes:
+                continue
+            for unknowns in sorted({0, length // 2, length}):
+                queries = [
+                    partial_query(rng.choice(codes), unknowns, rng)
+                    for _ in range(queries_per_case)
+                ]
+                batch.extend(queries)
+                for variant, query_function in query_functions.items():
+                    # the suffix index only answers "every first symbol unknown" queries
+                    if variant == "suffix_index" and unknowns != length:
+                        continue
+                    emit(
+                        {
+                            "benchmark": "query",
+                            "dictionary": label,
+                            "variant": variant,
+                            "letters": length,
+                            "unknowns": unknowns,
+                            "seconds_per_query": time_queries(query_function, queries),
+                        }
+                    )
+
+        rng.shuffle(batch)
+        for variant in ("trie", "compact_trie"):
+            emit(
+                {
+                    "benchmark": "throughput",
+                    "dictionary": label,
+                    "variant": variant,
+                    "queries": len(batch),
+                    "queries_per_second": 1.0
+                    / time_queries(query_functions[variant], batch, repeat=1),
+                }
+            )
+
+        if size == "dictionary" and os.path.abspath(
+            dictionary_file_loc
+        ) == os.path.abspath(DICTIONARY_FILE_LOC):
+            # load the shared structures first, so neither run pays for them
+            warm_morse_dictionary(batch)
+            for variant, batch_processes in (("serial", 1), ("pool", processes)):
+                start = time.perf_counter()
+                morsePartialDecodeBatch(batch, processes=batch_processes)
+                seconds = time.perf_counter() - start
+                emit(
+                    {
+                        "benchmark": "batch",
+                        "dictionary": label,
+                        "variant": variant,
+                        "processes": batch_processes or os.cpu_count(),
+                        "queries": len(batch),
+                        "queries_per_second": len(batch) / seconds,
+                    }
+                )
+
+        decode_queries = [rng.choice(dictionary)[1] for _ in range(queries_per_case)]
+        emit(
+            {
+                "benchmark": "decode",
+                "dictionary": label,
+                "variant": "morseDecode",
+                "seconds_per_query": time_queries(morseDecode, decode_queries),
+            }
+        )
+
+        del structures, trie, compact_trie, suffix_index, query_functions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Morse trie variants; writes one JSON record per line"
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help='dictionary sizes: word counts or "dictionary" (default: %(default)s)',
+    )
+    parser.add_argument("--queries", type=int, default=200, help="queries per case")
+    parser.add_argument("--seed", type=int, default=917)
+    parser.add_argument("--dictionary", default=DICTIONARY_FILE_LOC)
+    parser.add_argument(
+        "--processes", type=int, help="worker processes of the pool batch (default: CPUs)"
+    )
+    parser.add_argument("--output", help="output file (default: stdout)")
+    args = parser.parse_args()
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    environment = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": args.seed,
+    }
+
+    def emit(record: dict):
+        record.update(environment)
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+
+    try:
+        run_benchmarks(
+            args.sizes, args.queries, args.seed, args.dictionary, emit, args.processes
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
@@ -0,0 +1,113 @@
+import re
+from itertools import islice
+from typing import Iterator
+
+from practical import DICTIONARY_FILE_LOC, MORSE_SYMBOLS, TrieNode, get_morse_trie
+
+# letter pattern symbols: a known symbol, one unknown symbol, any number of unknown symbols
+UNKNOWN_SYMBOL = "x"
+ANY_SYMBOLS = "*"
+LETTER_PATTERN_SYMBOLS = frozenset(".-" + UNKNOWN_SYMBOL + ANY_SYMBOLS)
+
+_LETTER_PATTERN_REGEX = {
+    ".": r"\.",
+    "-": "-",
+    UNKNOWN_SYMBOL: "[.-]",
+    ANY_SYMBOLS: "[.-]*",
+}
+
+
+def letter_pattern_codes(letter_pattern: str) -> tuple[str, ...]:
+    """
+    Returns the letter codes matching a letter pattern.
+
+    A letter pattern is made of '.' and '-' (known symbols), 'x' (exactly one unknown symbol)
+    and '*' (any number of unknown symbols, including none). So "x.." is a 3 symbol code
+    ending in "..", ".*" is any code starting with a dot, and "*" is any letter at all.
+
+    Args:
+        letter_pattern (str): The pattern of one letter.
+
+    Raises:
+        ValueError: if the pattern contains other characters.
+
+    Returns:
+        tuple[str, ...]: The matching letter codes, dashes sorting before dots.
+    """
+    if not letter_pattern or not LETTER_PATTERN_SYMBOLS.issuperset(letter_pattern):
+        raise ValueError(f"invalid letter pattern {letter_pattern!r}")
+    regex = re.compile("".join(_LETTER_PATTERN_REGEX[symbol] for symbol in letter_pattern))
+    return tuple(code for code in MORSE_SYMBOLS if regex.fullmatch(code))
+
+
+def iter_morse_pattern_matches(
+    pattern: list[str], trie: TrieNode, limit: int = None
+) -> Iterator[str]:
+    """
+    Lazily yields the dictionary words matching a word pattern (one letter pattern per letter).
+
+    The candidate codes of every letter are computed once up front (at most the 37 letter
+    codes each); the trie walk then only follows children that exist, so a branch is dropped
+    as soon as its prefix is in no dictionary word, without ever enumerating candidate strings.
+
+    Args:
+        pattern (list[str]): The letter patterns, see letter_pattern_codes.
+        trie (TrieNode): The root node of the dictionary trie.
+        limit (int): Maximum number of words to yield. Defaults to all of them.
+
+    Yields:
+        str: The matching words, in dash first order.
+    """
+    candidates = [letter_pattern_codes(letter_pattern) for letter_pattern in pattern]
+    if any(len(letter_candidates) == 0 for letter_candidates in candidates):
+        return
+    matches = _walk_pattern(candidates, trie)
+    if limit is not None:
+        matches = islice(matches, limit)
+    yield from matches
+
+
+def _walk_pattern(candidates: list[tuple[str, ...]], trie: TrieNode) -> Iterator[str]:
+    pattern_length = len(candidates)
+    candidate_sets = [frozenset(letter_candidates) for letter_candidates in candidates]
+    stack = [(0, trie)]
+    while stack:
+        index, node = stack.pop()
+        if index == pattern_length:
+            if node.is_end_of_word:
+                yield node.english_word
+            continue
+        children = node.children
+        letter_candidates = candidates[index]
+        if len(letter_candidates) <= len(children):
+            # pushed in reverse so the dash first candidate is explored first
+            for code in reversed(letter_candidates):
+                child = children.get(code)
+                if child is not None:
+                    stack.append((index + 1, child))
+        else:
+            # wide pattern (e.g. "*") at a node with few children: filter the children instead
+            for code in sorted(children, reverse=True):
+                if code in candidate_sets[index]:
+                    stack.append((index + 1, children[code]))
+
+
+def morsePatternDecode(
+    pattern: list[str], limit: int = None, dictionary_file_loc: str = DICTIONARY_FILE_LOC
+) -> list[str]:
+    """
+    Returns the dictionary words matching a word pattern.
+
+    For example ["x", "*", "x.x", ".*"] matches 4 letter words whose first letter is E or T,
+    whose third letter has 3 symbols with a dot in the middle and whose last letter starts with a dot.
+
+    Args:
+        pattern (list[str]): The letter patterns, see letter_pattern_codes.
+        limit (int): Maximum number of words to return. Defaults to all of them.
+        dictionary_file_loc (str): The path of the dictionary file.
+
+    Returns:
+        list[str]: The matching words.
+    """
+    trie = get_morse_trie(dictionary_file_loc)
+    return list(iter_morse_pattern_matches(pattern, trie, limit))
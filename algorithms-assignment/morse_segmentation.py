@@ -0,0 +1,200 @@
+import re
+from typing import Iterator
+
+from practical import DICTIONARY_FILE_LOC, MORSE_CODE_DICT, TrieNode, get_morse_trie
+
+# longest letter code: a trie node has at most this many candidate edges from a position
+MAX_LETTER_CODE_LENGTH = max(len(code) for code in MORSE_CODE_DICT.values())
+
+# word gaps: whitespace or "/"
+WORD_GAP_PATTERN = re.compile(r"[\s/]+")
+
+
+class MorseSegmentDecoder:
+    """
+    Decodes one run of dots and dashes without letter (or word) gaps against the dictionary trie.
+
+    words_from(i) walks the trie symbol by symbol from position i: at every node, each of the
+    next 1..MAX_LETTER_CODE_LENGTH symbols is tried as the next letter code. It returns every
+    dictionary word spelled by segment[i:j]; results are memoized per position. The number of
+    word sequences spelling segment[i:] is then counts[i] = sum(counts[j] for (j, word) in
+    words_from(i)), computed right to left, so the work is linear in the segment length times
+    the size of the trie walk from a position, instead of exponential in the length.
+
+    Attributes:
+        segment (str): The dots and dashes.
+        trie (TrieNode): The root of the dictionary trie.
+    """
+
+    def __init__(self, segment: str, trie: TrieNode):
+        if not set(segment) <= {".", "-"}:
+            raise ValueError("a Morse segment may only contain '.' and '-'")
+        self.segment = segment
+        self.trie = trie
+        self._words_from = {}
+        self._counts = None
+
+    def words_from(self, start: int) -> list[tuple[int, str]]:
+        """
+        Returns every dictionary word spelled by the segment from a position.
+
+        Args:
+            start (int): The position in the segment.
+
+        Returns:
+            list[tuple[int, str]]: Pairs of (end position, word), for segment[start:end].
+        """
+        words = self._words_from.get(start)
+        if words is not None:
+            return words
+
+        segment, segment_length = self.segment, len(self.segment)
+        words = []
+        # in a trie every node has a unique letter sequence, so (node, position) pairs
+        # never repeat and the walk needs no visited set
+        stack = [(self.trie, start)]
+        while stack:
+            node, position = stack.pop()
+            if node.is_end_of_word and position > start:
+                words.append((position, node.english_word))
+            children = node.children
+            for end in range(
+                position + 1,
+                min(position + MAX_LETTER_CODE_LENGTH, segment_length) + 1,
+            ):
+                child = children.get(segment[position:end])
+                if child is not None:
+                    stack.append((child, end))
+        words.sort()
+        self._words_from[start] = words
+        return words
+
+    @property
+    def counts(self) -> list[int]:
+        """counts[i] is the number of word sequences spelling segment[i:] (counts[len] == 1)"""
+        if self._counts is None:
+            segment_length = len(self.segment)
+            counts = [0] * (segment_length + 1)
+            counts[segment_length] = 1
+            for start in range(segment_length - 1, -1, -1):
+                counts[start] = sum(counts[end] for end, _ in self.words_from(start))
+            self._counts = counts
+        return self._counts
+
+    def words(self) -> list[str]:
+        """
+        Returns the dictionary words spelled by the whole segment.
+
+        Returns:
+            list[str]: The words.
+        """
+        segment_length = len(self.segment)
+        return [word for end, word in self.words_from(0) if end == segment_length]
+
+    def count_sentences(self) -> int:
+        """
+        Counts the sequences of dictionary words spelling the whole segment.
+
+        Returns:
+            int: The number of word sequences.
+        """
+        return self.counts[0] if self.segment else 0
+
+    def iter_sentences(self, limit: int = None) -> Iterator[list[str]]:
+        """
+        Lazily yields the sequences of dictionary words spelling the whole segment.
+        Positions from which the rest of the segment can't be spelled are never entered.
+
+        Args:
+            limit (int): Maximum number of sequences to yield. Defaults to all of them.
+
+        Yields:
+            list[str]: A sequence of words.
+        """
+        if not self.segment or self.count_sentences() == 0:
+            return
+        counts, segment_length = self.counts, len(self.segment)
+        yielded = 0
+        stack = [(0, [])]
+        while stack:
+            position, sentence = stack.pop()
+            if position == segment_length:
+                yield sentence
+                yielded += 1
+                if limit is not None and yielded >= limit:
+                    return
+                continue
+            for end, word in reversed(self.words_from(position)):
+                if counts[end]:
+                    stack.append((end, sentence + [word]))
+
+
+def split_word_gaps(stream: str) -> list[str]:
+    """
+    Splits a Morse stream on its word gaps (whitespace or "/").
+
+    Args:
+        stream (str): The dots and dashes with word gaps.
+
+    Returns:
+        list[str]: The gap-free segments.
+    """
+    return [segment for segment in WORD_GAP_PATTERN.split(stream) if segment]
+
+
+def decodeMorseStream(
+    stream: str,
+    limit: int = None,
+    single_words: bool = True,
+    dictionary_file_loc: str = DICTIONARY_FILE_LOC,
+) -> list[list]:
+    """
+    Decodes a Morse stream that has word gaps but no letter gaps.
+
+    Args:
+        stream (str): The dots and dashes with word gaps.
+        limit (int): Maximum number of decodings per segment. Defaults to all of them.
+        single_words (bool): If True, every segment is one dictionary word; if False, a
+            segment may also be a sequence of dictionary words with no gap between them.
+        dictionary_file_loc (str): The path of the dictionary file.
+
+    Returns:
+        list[list]: For every segment, its words (single_words) or word sequences.
+    """
+    trie = get_morse_trie(dictionary_file_loc)
+    result = []
+    for segment in split_word_gaps(stream):
+        decoder = MorseSegmentDecoder(segment, trie)
+        if single_words:
+            result.append(decoder.words()[:limit])
+        else:
+            result.append(list(decoder.iter_sentences(limit)))
+    return result
+
+
+def countMorseStream(
+    stream: str,
+    single_words: bool = True,
+    dictionary_file_loc: str = DICTIONARY_FILE_LOC,
+) -> int:
+    """
+    Counts the decodings of a whole Morse stream (word gaps but no letter gaps),
+    without enumerating them.
+
+    Args:
+        stream (str): The dots and dashes with word gaps.
+        single_words (bool): If True, every segment is one dictionary word; if False, a
+            segment may also be a sequence of dictionary words with no gap between them.
+        dictionary_file_loc (str): The path of the dictionary file.
+
+    Returns:
+        int: The number of decodings of the stream.
+    """
+    trie = get_morse_trie(dictionary_file_loc)
+    total = 1
+    for segment in split_word_gaps(stream):
+        decoder = MorseSegmentDecoder(segment, trie)
+        total *= len(decoder.words()) if single_words else decoder.count_sentences()
+        if total == 0:
+            break
+    return total
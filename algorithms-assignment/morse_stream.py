@@ -0,0 +1,225 @@
+import re
+import sys
+from typing import Callable, Iterable, Iterator, TextIO
+
+from practical import MORSE_CODE_DICT
+
+# characters read per chunk from files and pipes
+CHUNK_SIZE = 1 << 16
+
+# Morse text layout: letter codes separated by a space, words separated by "/"
+LETTER_GAP = " "
+WORD_GAP = "/"
+
+# line break characters, copied as they are both ways (so CRLF text round-trips)
+LINE_BREAKS = "\r\n"
+
+# encoding table for str.translate: letter -> "code ", word break -> "/ ", line breaks kept
+ENCODE_TABLE = {}
+for _letter, _code in MORSE_CODE_DICT.items():
+    ENCODE_TABLE[ord(_letter)] = _code + LETTER_GAP
+    ENCODE_TABLE[ord(_letter.lower())] = _code + LETTER_GAP
+for _whitespace in " \t":
+    ENCODE_TABLE[ord(_whitespace)] = WORD_GAP + LETTER_GAP
+for _line_break in LINE_BREAKS:
+    ENCODE_TABLE[ord(_line_break)] = _line_break
+ENCODABLE_CHARACTERS = frozenset(map(chr, ENCODE_TABLE))
+
+# decoding table: letter code (or word gap) -> text
+DECODE_TABLE = {code: letter for letter, code in MORSE_CODE_DICT.items()}
+DECODE_TABLE[WORD_GAP] = " "
+
+# longest token decode_stream buffers: any longer run is reported without waiting for its end
+MAX_TOKEN_LENGTH = max(len(code) for code in DECODE_TABLE)
+
+# a Morse token (letter code or "/") or a line break
+MORSE_TOKEN_PATTERN = re.compile(r"[^\s]+|\r|\n")
+TOKEN_GAP_PATTERN = re.compile(r"\s")
+
+
+class MorseCodingError(ValueError):
+    """Raised for a symbol that has no Morse encoding (or decoding)"""
+
+    def __init__(self, symbol: str, position: int):
+        self.symbol = symbol
+        self.position = position
+        super().__init__(f"unknown symbol {symbol!r} at position {position}")
+
+
+def read_chunks(stream: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Reads a text stream (file, pipe) in chunks of bounded size.
+
+    Args:
+        stream (TextIO): The stream to read.
+        chunk_size (int): Number of characters per chunk.
+
+    Yields:
+        str: The chunks.
+    """
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def encode_stream(
+    chunks: Iterable[str], on_unknown: Callable[[str, int], str] = None
+) -> Iterator[str]:
+    """
+    Encodes text chunks to Morse: "HI YOU" -> ".... .. / -.-- --- ..- ".
+
+    Each chunk is converted with a single str.translate call; chunk boundaries don't matter.
+
+    Args:
+        chunks (Iterable[str]): The text, in chunks.
+        on_unknown (Callable[[str, int], str]): Called with each character that has no Morse code
+            and its position in the text; returns the text to emit instead (e.g. "" to skip it).
+            Defaults to raising MorseCodingError.
+
+    Yields:
+        str: The Morse code of each chunk.
+    """
+    position = 0
+    for chunk in chunks:
+        if ENCODABLE_CHARACTERS.issuperset(chunk):
+            yield chunk.translate(ENCODE_TABLE)
+        else:
+            # slow path, only for chunks with unknown characters
+            encoded = []
+            for offset, character in enumerate(chunk):
+                code = ENCODE_TABLE.get(ord(character))
+                if code is None:
+                    if on_unknown is None:
+                        raise MorseCodingError(character, position + offset)
+                    code = on_unknown(character, position + offset)
+                encoded.append(code)
+            yield "".join(encoded)
+        position += len(chunk)
+
+
+def decode_stream(
+    chunks: Iterable[str], on_unknown: Callable[[str, int], str] = None
+) -> Iterator[str]:
+    """
+    Decodes Morse chunks to text: ".... .. / -.-- --- ..-" -> "HI YOU".
+
+    A letter code cut by a chunk boundary is carried over to the next chunk, so memory
+    stays bounded by the chunk size. A token longer than MAX_TOKEN_LENGTH is no letter
+    code: it is reported as soon as it is that long, with its first MAX_TOKEN_LENGTH + 1
+    characters only, and the rest of it is skipped.
+
+    Args:
+        chunks (Iterable[str]): The Morse code (letter codes separated by whitespace, words by "/"), in chunks.
+        on_unknown (Callable[[str, int], str]): Called with each token that is not a letter code
+            and its position in the input; returns the text to emit instead.
+            Defaults to raising MorseCodingError.
+
+    Yields:
+        str: The decoded text of each chunk.
+    """
+    carry = ""
+    # position of the start of `carry` in the whole input
+    position = 0
+    # inside an overlong token that was already reported
+    is_skipping = False
+    for chunk in chunks:
+        if is_skipping:
+            gap = TOKEN_GAP_PATTERN.search(chunk)
+            if gap is None:
+                position += len(chunk)
+                continue
+            position += gap.start()
+            chunk = chunk[gap.start() :]
+            is_skipping = False
+        buffer = carry + chunk
+        # only decode up to the last whitespace, the rest may continue in the next chunk
+        cut = max(buffer.rfind(separator) for separator in " \t\r\n") + 1
+        if cut:
+            yield _decode_tokens(buffer[:cut], position, on_unknown)
+            position += cut
+        carry = buffer[cut:]
+        if len(carry) > MAX_TOKEN_LENGTH:
+            # carry is a single token, too long for a letter code
+            yield _decode_tokens(carry[: MAX_TOKEN_LENGTH + 1], position, on_unknown)
+            position += len(carry)
+            carry = ""
+            is_skipping = True
+    if carry:
+        yield _decode_tokens(carry, position, on_unknown)
+
+
+def _decode_tokens(
+    morse_text: str, position: int, on_unknown: Callable[[str, int], str]
+) -> str:
+    decoded = []
+    for match in MORSE_TOKEN_PATTERN.finditer(morse_text):
+        token = match.group()
+        letter = DECODE_TABLE.get(token)
+        if letter is None:
+            # long tokens (up to a chunk) are reported with their first characters
+            symbol = token[: MAX_TOKEN_LENGTH + 1]
+            if token in LINE_BREAKS:
+                letter = token
+            elif on_unknown is None:
+                raise MorseCodingError(symbol, position + match.start())
+            else:
+                letter = on_unknown(symbol, position + match.start())
+        decoded.append(letter)
+    return "".join(decoded)
+
+
+def encode_file(
+    input_stream: TextIO,
+    output_stream: TextIO,
+    chunk_size: int = CHUNK_SIZE,
+    on_unknown: Callable[[str, int], str] = None,
+):
+    """
+    Encodes a text file (or pipe) to Morse, one chunk at a time.
+
+    Args:
+        input_stream (TextIO): The text to encode.
+        output_stream (TextIO): Where to write the Morse code.
+        chunk_size (int): Number of characters read per chunk.
+        on_unknown (Callable[[str, int], str]): See encode_stream.
+    """
+    for encoded in encode_stream(read_chunks(input_stream, chunk_size), on_unknown):
+        output_stream.write(encoded)
+
+
+def decode_file(
+    input_stream: TextIO,
+    output_stream: TextIO,
+    chunk_size: int = CHUNK_SIZE,
+    on_unknown: Callable[[str, int], str] = None,
+):
+    """
+    Decodes a Morse file (or pipe) to text, one chunk at a time.
+
+    Args:
+        input_stream (TextIO): The Morse code to decode.
+        output_stream (TextIO): Where to write the text.
+        chunk_size (int): Number of characters read per chunk.
+        on_unknown (Callable[[str, int], str]): See decode_stream.
+    """
+    for decoded in decode_stream(read_chunks(input_stream, chunk_size), on_unknown):
+        output_stream.write(decoded)
+
+
+def report_unknown(symbol: str, position: int) -> str:
+    """on_unknown handler writing the symbol to stderr and emitting "?" in its place"""
+    print(f"unknown symbol {symbol!r} at position {position}", file=sys.stderr)
+    return "?"
+
+
+if __name__ == "__main__":
+    # python morse_stream.py encode|decode < input > output
+    if len(sys.argv) != 2 or sys.argv[1] not in ("encode", "decode"):
+        print("usage: python morse_stream.py encode|decode < input > output")
+        sys.exit(2)
+    if sys.argv[1] == "encode":
+        encode_file(sys.stdin, sys.stdout, on_unknown=report_unknown)
+    else:
+        decode_file(sys.stdin, sys.stdout, on_unknown=report_unknown)
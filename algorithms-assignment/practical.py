@@ -1,3 +1,16 @@
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections import deque
+from collections.abc import Mapping
+from typing import Iterable, Iterator
+
+
 class TrieNode:
     """
     Represents a node in a Trie data structure.
@@ -156,6 +169,64 @@ def morse_encode(input_str: str) -> str:
     return morse_sequence
 
 
+def morse_letter_candidates(morse_sequence: list[str]) -> list[tuple[str, ...]]:
+    """
+    Precomputes the candidate letter codes of every input letter: the letter with its 'x'
+    read as a dash and as a dot. Letters without an 'x' have a single candidate.
+
+    Args:
+        morse_sequence (list[str]): The morse code sequence, with 'x' for the unknown symbols.
+
+    Returns:
+        list[tuple[str, ...]]: The candidates of each letter, dash first.
+    """
+    candidates = []
+    for letter in morse_sequence:
+        dash_letter = letter.replace("x", "-")
+        dot_letter = letter.replace("x", ".")
+        if dash_letter == dot_letter:
+            candidates.append((dash_letter,))
+        else:
+            candidates.append((dash_letter, dot_letter))
+    return candidates
+
+
+def iter_morse_strings_with_trie(
+    morse_sequence: list[str], trie: TrieNode
+) -> Iterator[str]:
+    """
+    Lazily yields the English words formed by translating a morse code sequence using a trie.
+
+    The trie is walked with an explicit stack (no recursion limit on long inputs); words are
+    yielded in the same order as a depth first search trying the dash candidate first.
+
+    Args:
+        morse_sequence (list[str]): The morse code sequence to be translated.
+        trie (TrieNode): The root node of the trie representing the morse code dictionary.
+
+    Yields:
+        str: The English words formed by translating the morse code sequence.
+    """
+    candidates = morse_letter_candidates(morse_sequence)
+    sequence_length = len(candidates)
+
+    stack = [(0, trie)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        index, node = pop()
+        if index == sequence_length:
+            if node.is_end_of_word:
+                yield node.english_word
+            continue
+        children = node.children
+        letter_candidates = candidates[index]
+        # pushed in reverse so the dash candidate is explored first
+        for candidate_index in range(len(letter_candidates) - 1, -1, -1):
+            child = children.get(letter_candidates[candidate_index])
+            if child is not None:
+                push((index + 1, child))
+
+
 def generate_morse_strings_with_trie(morse_sequence: list[str], trie: TrieNode):
     """
     Generates a list of English words formed by translating a morse code sequence using a trie.
@@ -167,53 +238,578 @@ def generate_morse_strings_with_trie(morse_sequence: list[str], trie: TrieNode):
     Returns:
         list: A list of English words formed by translating the morse code sequence.
     """
+    return list(iter_morse_strings_with_trie(morse_sequence, trie))
+
+
+DICTIONARY_FILE_LOC = "./dictionary.txt"
+
+# dictionary file path -> root of the trie built from it.
+# Filled lazily on first use, shared by all later calls in the process.
+_morse_trie_cache = {}
+_morse_trie_lock = threading.Lock()
+
+# Precompiled trie file, written next to the dictionary file ("dictionary.txt.trie").
+# Layout (native byte order, recorded in the header):
+#   header: magic, byte order, dictionary size / mtime / sha256, array lengths
+#   child_offsets  uint32[node_count + 1]  children of node n are edges child_offsets[n]..child_offsets[n+1]
+#   child_nodes    uint32[edge_count]      target node of each edge
+#   node_words     int32[node_count]       index of the word ending at a node, -1 if none
+#   key_offsets    uint32[key_count + 1]   suffix index key k is keys[key_offsets[k]:key_offsets[k+1]]
+#   bucket_offsets uint32[key_count + 1]   words of key k are bucket_words[bucket_offsets[k]..bucket_offsets[k+1]]
+#   bucket_words   uint32[bucket_length]   word index of every suffix index entry
+#   child_symbols  uint8[edge_count]       index of each edge's letter code in MORSE_SYMBOLS
+#   words          "\n"-joined upper-cased words
+#   keys           the sorted suffix index keys (see morse_tails_key), concatenated
+# Nodes are numbered breadth first, the root is node 0.
+PRECOMPILED_TRIE_SUFFIX = ".trie"
+PRECOMPILED_TRIE_MAGIC = b"MORSETRI"
+PRECOMPILED_TRIE_VERSION = 2
+PRECOMPILED_TRIE_HEADER = struct.Struct("<8sBBxxQQ32sIIIIII")
+
+# every letter code, in a fixed order; edges store their position in this tuple
+MORSE_SYMBOLS = tuple(sorted(set(MORSE_CODE_DICT.values())))
+MORSE_SYMBOL_INDEX = {symbol: index for index, symbol in enumerate(MORSE_SYMBOLS)}
+
+
+def load_morse_dictionary(dictionary_file_loc: str) -> list[tuple[str, list[str]]]:
+    """
+    Reads a dictionary file (one word per line) and encodes every word in Morse code.
 
-    def backtrack(index, current_string, node):
-        """
-        Backtracks through the morse code sequence to find all possible English words.
+    Args:
+        dictionary_file_loc (str): The path of the dictionary file.
 
-        Args:
-            index (int): The current index in the morse code sequence.
-            current_string (str): The current string formed by translating the morse code sequence.
-            node (Node): The current node in the trie representing the morse code dictionary.
+    Returns:
+        list[tuple[str, list[str]]]: Pairs of (upper-cased word, morse code of the word).
+    """
+    with open(dictionary_file_loc) as f:
+        data = f.readlines()
+        data = [d.strip() for d in data]
+        data = [(d.upper(), morse_encode(d.upper())) for d in data]
+    return data
+
+
+def iter_morse_trie_words(trie: TrieNode) -> Iterator[tuple[str, list[str]]]:
+    """
+    Yields every word stored in a trie with its Morse code.
+
+    Args:
+        trie (TrieNode): The root node of the trie.
+
+    Yields:
+        tuple[str, list[str]]: The word and the Morse code of each of its letters.
+    """
+    if isinstance(trie, PrecompiledTrieNode):
+        # walks the arrays of the file instead of creating every node
+        yield from trie.trie.iter_words()
+        return
+    stack = [trie]
+    while stack:
+        node = stack.pop()
+        if node.is_end_of_word:
+            yield node.english_word, node.morse_code
+        stack.extend(node.children.values())
+
+
+def file_sha256(file_loc: str) -> bytes:
+    """
+    Computes the SHA-256 digest of a file.
+
+    Args:
+        file_loc (str): The path of the file.
+
+    Returns:
+        bytes: The 32 byte digest.
+    """
+    digest = hashlib.sha256()
+    with open(file_loc, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.digest()
 
-        Returns:
-            list: A list of English words formed by translating the morse code sequence.
-        """
-        if index == len(morse_sequence):
-            return [node.english_word] if node.is_end_of_word else []
 
-        current_letter = morse_sequence[index]
-        result = []
+def save_precompiled_morse_trie(
+    trie: TrieNode, dictionary_file_loc: str, trie_file_loc: str = None
+):
+    """
+    Writes a trie to the precompiled trie file of a dictionary.
+    The file is written to a temporary name then renamed, so readers never see a partial file.
+
+    Args:
+        trie (TrieNode): The root node of the trie built from the dictionary.
+        dictionary_file_loc (str): The path of the dictionary file the trie was built from.
+        trie_file_loc (str): The path of the trie file. Defaults to the dictionary path + ".trie".
+    """
+    if trie_file_loc is None:
+        trie_file_loc = dictionary_file_loc + PRECOMPILED_TRIE_SUFFIX
+
+    child_offsets = array("I", [0])
+    child_nodes = array("I")
+    child_symbols = array("B")
+    node_words = array("i")
+    words = []
+
+    # breadth first numbering: a node's children get consecutive numbers
+    queue = deque([trie])
+    next_node = 1
+    while queue:
+        node = queue.popleft()
+        if node.is_end_of_word:
+            node_words.append(len(words))
+            words.append(node.english_word)
+        else:
+            node_words.append(-1)
+        for symbol, child in node.children.items():
+            child_symbols.append(MORSE_SYMBOL_INDEX[symbol])
+            child_nodes.append(next_node)
+            next_node += 1
+            queue.append(child)
+        child_offsets.append(len(child_nodes))
+
+    # the suffix index is stored too, so no process has to rebuild it from the dictionary
+    word_indices = {word: index for index, word in enumerate(words)}
+    suffix_index = build_morse_suffix_index(iter_morse_trie_words(trie))
+    keys = sorted(suffix_index)
+    key_offsets = array("I", [0])
+    bucket_offsets = array("I", [0])
+    bucket_words = array("I")
+    for key in keys:
+        key_offsets.append(key_offsets[-1] + len(key))
+        bucket_words.extend([word_indices[word] for word in suffix_index[key]])
+        bucket_offsets.append(len(bucket_words))
+
+    words_bytes = "\n".join(words).encode()
+    keys_bytes = "".join(keys).encode()
+    stat = os.stat(dictionary_file_loc)
+    header = PRECOMPILED_TRIE_HEADER.pack(
+        PRECOMPILED_TRIE_MAGIC,
+        PRECOMPILED_TRIE_VERSION,
+        sys.byteorder == "little",
+        stat.st_size,
+        stat.st_mtime_ns,
+        file_sha256(dictionary_file_loc),
+        len(node_words),
+        len(child_nodes),
+        len(words_bytes),
+        len(keys),
+        len(bucket_words),
+        len(keys_bytes),
+    )
+
+    temporary_file_loc = f"{trie_file_loc}.{os.getpid()}.tmp"
+    with open(temporary_file_loc, "wb") as f:
+        f.write(header)
+        child_offsets.tofile(f)
+        child_nodes.tofile(f)
+        node_words.tofile(f)
+        key_offsets.tofile(f)
+        bucket_offsets.tofile(f)
+        bucket_words.tofile(f)
+        child_symbols.tofile(f)
+        f.write(words_bytes)
+        f.write(keys_bytes)
+    os.replace(temporary_file_loc, trie_file_loc)
+
+
+def open_precompiled_morse_trie(dictionary_file_loc: str, trie_file_loc: str = None):
+    """
+    Memory-maps the precompiled trie file of a dictionary, if it is up to date.
 
-        dash_letter = current_letter.replace("x", "-")
-        dot_letter = current_letter.replace("x", ".")
+    The file is valid when it was written from a dictionary file with the same size and
+    modification time; if only the modification time differs, the SHA-256 of the dictionary
+    decides (e.g. after the file was copied or touched).
 
-        if dash_letter in node.children.keys():
-            result.extend(
-                backtrack(
-                    index + 1,
-                    current_string + dash_letter,
-                    node.children.get(dash_letter),
+    Args:
+        dictionary_file_loc (str): The path of the dictionary file.
+        trie_file_loc (str): The path of the trie file. Defaults to the dictionary path + ".trie".
+
+    Returns:
+        dict: The arrays of the file as memoryviews over the mapping (named as in the
+        file layout), or None if the file is missing, corrupt or stale.
+    """
+    if trie_file_loc is None:
+        trie_file_loc = dictionary_file_loc + PRECOMPILED_TRIE_SUFFIX
+    try:
+        stat = os.stat(dictionary_file_loc)
+        with open(trie_file_loc, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    if len(mapping) < PRECOMPILED_TRIE_HEADER.size:
+        return None
+    (
+        magic,
+        version,
+        is_little_endian,
+        source_size,
+        source_mtime_ns,
+        source_sha256,
+        node_count,
+        edge_count,
+        words_length,
+        key_count,
+        bucket_length,
+        keys_length,
+    ) = PRECOMPILED_TRIE_HEADER.unpack_from(mapping)
+    if (
+        magic != PRECOMPILED_TRIE_MAGIC
+        or version != PRECOMPILED_TRIE_VERSION
+        or is_little_endian != (sys.byteorder == "little")
+        or source_size != stat.st_size
+    ):
+        return None
+    is_touched = source_mtime_ns != stat.st_mtime_ns
+    if is_touched and source_sha256 != file_sha256(dictionary_file_loc):
+        return None
+
+    sizes = [
+        ("child_offsets", "I", 4 * (node_count + 1)),
+        ("child_nodes", "I", 4 * edge_count),
+        ("node_words", "i", 4 * node_count),
+        ("key_offsets", "I", 4 * (key_count + 1)),
+        ("bucket_offsets", "I", 4 * (key_count + 1)),
+        ("bucket_words", "I", 4 * bucket_length),
+        ("child_symbols", "B", edge_count),
+        ("words", "B", words_length),
+        ("keys", "B", keys_length),
+    ]
+    if len(mapping) != PRECOMPILED_TRIE_HEADER.size + sum(size for _, _, size in sizes):
+        return None
+
+    if is_touched:
+        # same content with a new modification time (copied or touched): record the
+        # new time, so later loads skip hashing the dictionary again
+        try:
+            with open(trie_file_loc, "r+b") as f:
+                f.write(
+                    PRECOMPILED_TRIE_HEADER.pack(
+                        magic,
+                        version,
+                        is_little_endian,
+                        source_size,
+                        stat.st_mtime_ns,
+                        source_sha256,
+                        node_count,
+                        edge_count,
+                        words_length,
+                        key_count,
+                        bucket_length,
+                        keys_length,
+                    )
                 )
-            )
+        except OSError:
+            # read-only file: keep hashing on every load
+            pass
+
+    view = memoryview(mapping)
+    arrays = {}
+    position = PRECOMPILED_TRIE_HEADER.size
+    for name, type_code, size in sizes:
+        arrays[name] = view[position : position + size].cast(type_code)
+        position += size
+    return arrays
+
+
+class PrecompiledMorseTrie:
+    """
+    The trie of a precompiled trie file, read straight from the memory-mapped arrays.
+
+    No node is built up front: the node object of a node is created the first time a
+    walk reaches it, so loading costs the same whatever the size of the dictionary and
+    a process only pays for the part of the trie its queries visit.
+
+    Attributes:
+        child_offsets (memoryview): Start of the edges of every node (see the file layout).
+        child_nodes (memoryview): Target node of every edge.
+        node_words (memoryview): Index of the word ending at every node, -1 if none.
+        child_symbols (memoryview): Index in MORSE_SYMBOLS of the letter code of every edge.
+        words (list[str]): The words, by index.
+        suffix_index (PrecompiledSuffixIndex): The suffix index of the words.
+        root (PrecompiledTrieNode): The root node.
+    """
+
+    def __init__(self, arrays: dict):
+        self.child_offsets = arrays["child_offsets"]
+        self.child_nodes = arrays["child_nodes"]
+        self.node_words = arrays["node_words"]
+        self.child_symbols = arrays["child_symbols"]
+        self.words = bytes(arrays["words"]).decode().split("\n")
+        self.suffix_index = PrecompiledSuffixIndex(arrays, self.words)
+        self.root = PrecompiledTrieNode(self, 0)
 
-        if dot_letter in node.children.keys():
-            result.extend(
-                backtrack(
-                    index + 1,
-                    current_string + dot_letter,
-                    node.children.get(dot_letter),
+    def iter_words(self) -> Iterator[tuple[str, list[str]]]:
+        """
+        Yields every word of the trie with its Morse code, walking the arrays (no node
+        objects are created).
+
+        Yields:
+            tuple[str, list[str]]: The word and the Morse code of each of its letters.
+        """
+        # lists index faster than the memoryviews, and the walk reads every entry
+        child_offsets = self.child_offsets.tolist()
+        child_nodes = self.child_nodes.tolist()
+        edge_symbols = [MORSE_SYMBOLS[symbol] for symbol in self.child_symbols]
+        node_words, words = self.node_words.tolist(), self.words
+        path = []
+        # (node, depth, letter code of the edge into the node)
+        stack = [(0, 0, None)]
+        pop, push = stack.pop, stack.append
+        while stack:
+            node, depth, symbol = pop()
+            if depth:
+                del path[depth - 1 :]
+                path.append(symbol)
+            word_index = node_words[node]
+            if word_index >= 0:
+                yield words[word_index], path.copy()
+            depth += 1
+            for edge in range(child_offsets[node], child_offsets[node + 1]):
+                push((child_nodes[edge], depth, edge_symbols[edge]))
+
+
+class PrecompiledSuffixIndex(Mapping):
+    """
+    The suffix index (see build_morse_suffix_index) of a precompiled trie file, read
+    straight from the memory-mapped arrays: a key is found by binary search over the
+    sorted keys, and only the words of the buckets looked up are put in lists.
+    """
+
+    def __init__(self, arrays: dict, words: list[str]):
+        self.key_offsets = arrays["key_offsets"]
+        self.bucket_offsets = arrays["bucket_offsets"]
+        self.bucket_words = arrays["bucket_words"]
+        self.key_bytes = arrays["keys"]
+        self.words = words
+
+    def key_at(self, key_index: int) -> bytes:
+        start, end = self.key_offsets[key_index], self.key_offsets[key_index + 1]
+        return bytes(self.key_bytes[start:end])
+
+    def __getitem__(self, key: str) -> list[str]:
+        encoded_key = key.encode()
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.key_at(middle) < encoded_key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(self) or self.key_at(low) != encoded_key:
+            raise KeyError(key)
+        words = self.words
+        return [
+            words[word_index]
+            for word_index in self.bucket_words[
+                self.bucket_offsets[low] : self.bucket_offsets[low + 1]
+            ]
+        ]
+
+    def __iter__(self) -> Iterator[str]:
+        for key_index in range(len(self)):
+            yield self.key_at(key_index).decode()
+
+    def __len__(self) -> int:
+        return len(self.key_offsets) - 1
+
+
+class PrecompiledTrieNode(TrieNode):
+    """
+    A node of a PrecompiledMorseTrie. Its TrieNode attributes are read from the arrays on
+    first access, then stored on the node, so later walks are as fast as over a built trie.
+    """
+
+    def __init__(self, trie: PrecompiledMorseTrie, node_index: int):
+        # TrieNode.__init__ isn't called: __getattr__ fills the attributes in on demand
+        self.trie = trie
+        self.node_index = node_index
+
+    def __getattr__(self, name: str):
+        # only called for attributes not stored on the node yet
+        if name not in ("children", "is_end_of_word", "english_word", "morse_code"):
+            raise AttributeError(name)
+        trie, node_index = self.trie, self.node_index
+        word_index = trie.node_words[node_index]
+        if name == "children":
+            value = {
+                MORSE_SYMBOLS[trie.child_symbols[edge]]: PrecompiledTrieNode(
+                    trie, trie.child_nodes[edge]
                 )
-            )
+                for edge in range(
+                    trie.child_offsets[node_index], trie.child_offsets[node_index + 1]
+                )
+            }
+        elif name == "is_end_of_word":
+            value = word_index >= 0
+        elif name == "english_word":
+            value = trie.words[word_index] if word_index >= 0 else ""
+        else:
+            value = morse_encode(trie.words[word_index]) if word_index >= 0 else []
+        setattr(self, name, value)
+        return value
+
+
+def load_precompiled_morse_trie(
+    dictionary_file_loc: str, trie_file_loc: str = None
+) -> TrieNode:
+    """
+    Opens the precompiled trie file of a dictionary as a trie whose nodes are read from
+    the file on demand (see PrecompiledMorseTrie).
 
-        return result
+    Args:
+        dictionary_file_loc (str): The path of the dictionary file.
+        trie_file_loc (str): The path of the trie file. Defaults to the dictionary path + ".trie".
 
-    root_node = trie
+    Returns:
+        TrieNode: The root node of the trie, or None if there is no up to date trie file.
+    """
+    arrays = open_precompiled_morse_trie(dictionary_file_loc, trie_file_loc)
+    if arrays is None:
+        return None
+    return PrecompiledMorseTrie(arrays).root
 
-    result = backtrack(0, "", root_node)
 
-    return result
+def get_morse_trie(dictionary_file_loc: str = DICTIONARY_FILE_LOC) -> TrieNode:
+    """
+    Returns the shared trie of the dictionary, building it on the first call only.
+
+    The trie is loaded from the precompiled trie file next to the dictionary when that
+    file is up to date; otherwise it is built from the dictionary and the file is (re)written.
+
+    Args:
+        dictionary_file_loc (str): The path of the dictionary file.
+
+    Returns:
+        TrieNode: The root node of the dictionary trie.
+    """
+    key = os.path.abspath(dictionary_file_loc)
+    trie = _morse_trie_cache.get(key)
+    if trie is None:
+        with _morse_trie_lock:
+            trie = _morse_trie_cache.get(key)
+            if trie is None:
+                trie = load_precompiled_morse_trie(dictionary_file_loc)
+                if trie is None:
+                    trie = build_morse_trie(load_morse_dictionary(dictionary_file_loc))
+                    try:
+                        save_precompiled_morse_trie(trie, dictionary_file_loc)
+                    except OSError:
+                        # read-only directory: keep working without the file
+                        pass
+                _morse_trie_cache[key] = trie
+    return trie
+
+
+def reload_morse_dictionary(dictionary_file_loc: str = DICTIONARY_FILE_LOC) -> TrieNode:
+    """
+    Drops the cached trie and suffix index and loads the trie again.
+    Call this after the dictionary file has changed.
+
+    Args:
+        dictionary_file_loc (str): The path of the dictionary file.
+
+    Returns:
+        TrieNode: The root node of the reloaded trie.
+    """
+    with _morse_trie_lock:
+        _morse_trie_cache.pop(os.path.abspath(dictionary_file_loc), None)
+        _morse_suffix_index_cache.pop(os.path.abspath(dictionary_file_loc), None)
+    return get_morse_trie(dictionary_file_loc)
+
+
+def morse_tails_key(morse_code: list[str]) -> str:
+    """
+    Returns the suffix index key of a word: the code of every letter without its first symbol.
+
+    Args:
+        morse_code (list[str]): The Morse code of each letter ('x' allowed as first symbol).
+
+    Returns:
+        str: The letter code tails joined by spaces.
+    """
+    return " ".join([letter[1:] for letter in morse_code])
+
+
+def build_morse_suffix_index(
+    dictionary: Iterable[tuple[str, list[str]]],
+) -> dict[str, list[str]]:
+    """
+    Builds an index from the letter code tails of a word (see morse_tails_key) to all
+    dictionary words with those tails.
+
+    Two words match the same partial input (first symbol of every letter unknown) exactly
+    when their tails are equal, so a partial decode is a single lookup in this index.
+    Words of a bucket are ordered by their first symbols, dash before dot, which is the
+    order generate_morse_strings_with_trie finds them in.
+
+    Args:
+        dictionary (Iterable[tuple[str, list[str]]]): Tuples containing English words and their Morse code.
+
+    Returns:
+        dict[str, list[str]]: Index from tails key to words.
+    """
+    buckets = {}
+    for english_word, morse_code in dictionary:
+        first_symbols = "".join([letter[0] for letter in morse_code])
+        bucket = buckets.setdefault(morse_tails_key(morse_code), {})
+        # words with the same morse code (same upper-cased word) are stored once
+        bucket[first_symbols] = english_word
+    return {
+        key: [bucket[first_symbols] for first_symbols in sorted(bucket)]
+        for key, bucket in buckets.items()
+    }
+
+
+# dictionary file path -> suffix index, filled lazily like the trie cache
+_morse_suffix_index_cache = {}
+
+
+def get_morse_suffix_index(
+    dictionary_file_loc: str = DICTIONARY_FILE_LOC,
+) -> Mapping[str, list[str]]:
+    """
+    Returns the shared suffix index of the dictionary, loading it on the first call only.
+
+    The index is read from the precompiled trie file (see get_morse_trie, which writes
+    it); it is only built in memory, from the trie, when there is no such file.
+
+    Args:
+        dictionary_file_loc (str): The path of the dictionary file.
+
+    Returns:
+        Mapping[str, list[str]]: Index from tails key to words.
+    """
+    key = os.path.abspath(dictionary_file_loc)
+    index = _morse_suffix_index_cache.get(key)
+    if index is None:
+        # outside the lock, which get_morse_trie takes
+        trie = get_morse_trie(dictionary_file_loc)
+        with _morse_trie_lock:
+            index = _morse_suffix_index_cache.get(key)
+            if index is None:
+                if not isinstance(trie, PrecompiledTrieNode):
+                    # the trie was just built: read the index from the file it was saved to
+                    trie = load_precompiled_morse_trie(dictionary_file_loc) or trie
+                if isinstance(trie, PrecompiledTrieNode):
+                    index = trie.trie.suffix_index
+                else:
+                    index = build_morse_suffix_index(iter_morse_trie_words(trie))
+                _morse_suffix_index_cache[key] = index
+    return index
+
+
+def is_first_symbol_unknown(inputStringList: list[str]) -> bool:
+    """
+    Checks that every letter has an unknown first symbol and known remaining symbols.
+
+    Args:
+        inputStringList (list[str]): A list of partial Morse code strings.
+
+    Returns:
+        bool: True if the input can be answered by the suffix index.
+    """
+    return bool(inputStringList) and all(
+        letter.startswith("x") and "x" not in letter[1:] for letter in inputStringList
+    )
 
 
 def morsePartialDecode(inputStringList: list[str]) -> list[str]:
@@ -237,38 +833,90 @@ def morsePartialDecode(inputStringList: list[str]) -> list[str]:
     This function should find and return a list of strings of all possible VALID words.
     """
 
-    dictionaryFileLoc = "./dictionary.txt"
+    dictionaryFileLoc = DICTIONARY_FILE_LOC
 
     # Please complete this method to perform the above described function
-    def prepare_data() -> list[tuple[str, str]]:
-        with open(dictionaryFileLoc) as f:
-            data = f.readlines()
-            data = [d.strip() for d in data]
-            data = [(d.upper(), morse_encode(d.upper())) for d in data]
-        return data
-
-    # pairs of (word, morse_code)
-    data = prepare_data()
+    # the common case (only first symbols unknown) is one lookup in the suffix index
+    if is_first_symbol_unknown(inputStringList):
+        index = get_morse_suffix_index(dictionaryFileLoc)
+        return list(index.get(morse_tails_key(inputStringList), []))
 
-    root = build_morse_trie(data)
+    # the trie of (word, morse_code) pairs is built once and reused by later calls
+    root = get_morse_trie(dictionaryFileLoc)
 
     valid_strings = generate_morse_strings_with_trie(inputStringList, root)
 
     return valid_strings
 
 
+# Maze.findRoute search strategies: "dfs" finds any route, "hierarchical" a near-shortest
+# one (HPA*, for huge maps), the others a shortest one
+ROUTE_STRATEGIES = ("dfs", "bfs", "astar", "bidirectional", "jps", "hierarchical")
+
+
+# Maze grid cell values
+OPEN_SPACE = 0
+WALL = 1
+
+# printMaze characters of the cell values
+MAZE_RENDER_TABLE = bytes.maketrans(bytes([OPEN_SPACE, WALL]), b" *")
+
+
+class MazeGridListener:
+    """
+    Base class of the structures derived from a Maze grid (indexes, caches), which the
+    maze keeps valid by telling them about every change instead of having them rebuilt.
+    Register one with Maze.add_grid_listener.
+    """
+
+    def cell_changed(self, node_hash_value: int, old_block_type: int, new_block_type: int):
+        """
+        Called after a cell of the grid changed block type.
+
+        Args:
+            node_hash_value (int): The hash value of the node.
+            old_block_type (int): The block type before the change.
+            new_block_type (int): The block type after the change.
+        """
+
+    def grid_resized(self, old_row_stride: int):
+        """
+        Called after the grid bounds grew. New cells are walls, so no path changed,
+        but if the row stride changed every node hash value did too.
+
+        Args:
+            old_row_stride (int): The row stride before the resize.
+        """
+
+
 class Maze:
     def __init__(self):
         """
         Constructor - You may modify this, but please do not add any extra parameters
+
+        The grid is stored as a flat bytearray of cell values, row by row, with a border of
+        walls around it: row x starts at (x + 1) * row_stride + 1, where row_stride is
+        grid_width_capacity + 2. The border means neighbours are found by adding a fixed
+        offset to a node, with no bounds checks, and never leave the array.
+        Coordinates inside the bounds that were never added are walls.
+
+        The width capacity doubles when the grid outgrows it, so node hash values
+        (which depend on the row stride) only change O(log width) times.
         """
-        self.coordinates_list = []
-        self.min_x = 0
-        self.min_y = 0
         self.grid_height = 0  # number of rows
         self.grid_width = 0  # number of columns
-        self.is_adjacency_list_built = False
-        self.adjacency_list = {}  # node_hash: block_type
+        self.grid_width_capacity = 0  # number of columns the row stride has room for
+        self.row_stride = self.grid_width_capacity + 2
+        self.cells = bytearray([WALL]) * (2 * self.row_stride)
+        # node offsets of the neighbours: up, right, down, left
+        self.neighbor_offsets = (-self.row_stride, 1, self.row_stride, -1)
+        self.grid_version = 0  # incremented on every change of the grid
+        self.grid_listeners = []  # MazeGridListener
+        self.route_strategy = "dfs"  # default findRoute strategy, see ROUTE_STRATEGIES
+        self.component_index = None  # maze_components.MazeComponents, once requested
+        self.route_cache = None  # maze_routing.MazeRouteCache, once requested
+        self.hierarchy = None  # maze_hierarchy.MazeHierarchy, once requested
+        self.expanded_nodes = 0  # number of nodes expanded by the last findRoute search
 
     def addCoordinate(self, x, y, blockType):
         """
@@ -278,13 +926,242 @@ class Maze:
         blockType should be 0 (for an open space) of 1 (for a wall)
         """
         # Please complete this method to perform the above described function
-        self.grid_height = max(self.grid_height, x + 1)
-        self.grid_width = max(self.grid_width, y + 1)
-        self.coordinates_list.append((x, y, blockType))
+        if x < 0 or y < 0:
+            raise ValueError(f"maze coordinates must not be negative, got ({x}, {y})")
+        if x >= self.grid_height or y >= self.grid_width:
+            self.resize_grid(max(self.grid_height, x + 1), max(self.grid_width, y + 1))
+
+        node_hash_value = self.node_hash_function(x, y)
+        block_type = OPEN_SPACE if blockType == 0 else WALL
+        old_block_type = self.cells[node_hash_value]
+        if old_block_type != block_type:
+            self.cells[node_hash_value] = block_type
+            self.grid_version += 1
+            for listener in self.grid_listeners:
+                listener.cell_changed(node_hash_value, old_block_type, block_type)
+
+    def add_grid_listener(self, listener: MazeGridListener):
+        """
+        Registers a structure derived from the grid, to be told about every change.
+
+        Args:
+            listener (MazeGridListener): The listener.
+        """
+        self.grid_listeners.append(listener)
+
+    def remove_grid_listener(self, listener: MazeGridListener):
+        """
+        Unregisters a listener added with add_grid_listener.
+
+        Args:
+            listener (MazeGridListener): The listener.
+        """
+        self.grid_listeners.remove(listener)
+
+    def get_component_index(self):
+        """
+        Returns the connected-component index of the open cells, building it on first use.
+        Once it exists it is kept up to date as the grid changes, and findRoute uses it to
+        reject unreachable destinations without searching.
+
+        Returns:
+            MazeComponents: The component index.
+        """
+        if self.component_index is None:
+            # imported here, maze_components imports this module
+            from maze_components import MazeComponents
+
+            self.component_index = MazeComponents(self)
+        return self.component_index
+
+    def is_reachable(self, x1: int, y1: int, x2: int, y2: int) -> bool:
+        """
+        Check if there is a route between two open spaces, in O(1) with the component index.
+
+        Args:
+            x1 (int): The x-coordinate of the start.
+            y1 (int): The y-coordinate of the start.
+            x2 (int): The x-coordinate of the destination.
+            y2 (int): The y-coordinate of the destination.
+
+        Returns:
+            bool: True if both are open spaces of the same component, False otherwise.
+        """
+        if not (
+            self.is_coordinates_within_grid(x1, y1)
+            and self.is_coordinates_within_grid(x2, y2)
+        ):
+            return False
+        return self.get_component_index().is_connected(
+            self.node_hash_function(x1, y1), self.node_hash_function(x2, y2)
+        )
+
+    def component_size(self, x: int, y: int) -> int:
+        """
+        Returns the number of open spaces reachable from a coordinate, itself included.
+
+        Args:
+            x (int): The x-coordinate.
+            y (int): The y-coordinate.
+
+        Returns:
+            int: The size of the component, 0 for walls and coordinates outside the grid.
+        """
+        if not self.is_coordinates_within_grid(x, y):
+            return 0
+        return self.get_component_index().component_size(self.node_hash_function(x, y))
+
+    def component_count(self) -> int:
+        """
+        Returns the number of connected regions of open spaces.
+
+        Returns:
+            int: The number of components.
+        """
+        return self.get_component_index().component_count()
+
+    def get_route_cache(self):
+        """
+        Returns the cache of BFS trees from recently used sources, creating it on first use.
+
+        Returns:
+            MazeRouteCache: The route cache.
+        """
+        if self.route_cache is None:
+            # imported here, maze_routing imports this module
+            from maze_routing import MazeRouteCache
+
+            self.route_cache = MazeRouteCache(self)
+        return self.route_cache
+
+    def get_hierarchy(self):
+        """
+        Returns the HPA* abstraction of the grid used by the "hierarchical" strategy,
+        creating it on first use. It is built by the first query, and afterwards only
+        the clusters changed by addCoordinate are rebuilt, lazily.
+
+        Returns:
+            MazeHierarchy: The hierarchy.
+        """
+        if self.hierarchy is None:
+            # imported here, maze_hierarchy imports this module
+            from maze_hierarchy import MazeHierarchy
+
+            self.hierarchy = MazeHierarchy(self)
+        return self.hierarchy
+
+    def find_routes_from(
+        self, source: tuple[int, int], destinations: list[tuple[int, int]]
+    ) -> list[list]:
+        """
+        Finds a shortest route from one source to each of many destinations.
+        The BFS tree of the source is cached, so later queries from it need no search.
+
+        Args:
+            source (tuple[int, int]): The (x, y) coordinates of the start.
+            destinations (list[tuple[int, int]]): The (x, y) coordinates of the destinations.
+
+        Returns:
+            list[list]: The route to every destination, in order; empty if there is none.
+        """
+        return self.get_route_cache().routes_from(source, destinations)
+
+    def find_routes_between(
+        self, sources: list[tuple[int, int]], destinations: list[tuple[int, int]]
+    ) -> list[list[list]]:
+        """
+        Finds a shortest route from every source to every destination.
+
+        Args:
+            sources (list[tuple[int, int]]): The (x, y) coordinates of the starts.
+            destinations (list[tuple[int, int]]): The (x, y) coordinates of the destinations.
+
+        Returns:
+            list[list[list]]: routes[i][j] is the route from sources[i] to destinations[j].
+        """
+        return self.get_route_cache().routes_between(sources, destinations)
+
+    def resize_grid(self, grid_height: int, grid_width: int):
+        """
+        Grows the grid, new cells are walls.
+
+        Growing the height appends rows to the cells (bytearray.extend over-allocates,
+        so that is amortized). Growing the width past its capacity doubles the capacity:
+        the row stride changes, so the rows are copied to a new array and node hash
+        values change.
+
+        Args:
+            grid_height (int): The new number of rows.
+            grid_width (int): The new number of columns.
+        """
+        old_row_stride = self.row_stride
+        if grid_width > self.grid_width_capacity:
+            self.grid_width_capacity = max(grid_width, 2 * self.grid_width_capacity)
+            row_stride = self.grid_width_capacity + 2
+            cells = bytearray([WALL]) * ((self.grid_height + 2) * row_stride)
+            for x in range(self.grid_height):
+                old_start = (x + 1) * old_row_stride + 1
+                new_start = (x + 1) * row_stride + 1
+                cells[new_start : new_start + self.grid_width] = self.cells[
+                    old_start : old_start + self.grid_width
+                ]
+            self.row_stride = row_stride
+            self.cells = cells
+            self.neighbor_offsets = (-row_stride, 1, row_stride, -1)
+
+        if grid_height > self.grid_height:
+            if not isinstance(self.cells, bytearray):
+                # an adopted buffer (e.g. a memory-mapped file) can't grow
+                self.cells = bytearray(self.cells)
+            self.cells.extend(
+                bytearray([WALL]) * ((grid_height - self.grid_height) * self.row_stride)
+            )
+
+        self.grid_height = max(self.grid_height, grid_height)
+        self.grid_width = max(self.grid_width, grid_width)
+        self.grid_version += 1
+        for listener in self.grid_listeners:
+            listener.grid_resized(old_row_stride)
+
+    def adopt_grid(
+        self, cells, grid_height: int, grid_width: int, grid_width_capacity: int
+    ):
+        """
+        Replaces the grid with a buffer of cells already in the padded layout (see the
+        constructor), without copying it: a bytearray, or e.g. a memory-mapped file.
+        Registered listeners are told the row stride changed, so they rebuild.
+
+        Args:
+            cells: The cell values, a writable bytes-like object.
+            grid_height (int): The number of rows.
+            grid_width (int): The number of columns.
+            grid_width_capacity (int): The number of columns the row stride has room for.
+
+        Raises:
+            ValueError: if the size of the buffer doesn't match the dimensions.
+        """
+        row_stride = grid_width_capacity + 2
+        if (
+            grid_width > grid_width_capacity
+            or len(cells) != (grid_height + 2) * row_stride
+        ):
+            raise ValueError("the cells buffer doesn't match the grid dimensions")
+        self.grid_height = grid_height
+        self.grid_width = grid_width
+        self.grid_width_capacity = grid_width_capacity
+        self.row_stride = row_stride
+        self.cells = cells
+        self.neighbor_offsets = (-row_stride, 1, row_stride, -1)
+        self.grid_version += 1
+        for listener in self.grid_listeners:
+            # no row stride is 0, so listeners drop everything derived from the old grid
+            listener.grid_resized(0)
 
     def node_hash_function(self, x: int, y: int) -> int:
         """
-        Calculates the hash value for a given node in the grid.
+        Calculates the hash value for a given node in the grid,
+        which is its index in the cells array.
+        Hash values stay valid until the grid outgrows its width capacity.
 
         Parameters:
         - x (int): The x-coordinate of the node.
@@ -293,7 +1170,7 @@ class Maze:
         Returns:
         - int: The hash value of the node.
         """
-        return x * self.grid_width + y
+        return (x + 1) * self.row_stride + y + 1
 
     def node_inverse_hash_function(self, node_hash_value: int) -> tuple[int, int]:
         """
@@ -305,21 +1182,8 @@ class Maze:
         Returns:
             tuple[int, int]: The x and y coordinates of the node in the grid.
         """
-        x = node_hash_value // self.grid_width
-        y = node_hash_value % self.grid_width
-        return x, y
-
-    def build_adjacency_list(self):
-        """
-        Builds the adjacency list based on the coordinates list.
-
-        The method iterates over each coordinate in the coordinates list and calculates
-        the hash value for the node. It then adds the block type to the adjacency list
-        using the hash value as the key.
-        """
-        for x, y, block_type in self.coordinates_list:
-            node_hash_value = self.node_hash_function(x, y)
-            self.adjacency_list[node_hash_value] = block_type
+        x, y = divmod(node_hash_value, self.row_stride)
+        return x - 1, y - 1
 
     def printMaze(self):
         """
@@ -328,24 +1192,12 @@ class Maze:
         """
 
         # Please complete this method to perform the above described function
-        if not self.is_adjacency_list_built:
-            self.build_adjacency_list()
-
-        maze_str = ""
-
-        for i in range(self.grid_height):
-            for j in range(self.grid_width):
-                node_hash_value = self.node_hash_function(i, j)
-                if (
-                    node_hash_value in self.adjacency_list.keys()
-                    and self.adjacency_list[node_hash_value] == 0
-                ):
-                    maze_str += " "
-                else:
-                    maze_str += "*"
-            maze_str += "\n"
+        # imported here, maze_render imports this module
+        from maze_render import write_maze
 
-        print(maze_str)
+        # rows are streamed to stdout, see maze_render for viewports, overviews and routes
+        write_maze(self, sys.stdout)
+        print()
 
     def is_coordinates_within_grid(self, x: int, y: int):
         """
@@ -363,6 +1215,7 @@ class Maze:
     def get_node_neighbors(self, node_hash_value: int):
         """
         Returns a list of hash values representing the neighbors of a given node.
+        Neighbors of a node on the edge of the grid include border cells, which are walls.
 
         Parameters:
         - node_hash_value (int): The hash value of the node.
@@ -370,16 +1223,7 @@ class Maze:
         Returns:
         - node_neighbors (list): A list of hash values representing the neighbors of the node.
         """
-        x, y = self.node_inverse_hash_function(node_hash_value)
-        dx = [-1, 0, 1, 0]
-        dy = [0, 1, 0, -1]
-        node_neighbors = []
-        for delta_x, delta_y in zip(dx, dy):
-            new_x = x + delta_x
-            new_y = y + delta_y
-            if self.is_coordinates_within_grid(new_x, new_y):
-                node_neighbors.append(self.node_hash_function(new_x, new_y))
-        return node_neighbors
+        return [node_hash_value + offset for offset in self.neighbor_offsets]
 
     def reconstruct_path(self, destination_node, parent_node_map):
         """
@@ -399,49 +1243,404 @@ class Maze:
             current_node = parent_node_map[current_node]
         return path[::-1]
 
-    def findRoute(self, x1, y1, x2, y2):
+    def is_open_node(self, node_hash_value: int) -> bool:
         """
-        This method should find a route, traversing open spaces, from the coordinates (x1,y1) to (x2,y2)
-        It should return the list of traversed coordinates followed along this route as a list of tuples (x,y),
-        in the order in which the coordinates must be followed
-        If no route is found, return an empty list
+        Check if a node is an open space (not a wall and not on the grid border).
+
+        Args:
+            node_hash_value (int): The hash value of the node.
+
+        Returns:
+            bool: True if the node can be traversed, False otherwise.
         """
-        if not self.is_adjacency_list_built:
-            self.build_adjacency_list()
+        return self.cells[node_hash_value] == OPEN_SPACE
 
-        start_node = self.node_hash_function(x1, y1)
-        destination_node = self.node_hash_function(x2, y2)
+    def search_dfs(self, start_node: int, destination_node: int):
+        """
+        Depth first search from the start node to the destination node.
+        Finds a route quickly, but not necessarily the shortest one.
+
+        Args:
+            start_node (int): The hash value of the start node.
+            destination_node (int): The hash value of the destination node.
 
+        Returns:
+            dict: The parent node map of the search if the destination was reached, None otherwise.
+        """
+        cells, neighbor_offsets = self.cells, self.neighbor_offsets
         stack = [start_node]
-        visited_nodes = set()
-        parent_node_map = {}
+        parent_node_map = {}  # also the set of visited nodes
 
-        visited_nodes.add(start_node)
         parent_node_map[start_node] = -1
 
-        destination_reached = False
-
         while len(stack) != 0:
             current_node = stack.pop()
+            self.expanded_nodes += 1
 
             if current_node == destination_node:
-                destination_reached = True
-                break
-
-            neighbor_nodes = self.get_node_neighbors(current_node)
+                return parent_node_map
 
-            for neighbor_node in neighbor_nodes:
+            for offset in neighbor_offsets:
+                neighbor_node = current_node + offset
                 if (
-                    neighbor_node not in visited_nodes  # node not visited
-                    and neighbor_node
-                    in self.adjacency_list.keys()  # node in adjacency list
-                    and self.adjacency_list[neighbor_node] == 0
-                ):  # node is an open space not wall
-                    visited_nodes.add(neighbor_node)
+                    neighbor_node not in parent_node_map  # node not visited
+                    and cells[neighbor_node] == OPEN_SPACE  # node is an open space not wall
+                ):
                     stack.append(neighbor_node)
                     parent_node_map[neighbor_node] = current_node
 
-        if destination_reached:
+        return None
+
+    def search_bfs(self, start_node: int, destination_node: int):
+        """
+        Breadth first search from the start node to the destination node.
+        Nodes are reached in order of distance, so the route found is a shortest one.
+        The search stops as soon as the destination is discovered.
+
+        Args:
+            start_node (int): The hash value of the start node.
+            destination_node (int): The hash value of the destination node.
+
+        Returns:
+            dict: The parent node map of the search if the destination was reached, None otherwise.
+        """
+        parent_node_map = {start_node: -1}
+        if start_node == destination_node:
+            return parent_node_map
+
+        cells, neighbor_offsets = self.cells, self.neighbor_offsets
+        queue = deque([start_node])
+        while queue:
+            current_node = queue.popleft()
+            self.expanded_nodes += 1
+            for offset in neighbor_offsets:
+                neighbor_node = current_node + offset
+                if (
+                    neighbor_node not in parent_node_map
+                    and cells[neighbor_node] == OPEN_SPACE
+                ):
+                    parent_node_map[neighbor_node] = current_node
+                    if neighbor_node == destination_node:
+                        return parent_node_map
+                    queue.append(neighbor_node)
+
+        return None
+
+    def search_astar(self, start_node: int, destination_node: int):
+        """
+        A* search from the start node to the destination node, with the Manhattan distance
+        as heuristic. The heuristic never overestimates on a 4-connected grid, so the route
+        found is a shortest one, while far fewer nodes than BFS are expanded on large grids.
+
+        Args:
+            start_node (int): The hash value of the start node.
+            destination_node (int): The hash value of the destination node.
+
+        Returns:
+            dict: The parent node map of the search if the destination was reached, None otherwise.
+        """
+        cells, neighbor_offsets = self.cells, self.neighbor_offsets
+        destination_x, destination_y = self.node_inverse_hash_function(destination_node)
+
+        def manhattan_distance(node_hash_value: int) -> int:
+            x, y = self.node_inverse_hash_function(node_hash_value)
+            return abs(x - destination_x) + abs(y - destination_y)
+
+        parent_node_map = {start_node: -1}
+        distances = {start_node: 0}
+        closed_nodes = set()
+        # (estimated total distance, -distance so far, node): ties go to the deeper node
+        heap = [(manhattan_distance(start_node), 0, start_node)]
+
+        while heap:
+            _, negative_distance, current_node = heapq.heappop(heap)
+            if current_node == destination_node:
+                return parent_node_map
+            if current_node in closed_nodes:
+                continue
+            closed_nodes.add(current_node)
+            self.expanded_nodes += 1
+
+            neighbor_distance = -negative_distance + 1
+            for offset in neighbor_offsets:
+                neighbor_node = current_node + offset
+                if (
+                    neighbor_node not in closed_nodes
+                    and cells[neighbor_node] == OPEN_SPACE
+                    and neighbor_distance < distances.get(neighbor_node, neighbor_distance + 1)
+                ):
+                    distances[neighbor_node] = neighbor_distance
+                    parent_node_map[neighbor_node] = current_node
+                    heapq.heappush(
+                        heap,
+                        (
+                            neighbor_distance + manhattan_distance(neighbor_node),
+                            -neighbor_distance,
+                            neighbor_node,
+                        ),
+                    )
+
+        return None
+
+    def search_bidirectional(self, start_node: int, destination_node: int):
+        """
+        Bidirectional breadth first search: a search from each end, a whole level of the
+        smaller frontier at a time, until they meet. Each side only goes about half the
+        route length deep, so far fewer nodes are expanded than by BFS in open areas.
+        The shortest meeting in the level where the searches first meet gives a shortest route.
+
+        Args:
+            start_node (int): The hash value of the start node.
+            destination_node (int): The hash value of the destination node.
+
+        Returns:
+            dict: The parent node map of the route if the destination was reached, None otherwise.
+        """
+        if start_node == destination_node:
+            return {start_node: -1}
+        cells, neighbor_offsets = self.cells, self.neighbor_offsets
+        if cells[destination_node] != OPEN_SPACE:
+            return None
+
+        # parents and distances of each side, from the start and from the destination
+        forward_parents, backward_parents = {start_node: -1}, {destination_node: -1}
+        forward_distances, backward_distances = {start_node: 0}, {destination_node: 0}
+        forward_frontier, backward_frontier = [start_node], [destination_node]
+        forward_depth = backward_depth = 0
+
+        while forward_frontier and backward_frontier:
+            is_forward = len(forward_frontier) <= len(backward_frontier)
+            if is_forward:
+                frontier, depth = forward_frontier, forward_depth
+                parents, distances = forward_parents, forward_distances
+                other_distances = backward_distances
+            else:
+                frontier, depth = backward_frontier, backward_depth
+                parents, distances = backward_parents, backward_distances
+                other_distances = forward_distances
+
+            # (route length, meeting node) of the shortest meeting in this level
+            best_meeting = None
+            next_frontier = []
+            for current_node in frontier:
+                self.expanded_nodes += 1
+                for offset in neighbor_offsets:
+                    neighbor_node = current_node + offset
+                    if neighbor_node in parents:
+                        continue
+                    # the start may be a wall: the backward search may still end on it
+                    if cells[neighbor_node] != OPEN_SPACE and not (
+                        not is_forward and neighbor_node == start_node
+                    ):
+                        continue
+                    parents[neighbor_node] = current_node
+                    distances[neighbor_node] = depth + 1
+                    next_frontier.append(neighbor_node)
+                    if neighbor_node in other_distances:
+                        route_length = depth + 1 + other_distances[neighbor_node]
+                        if best_meeting is None or route_length < best_meeting[0]:
+                            best_meeting = (route_length, neighbor_node)
+
+            if best_meeting is not None:
+                # join the sides: reverse the backward parents from the meeting node
+                current_node = best_meeting[1]
+                while backward_parents[current_node] != -1:
+                    next_node = backward_parents[current_node]
+                    forward_parents[next_node] = current_node
+                    current_node = next_node
+                return forward_parents
+
+            if is_forward:
+                forward_frontier, forward_depth = next_frontier, depth + 1
+            else:
+                backward_frontier, backward_depth = next_frontier, depth + 1
+
+        return None
+
+    def jump(self, node_hash_value: int, offset: int, destination_node: int) -> int:
+        """
+        Moves from a node in a straight line (one neighbour offset at a time) until a jump
+        point of Jump Point Search: the destination, or a node where a route may have to turn.
+        Along a row that is a node with an open cell on a side whose cell behind is closed
+        (a forced neighbour); along a column, also a node from which a jump along its row
+        finds a jump point.
+
+        Args:
+            node_hash_value (int): The hash value of the first node of the line.
+            offset (int): The neighbour offset of the move.
+            destination_node (int): The hash value of the destination node.
+
+        Returns:
+            int: The hash value of the jump point, -1 if a wall comes first.
+        """
+        cells, row_stride = self.cells, self.row_stride
+        along_row = offset == 1 or offset == -1
+        side_offsets = (row_stride, -row_stride) if along_row else (1, -1)
+        current_node = node_hash_value
+        while cells[current_node] == OPEN_SPACE:
+            if current_node == destination_node:
+                return current_node
+            for side_offset in side_offsets:
+                if (
+                    cells[current_node + side_offset] == OPEN_SPACE
+                    and cells[current_node + side_offset - offset] != OPEN_SPACE
+                ):
+                    return current_node
+            if not along_row and (
+                self.jump(current_node + 1, 1, destination_node) != -1
+                or self.jump(current_node - 1, -1, destination_node) != -1
+            ):
+                return current_node
+            current_node += offset
+        return -1
+
+    def search_jps(self, start_node: int, destination_node: int):
+        """
+        Jump Point Search for a 4-connected grid of uniform cost: A* (Manhattan heuristic)
+        over jump points only. Straight runs of open cells are skipped by jump() instead of
+        being expanded node by node, and a node is only expanded away from its parent,
+        so on large open grids a tiny fraction of the nodes are expanded. The route found
+        is a shortest one.
+
+        Args:
+            start_node (int): The hash value of the start node.
+            destination_node (int): The hash value of the destination node.
+
+        Returns:
+            dict: The parent node map of the route if the destination was reached, None otherwise.
+        """
+        row_stride = self.row_stride
+        destination_x, destination_y = self.node_inverse_hash_function(destination_node)
+
+        def manhattan_distance(node_hash_value: int) -> int:
+            x, y = self.node_inverse_hash_function(node_hash_value)
+            return abs(x - destination_x) + abs(y - destination_y)
+
+        def unit_offset(from_node: int, to_node: int) -> tuple[int, int]:
+            """The neighbour offset of a straight line between two nodes and its length"""
+            difference = to_node - from_node
+            if -row_stride < difference < row_stride:
+                return (1 if difference > 0 else -1), abs(difference)
+            length = abs(difference) // row_stride
+            return (row_stride if difference > 0 else -row_stride), length
+
+        jump_parents = {start_node: -1}
+        distances = {start_node: 0}
+        closed_nodes = set()
+        heap = [(manhattan_distance(start_node), 0, start_node)]
+
+        while heap:
+            _, negative_distance, current_node = heapq.heappop(heap)
+            if current_node == destination_node:
+                break
+            if current_node in closed_nodes:
+                continue
+            closed_nodes.add(current_node)
+            self.expanded_nodes += 1
+
+            parent_node = jump_parents[current_node]
+            if parent_node == -1:
+                offsets = self.neighbor_offsets
+            else:
+                # pruned neighbours: straight on and to both sides, never back
+                offset, _ = unit_offset(parent_node, current_node)
+                if offset in (1, -1):
+                    side_offsets = (row_stride, -row_stride)
+                else:
+                    side_offsets = (1, -1)
+                offsets = (offset,) + side_offsets
+
+            for offset in offsets:
+                jump_point = self.jump(current_node + offset, offset, destination_node)
+                if jump_point == -1 or jump_point in closed_nodes:
+                    continue
+                _, jump_length = unit_offset(current_node, jump_point)
+                jump_distance = -negative_distance + jump_length
+                if jump_distance < distances.get(jump_point, jump_distance + 1):
+                    distances[jump_point] = jump_distance
+                    jump_parents[jump_point] = current_node
+                    heapq.heappush(
+                        heap,
+                        (
+                            jump_distance + manhattan_distance(jump_point),
+                            -jump_distance,
+                            jump_point,
+                        ),
+                    )
+        else:
+            return None
+
+        # fill in the nodes between consecutive jump points
+        parent_node_map = {start_node: -1}
+        current_node = destination_node
+        while current_node != start_node:
+            jump_parent = jump_parents[current_node]
+            offset, _ = unit_offset(jump_parent, current_node)
+            while current_node != jump_parent:
+                parent_node_map[current_node] = current_node - offset
+                current_node -= offset
+        return parent_node_map
+
+    def search_hierarchical(self, start_node: int, destination_node: int):
+        """
+        Hierarchical search (HPA*) over clusters of the grid, see maze_hierarchy.
+        The route found is close to a shortest one, at a cost that grows with the
+        route length rather than the size of the grid.
+
+        Args:
+            start_node (int): The hash value of the start node.
+            destination_node (int): The hash value of the destination node.
+
+        Returns:
+            dict: The parent node map of the route if the destination was reached, None otherwise.
+        """
+        route_nodes = self.get_hierarchy().search(start_node, destination_node)
+        if route_nodes is None:
+            return None
+        parent_node_map = {route_nodes[0]: -1}
+        for parent_node, node in zip(route_nodes, route_nodes[1:]):
+            parent_node_map[node] = parent_node
+        return parent_node_map
+
+    def findRoute(self, x1, y1, x2, y2, strategy=None):
+        """
+        This method should find a route, traversing open spaces, from the coordinates (x1,y1) to (x2,y2)
+        It should return the list of traversed coordinates followed along this route as a list of tuples (x,y),
+        in the order in which the coordinates must be followed
+        If no route is found, return an empty list
+
+        strategy selects the search: "dfs" (any route), "bfs", "astar", "bidirectional"
+        or "jps" (a shortest route), or "hierarchical" (a near-shortest route).
+        Defaults to self.route_strategy.
+        The number of nodes the search expanded is left in self.expanded_nodes.
+        """
+        if strategy is None:
+            strategy = self.route_strategy
+        if strategy not in ROUTE_STRATEGIES:
+            raise ValueError(f"unknown route strategy {strategy!r}")
+        self.expanded_nodes = 0
+
+        if not (
+            self.is_coordinates_within_grid(x1, y1)
+            and self.is_coordinates_within_grid(x2, y2)
+        ):
+            return []
+
+        start_node = self.node_hash_function(x1, y1)
+        destination_node = self.node_hash_function(x2, y2)
+
+        if (
+            self.component_index is not None
+            and start_node != destination_node
+            and self.is_open_node(start_node)  # a route may leave a wall start cell
+            and not self.component_index.is_connected(start_node, destination_node)
+        ):
+            return []
+
+        search = getattr(self, "search_" + strategy)
+        parent_node_map = search(start_node, destination_node)
+
+        if parent_node_map is not None:
             return self.reconstruct_path(destination_node, parent_node_map)
         else:
             return []
@@ -0,0 +1,72 @@
+import itertools
+import os
+import random
+
+import pytest
+
+from compact_trie import CompactMorseTrie, generate_morse_strings_with_compact_trie
+from practical import (
+    build_morse_trie,
+    generate_morse_strings_with_trie,
+    load_morse_dictionary,
+    morse_encode,
+)
+
+
+@pytest.fixture(scope="module")
+def dictionary() -> list[tuple[str, list[str]]]:
+    dictionary_file_loc = os.path.join(os.path.dirname(__file__), "dictionary.txt")
+    with open(dictionary_file_loc) as f:
+        words = [line.strip() for line in itertools.islice(f, 0, None, 40)]
+    # every 40th word, out of order: the trie sorts the codes itself
+    random.Random(3).shuffle(words)
+    return [(word.upper(), morse_encode(word.upper())) for word in words]
+
+
+def hide_symbols(morse_code: list[str], rng: random.Random) -> list[str]:
+    return [
+        "".join("x" if rng.random() < 0.4 else symbol for symbol in letter)
+        for letter in morse_code
+    ]
+
+
+def test_lookup_finds_every_word(dictionary):
+    trie = CompactMorseTrie(dictionary)
+    words_by_code = {tuple(code): word for word, code in dictionary}
+    assert len(trie) == len(words_by_code)
+    for code, word in words_by_code.items():
+        assert trie.lookup(list(code)) == word
+        assert list(code) in trie
+    assert trie.lookup(["not a letter"]) is None
+
+
+def test_minimization_shares_suffixes(dictionary):
+    trie = CompactMorseTrie(dictionary)
+    prefixes = {
+        tuple(code[:length])
+        for _, code in dictionary
+        for length in range(len(code) + 1)
+    }
+    assert trie.node_count < len(prefixes)
+
+
+def test_partial_decodes_match_the_trie_node_version(dictionary):
+    compact_trie = CompactMorseTrie(dictionary)
+    trie = build_morse_trie(dictionary)
+    rng = random.Random(5)
+    for _, code in rng.sample(dictionary, 300):
+        query = hide_symbols(code, rng)
+        assert generate_morse_strings_with_compact_trie(query, compact_trie) == (
+            generate_morse_strings_with_trie(query, trie)
+        )
+
+
+def test_small_dictionary(small_dictionary):
+    dictionary = load_morse_dictionary(small_dictionary)
+    compact_trie = CompactMorseTrie(dictionary)
+    trie = build_morse_trie(dictionary)
+    for query in (["x", "x", "x..", "x"], ["x", "x", "x"], ["x-"], []):
+        assert generate_morse_strings_with_compact_trie(query, compact_trie) == (
+            generate_morse_strings_with_trie(query, trie)
+        )
+    assert compact_trie.nbytes > 0
@@ -0,0 +1,84 @@
+import random
+
+from maze_components import MazeComponents
+from practical import Maze
+
+
+def make_maze(rows: list[str]) -> Maze:
+    maze = Maze()
+    for x, row in enumerate(rows):
+        for y, character in enumerate(row):
+            maze.addCoordinate(x, y, 1 if character == "*" else 0)
+    return maze
+
+
+def flood_fill_size(maze: Maze, x: int, y: int) -> int:
+    if not maze.is_coordinates_within_grid(x, y):
+        return 0
+    start_node = maze.node_hash_function(x, y)
+    if not maze.is_open_node(start_node):
+        return 0
+    seen = {start_node}
+    stack = [start_node]
+    while stack:
+        for neighbor_node in maze.get_node_neighbors(stack.pop()):
+            if neighbor_node not in seen and maze.is_open_node(neighbor_node):
+                seen.add(neighbor_node)
+                stack.append(neighbor_node)
+    return len(seen)
+
+
+def test_component_size_on_first_use():
+    maze = make_maze(["   "])
+    assert maze.component_size(0, 1) == 3
+    assert maze.component_count() == 1
+
+
+def test_component_size_of_wall_is_zero():
+    maze = make_maze([" * "])
+    assert maze.component_size(0, 1) == 0
+    assert maze.component_size(5, 5) == 0
+
+
+def test_component_size_after_split():
+    maze = make_maze(["   "])
+    assert maze.component_size(0, 0) == 3
+    maze.addCoordinate(0, 1, 1)
+    assert maze.component_size(0, 0) == 1
+    assert maze.component_size(0, 2) == 1
+    assert maze.component_count() == 2
+    assert not maze.is_reachable(0, 0, 0, 2)
+
+
+def test_component_size_after_join():
+    maze = make_maze([" * "])
+    assert maze.component_count() == 2
+    maze.addCoordinate(0, 1, 0)
+    assert maze.component_size(0, 2) == 3
+    assert maze.is_reachable(0, 0, 0, 2)
+
+
+def test_component_size_after_resize():
+    maze = make_maze(["  "])
+    assert maze.component_size(0, 0) == 2
+    # outgrows the width capacity, so the row stride changes
+    for y in range(2, 9):
+        maze.addCoordinate(0, y, 0)
+    maze.addCoordinate(1, 0, 0)
+    assert maze.component_size(0, 0) == 10
+    assert maze.component_size(1, 0) == 10
+
+
+def test_matches_flood_fill_on_random_edits():
+    random.seed(7)
+    maze = make_maze(
+        ["".join(random.choice(" *") for _ in range(12)) for _ in range(12)]
+    )
+    components = maze.get_component_index()
+    assert isinstance(components, MazeComponents)
+    for _ in range(300):
+        maze.addCoordinate(
+            random.randrange(14), random.randrange(14), random.randrange(2)
+        )
+        x, y = random.randrange(14), random.randrange(14)
+        assert maze.component_size(x, y) == flood_fill_size(maze, x, y)
@@ -0,0 +1,69 @@
+import pytest
+
+from conftest import maze_from_grid, random_grid
+from practical import OPEN_SPACE, WALL, Maze
+
+
+def test_hash_values_are_cell_indices():
+    maze = maze_from_grid(random_grid(7, 9, 1))
+    hash_values = set()
+    for x in range(7):
+        for y in range(9):
+            node_hash_value = maze.node_hash_function(x, y)
+            assert maze.node_inverse_hash_function(node_hash_value) == (x, y)
+            assert 0 <= node_hash_value < len(maze.cells)
+            hash_values.add(node_hash_value)
+    assert len(hash_values) == 7 * 9
+
+
+def test_cells_hold_the_block_types():
+    grid = random_grid(6, 5, 2)
+    maze = maze_from_grid(grid)
+    for x, row in enumerate(grid):
+        for y, block_type in enumerate(row):
+            expected = WALL if block_type else OPEN_SPACE
+            assert maze.cells[maze.node_hash_function(x, y)] == expected
+            assert maze.is_open_node(maze.node_hash_function(x, y)) == (not block_type)
+
+
+def test_border_is_walls():
+    maze = maze_from_grid([[0] * 4 for _ in range(3)])
+    for x in range(-1, 4):
+        for y in range(-1, 5):
+            if not maze.is_coordinates_within_grid(x, y):
+                assert not maze.is_open_node(maze.node_hash_function(x, y))
+
+
+def test_neighbors_of_an_edge_cell_include_the_border():
+    maze = maze_from_grid([[0] * 3 for _ in range(3)])
+    node_hash_value = maze.node_hash_function(0, 0)
+    neighbors = maze.get_node_neighbors(node_hash_value)
+    assert [maze.node_inverse_hash_function(node) for node in neighbors] == [
+        (-1, 0),
+        (0, 1),
+        (1, 0),
+        (0, -1),
+    ]
+    assert [maze.is_open_node(node) for node in neighbors] == [False, True, True, False]
+
+
+def test_cells_never_added_are_walls():
+    maze = Maze()
+    maze.addCoordinate(0, 0, 0)
+    maze.addCoordinate(2, 3, 0)
+    assert (maze.grid_height, maze.grid_width) == (3, 4)
+    assert not maze.is_open_node(maze.node_hash_function(1, 1))
+    assert maze.findRoute(0, 0, 2, 3, "bfs") == []
+
+
+def test_other_block_types_are_walls():
+    maze = Maze()
+    maze.addCoordinate(0, 0, 7)
+    assert maze.cells[maze.node_hash_function(0, 0)] == WALL
+
+
+def test_negative_coordinates():
+    maze = Maze()
+    with pytest.raises(ValueError):
+        maze.addCoordinate(-1, 0, 0)
+    assert not maze.is_coordinates_within_grid(-1, 0)
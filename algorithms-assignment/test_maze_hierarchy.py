@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from conftest import assert_valid_route, maze_from_grid, random_grid
+from maze_hierarchy import MazeHierarchy
+
+# a near-shortest route may be this much longer than a shortest one
+MAX_DETOUR_RATIO = 1.5
+
+
+def random_queries(grid: list[list[int]], count: int, seed: int) -> list[tuple]:
+    rng = random.Random(seed)
+    open_cells = [
+        (x, y)
+        for x, row in enumerate(grid)
+        for y, block_type in enumerate(row)
+        if not block_type
+    ]
+    return [(rng.choice(open_cells), rng.choice(open_cells)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_routes_are_valid_and_near_shortest(seed):
+    grid = random_grid(64, 64, seed, wall_ratio=0.2)
+    maze = maze_from_grid(grid)
+    for start, destination in random_queries(grid, 40, seed):
+        route = maze.findRoute(*start, *destination, "hierarchical")
+        shortest_route = maze.findRoute(*start, *destination, "bfs")
+        assert bool(route) == bool(shortest_route)
+        if route:
+            assert_valid_route(grid, route, start, destination)
+            assert len(route) <= MAX_DETOUR_RATIO * len(shortest_route)
+
+
+def test_routes_follow_grid_changes():
+    grid = random_grid(48, 48, 7, wall_ratio=0.2)
+    maze = maze_from_grid(grid)
+    rng = random.Random(7)
+    for start, destination in random_queries(grid, 20, 7):
+        # change a cell of some cluster, then query: its cluster is rebuilt lazily
+        x, y = rng.randrange(48), rng.randrange(48)
+        if (x, y) not in (start, destination):
+            grid[x][y] = 1 - grid[x][y]
+            maze.addCoordinate(x, y, grid[x][y])
+        route = maze.findRoute(*start, *destination, "hierarchical")
+        assert bool(route) == bool(maze.findRoute(*start, *destination, "bfs"))
+        if route:
+            assert_valid_route(grid, route, start, destination)
+
+
+def test_routes_after_growth():
+    grid = [[0] * 20 for _ in range(20)]
+    maze = maze_from_grid(grid)
+    assert len(maze.findRoute(0, 0, 19, 19, "hierarchical")) == 39
+    for x in range(20, 40):
+        maze.addCoordinate(x, 19, 0)
+    grid.extend([1] * 19 + [0] for _ in range(20))
+    route = maze.findRoute(0, 0, 39, 19, "hierarchical")
+    assert_valid_route(grid, route, (0, 0), (39, 19))
+
+
+def test_wall_start_and_destination():
+    maze = maze_from_grid([[0] * 40 for _ in range(40)])
+    maze.addCoordinate(0, 0, 1)
+    maze.addCoordinate(39, 39, 1)
+    # like the other strategies, a route may leave a wall start but not end on a wall
+    assert len(maze.findRoute(0, 0, 20, 30, "hierarchical")) == 51
+    assert maze.findRoute(20, 30, 39, 39, "hierarchical") == []
+
+
+def test_walled_off_destination():
+    grid = [[0] * 40 for _ in range(40)]
+    for y in range(40):
+        grid[20][y] = 1
+    maze = maze_from_grid(grid)
+    assert maze.findRoute(0, 0, 39, 39, "hierarchical") == []
+
+
+def test_cluster_size_is_checked():
+    maze = maze_from_grid([[0]])
+    with pytest.raises(ValueError):
+        MazeHierarchy(maze, cluster_size=1)
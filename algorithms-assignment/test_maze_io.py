@@ -0,0 +1,110 @@
+import io
+from array import array
+
+import pytest
+
+from conftest import maze_from_grid, random_grid
+from maze_io import (
+    load_ascii_maze,
+    load_packed_maze,
+    maze_from_block_types,
+    maze_from_rows,
+    open_maze_grid,
+    save_maze_grid,
+    save_packed_maze,
+)
+from maze_render import write_maze
+from practical import OPEN_SPACE, WALL
+
+
+def block_types(maze) -> list[list[int]]:
+    return [
+        [
+            int(not maze.is_open_node(maze.node_hash_function(x, y)))
+            for y in range(maze.grid_width)
+        ]
+        for x in range(maze.grid_height)
+    ]
+
+
+def test_rows():
+    maze = maze_from_rows([bytes([OPEN_SPACE, WALL, OPEN_SPACE]), bytes([OPEN_SPACE])])
+    assert (maze.grid_height, maze.grid_width) == (2, 3)
+    # short rows are padded with walls
+    assert block_types(maze) == [[0, 1, 0], [0, 1, 1]]
+
+
+def test_row_longer_than_the_width():
+    with pytest.raises(ValueError, match="row 1"):
+        maze_from_rows([bytes(2), bytes(3)], grid_width=2)
+
+
+def test_block_types():
+    grid = random_grid(5, 7, 1)
+    expected = block_types(maze_from_grid(grid))
+    assert block_types(maze_from_block_types(grid)) == expected
+    assert block_types(maze_from_block_types([bytes(row) for row in grid])) == expected
+    flat = memoryview(bytes(block_type for row in grid for block_type in row))
+    assert block_types(maze_from_block_types(flat.cast("B", (5, 7)))) == expected
+    wide = array("i", [block_type * 9 for row in grid for block_type in row])
+    wide_view = memoryview(wide).cast("B").cast("i", (5, 7))
+    assert block_types(maze_from_block_types(wide_view)) == expected
+
+
+def test_ascii_maze(tmp_path):
+    grid = random_grid(6, 9, 2)
+    maze = maze_from_grid(grid)
+    rendering = io.StringIO()
+    write_maze(maze, rendering)
+    text = rendering.getvalue()
+
+    path = tmp_path / "maze.txt"
+    path.write_text(text)
+    assert block_types(load_ascii_maze(path)) == grid
+    assert block_types(load_ascii_maze(str(path))) == grid
+    assert block_types(load_ascii_maze(io.StringIO(text + "\n\n"))) == grid
+    crlf_text = text.replace("\n", "\r\n").encode()
+    assert block_types(load_ascii_maze(io.BytesIO(crlf_text))) == grid
+
+
+def test_ascii_maze_with_a_route():
+    maze = load_ascii_maze(io.StringIO("o**\noo*\n*oo\n"))
+    assert block_types(maze) == [[0, 1, 1], [0, 0, 1], [1, 0, 0]]
+
+
+def test_ascii_maze_with_other_characters():
+    with pytest.raises(ValueError, match="row 1"):
+        load_ascii_maze(io.StringIO(" * \n #\n"))
+
+
+@pytest.mark.parametrize("grid_width", [1, 8, 13])
+def test_packed_maze_round_trip(tmp_path, grid_width):
+    grid = random_grid(5, grid_width, grid_width)
+    save_packed_maze(maze_from_grid(grid), str(tmp_path / "maze.mazebits"))
+    assert block_types(load_packed_maze(str(tmp_path / "maze.mazebits"))) == grid
+
+
+def test_maze_grid_round_trip(tmp_path):
+    grid = random_grid(7, 11, 3)
+    maze = maze_from_grid(grid)
+    file_loc = str(tmp_path / "maze.mazegrid")
+    save_maze_grid(maze, file_loc)
+    mapped_maze = open_maze_grid(file_loc)
+    assert block_types(mapped_maze) == grid
+    assert mapped_maze.findRoute(0, 0, 6, 10, "bfs") == maze.findRoute(
+        0, 0, 6, 10, "bfs"
+    )
+
+    # changes stay in memory
+    mapped_maze.addCoordinate(3, 3, 1 - grid[3][3])
+    assert block_types(open_maze_grid(file_loc)) == grid
+    mapped_maze.addCoordinate(7, 0, 0)
+    assert mapped_maze.grid_height == 8
+
+
+@pytest.mark.parametrize("load", [load_packed_maze, open_maze_grid])
+def test_other_files(tmp_path, load):
+    path = tmp_path / "maze.bin"
+    path.write_bytes(b"not a maze" * 10)
+    with pytest.raises(ValueError):
+        load(str(path))
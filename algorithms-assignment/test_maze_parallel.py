@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+import maze_parallel
+from conftest import maze_from_grid, random_grid
+from maze_parallel import (
+    MIN_PARALLEL_BATCH_SIZE,
+    decode_route,
+    findRouteBatch,
+    solve_route,
+)
+
+
+def random_queries(count: int, grid_height: int, grid_width: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [
+        (
+            rng.randrange(-1, grid_height + 1),
+            rng.randrange(grid_width),
+            rng.randrange(grid_height),
+            rng.randrange(grid_width + 1),
+        )
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("strategy", ["dfs", "bfs", "jps"])
+def test_encoded_routes_decode_to_find_route(strategy):
+    maze = maze_from_grid(random_grid(15, 15, 1, wall_ratio=0.25))
+    for query in random_queries(50, 15, 15, 2):
+        directions = solve_route(maze, query, strategy)
+        assert decode_route(query[:2], directions) == maze.findRoute(*query, strategy)
+
+
+def test_route_of_one_cell():
+    maze = maze_from_grid([[0, 0]])
+    assert solve_route(maze, (0, 1, 0, 1), "bfs") == b""
+    assert decode_route((0, 1), b"") == [(0, 1)]
+    assert decode_route((0, 1), None) == []
+
+
+def test_pool_batch_matches_serial_batch():
+    maze = maze_from_grid(random_grid(30, 40, 3, wall_ratio=0.25))
+    queries = random_queries(MIN_PARALLEL_BATCH_SIZE * 3, 30, 40, 4)
+    routes = findRouteBatch(maze, queries, "bfs", processes=2, chunksize=16)
+    assert routes == findRouteBatch(maze, queries, "bfs", processes=1)
+    assert routes == [maze.findRoute(*query, "bfs") for query in queries]
+
+
+def test_small_batch_does_not_start_a_pool(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("pool started")
+
+    monkeypatch.setattr(maze_parallel.multiprocessing, "Pool", fail)
+    maze = maze_from_grid(random_grid(10, 10, 5))
+    queries = random_queries(MIN_PARALLEL_BATCH_SIZE - 1, 10, 10, 6)
+    maze.route_strategy = "astar"
+    assert findRouteBatch(maze, queries, processes=2) == [
+        maze.findRoute(*query, "astar") for query in queries
+    ]
+
+
+def test_unknown_strategy():
+    maze = maze_from_grid([[0]])
+    with pytest.raises(ValueError):
+        findRouteBatch(maze, [(0, 0, 0, 0)], "greedy")
@@ -0,0 +1,93 @@
+import io
+
+import pytest
+
+from conftest import maze_from_grid
+from maze_render import is_text_stream, iter_maze_rows, write_maze
+
+GRID = [
+    [0, 1, 1, 0],
+    [0, 0, 1, 0],
+    [1, 0, 0, 0],
+]
+RENDERING = " ** \n  * \n*   \n"
+
+
+class TextSink:
+    """A text stream that is neither an io class nor has a mode"""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            raise TypeError("write() argument must be str")
+        self.parts.append(text)
+        return len(text)
+
+
+class BinarySink(TextSink):
+    def write(self, data: bytes) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+
+def test_rows():
+    maze = maze_from_grid(GRID)
+    assert b"".join(iter_maze_rows(maze)) == RENDERING.encode()
+
+
+def test_viewport_and_route():
+    maze = maze_from_grid(GRID)
+    route = maze.findRoute(0, 0, 2, 3, "bfs")
+    assert b"".join(iter_maze_rows(maze, route=route)) == b"o** \noo* \n*ooo\n"
+    assert b"".join(iter_maze_rows(maze, viewport=(1, 10, -5, 2))) == b"  \n* \n"
+
+
+def test_overview():
+    maze = maze_from_grid([[1, 1, 0, 0], [1, 1, 0, 0]])
+    assert b"".join(iter_maze_rows(maze, scale=2)) == b"* \n"
+
+
+@pytest.mark.parametrize(
+    "output, is_text",
+    [
+        (io.StringIO(), True),
+        (io.BytesIO(), False),
+        (TextSink(), True),
+        (BinarySink(), False),
+    ],
+)
+def test_stream_mode(output, is_text):
+    assert is_text_stream(output) == is_text
+
+
+def test_files(tmp_path):
+    with open(tmp_path / "maze.txt", "w") as text_file:
+        assert is_text_stream(text_file)
+    with open(tmp_path / "maze.bin", "wb") as binary_file:
+        assert not is_text_stream(binary_file)
+    with open(tmp_path / "maze.raw", "wb", buffering=0) as raw_file:
+        assert not is_text_stream(raw_file)
+
+
+def test_write_to_duck_typed_streams():
+    maze = maze_from_grid(GRID)
+    text_sink, binary_sink = TextSink(), BinarySink()
+    write_maze(maze, text_sink)
+    write_maze(maze, binary_sink)
+    assert "".join(text_sink.parts) == RENDERING
+    assert b"".join(binary_sink.parts) == RENDERING.encode()
+
+
+def test_large_maze_is_written_in_chunks():
+    maze = maze_from_grid([[0, 1] * 200 for _ in range(400)])
+    sink = TextSink()
+    write_maze(maze, sink)
+    assert len(sink.parts) > 1
+    assert "".join(sink.parts) == ((" *" * 200) + "\n") * 400
+
+
+def test_print_maze(capsys):
+    maze_from_grid(GRID).printMaze()
+    assert capsys.readouterr().out == RENDERING + "\n"
@@ -0,0 +1,98 @@
+import pytest
+
+from conftest import maze_from_grid, random_grid
+from practical import WALL, Maze, MazeGridListener
+
+
+class RecordingListener(MazeGridListener):
+    def __init__(self):
+        self.events = []
+
+    def cell_changed(self, node_hash_value: int, old_block_type: int, new_block_type: int):
+        self.events.append(("cell_changed", node_hash_value, old_block_type, new_block_type))
+
+    def grid_resized(self, old_row_stride: int):
+        self.events.append(("grid_resized", old_row_stride))
+
+
+def test_growth_keeps_the_cells():
+    grid = random_grid(20, 40, 3)
+    maze = maze_from_grid(grid)
+    maze.resize_grid(25, 100)
+    for x, row in enumerate(grid):
+        for y, block_type in enumerate(row):
+            assert maze.is_open_node(maze.node_hash_function(x, y)) == (not block_type)
+    for x in range(25):
+        for y in range(100):
+            if x >= 20 or y >= 40:
+                assert maze.cells[maze.node_hash_function(x, y)] == WALL
+
+
+def test_width_capacity_doubles():
+    maze = Maze()
+    strides = set()
+    for y in range(1000):
+        maze.addCoordinate(0, y, 0)
+        strides.add(maze.row_stride)
+    # the row stride (and so every hash value) changed O(log width) times
+    assert len(strides) <= 11
+    assert maze.grid_width_capacity >= 1000
+    assert maze.row_stride == maze.grid_width_capacity + 2
+
+
+def test_listeners_are_told_about_changes():
+    maze = maze_from_grid([[0, 0], [0, 0]])
+    listener = RecordingListener()
+    maze.add_grid_listener(listener)
+    version = maze.grid_version
+
+    maze.addCoordinate(1, 1, 1)
+    maze.addCoordinate(1, 1, 1)  # no change, no event
+    maze.addCoordinate(0, 0, 0)
+    assert listener.events == [("cell_changed", maze.node_hash_function(1, 1), 0, 1)]
+    assert maze.grid_version == version + 1
+
+    old_row_stride = maze.row_stride
+    maze.addCoordinate(5, 1, 0)  # taller, same stride
+    maze.addCoordinate(0, 50, 0)  # wider than the capacity
+    assert listener.events[1] == ("grid_resized", old_row_stride)
+    assert ("grid_resized", old_row_stride) in listener.events[2:]
+
+    event_count = len(listener.events)
+    maze.remove_grid_listener(listener)
+    maze.addCoordinate(0, 0, 1)
+    assert len(listener.events) == event_count
+
+
+def test_routes_after_growth():
+    maze = maze_from_grid([[0, 0, 0]])
+    assert maze.findRoute(0, 0, 0, 2, "bfs") == [(0, 0), (0, 1), (0, 2)]
+    for y in range(3, 40):
+        maze.addCoordinate(0, y, 0)
+    assert len(maze.findRoute(0, 0, 0, 39, "bfs")) == 40
+
+
+def test_adopt_grid_checks_the_size():
+    maze = Maze()
+    with pytest.raises(ValueError):
+        maze.adopt_grid(bytearray(10), 2, 2, 2)
+    with pytest.raises(ValueError):
+        maze.adopt_grid(bytearray(4 * 4), 2, 3, 2)
+
+
+def test_adopted_grid_grows_into_a_copy():
+    source = maze_from_grid([[0, 1], [0, 0]])
+    cells = bytes(source.cells)
+    maze = Maze()
+    listener = RecordingListener()
+    maze.add_grid_listener(listener)
+    maze.adopt_grid(
+        memoryview(bytearray(cells)),
+        source.grid_height,
+        source.grid_width,
+        source.grid_width_capacity,
+    )
+    assert listener.events == [("grid_resized", 0)]
+    maze.addCoordinate(2, 0, 0)
+    assert isinstance(maze.cells, bytearray)
+    assert len(maze.findRoute(0, 0, 2, 0, "bfs")) == 3
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from maze_routing import MazeRouteCache
+from practical import Maze
+
+
+def make_random_maze(grid_size: int, seed: int) -> Maze:
+    random.seed(seed)
+    maze = Maze()
+    for x in range(grid_size):
+        for y in range(grid_size):
+            maze.addCoordinate(x, y, 1 if random.random() < 0.3 else 0)
+    return maze
+
+
+def test_routes_match_bfs_find_route():
+    maze = make_random_maze(15, 1)
+    cache = MazeRouteCache(maze)
+    destinations = [(x, y) for x in range(15) for y in range(15)]
+    for source in [(0, 0), (7, 7), (14, 3)]:
+        routes = cache.routes_from(source, destinations)
+        for destination, route in zip(destinations, routes):
+            assert route == maze.findRoute(*source, *destination, "bfs")
+
+
+def test_routes_between_is_routes_from_every_source():
+    maze = make_random_maze(10, 2)
+    sources = [(0, 0), (5, 5)]
+    destinations = [(9, 9), (2, 8), (20, 20)]
+    routes = maze.find_routes_between(sources, destinations)
+    assert routes == [maze.find_routes_from(source, destinations) for source in sources]
+    assert routes[0][2] == []
+
+
+def test_source_outside_grid_has_no_routes():
+    maze = make_random_maze(5, 3)
+    assert maze.find_routes_from((-1, 0), [(0, 0), (1, 1)]) == [[], []]
+
+
+def test_trees_follow_grid_changes():
+    maze = make_random_maze(12, 4)
+    cache = maze.get_route_cache()
+    destinations = [(x, y) for x in range(12) for y in range(12)]
+    random.seed(5)
+    for _ in range(100):
+        maze.addCoordinate(
+            random.randrange(12), random.randrange(12), random.randrange(2)
+        )
+        source = (random.randrange(12), random.randrange(12))
+        routes = cache.routes_from(source, destinations)
+        for destination, route in zip(destinations, routes):
+            expected = maze.findRoute(*source, *destination, "bfs")
+            assert len(route) == len(expected)
+
+
+def test_trees_follow_grid_growth():
+    maze = make_random_maze(6, 6)
+    cache = maze.get_route_cache()
+    cache.routes_from((0, 0), [(5, 5)])
+    for y in range(6, 20):
+        maze.addCoordinate(0, y, 0)
+    maze.addCoordinate(6, 0, 0)
+    assert cache.route((0, 0), (0, 19)) == maze.findRoute(0, 0, 0, 19, "bfs")
+    assert cache.route((0, 0), (6, 0)) == maze.findRoute(0, 0, 6, 0, "bfs")
+
+
+def test_least_recently_used_tree_is_dropped():
+    maze = make_random_maze(6, 7)
+    cache = MazeRouteCache(maze, max_trees=2)
+    source_nodes = [maze.node_hash_function(x, 0) for x in range(3)]
+    for source_node in source_nodes[:2]:
+        cache.get_tree(source_node)
+    cache.get_tree(source_nodes[0])
+    cache.get_tree(source_nodes[2])
+    assert list(cache.trees) == [source_nodes[0], source_nodes[2]]
+
+
+def test_max_trees_must_be_positive():
+    with pytest.raises(ValueError):
+        MazeRouteCache(Maze(), max_trees=0)
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from conftest import (
+    assert_valid_route,
+    maze_from_grid,
+    random_grid,
+    shortest_route_length,
+)
+
+STRATEGIES = ["bidirectional", "jps"]
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+@pytest.mark.parametrize("seed", range(6))
+def test_route_lengths_match_bfs(strategy, seed):
+    grid = random_grid(20, 25, seed, wall_ratio=0.25)
+    maze = maze_from_grid(grid)
+    rng = random.Random(seed)
+    for _ in range(30):
+        start = (rng.randrange(20), rng.randrange(25))
+        destination = (rng.randrange(20), rng.randrange(25))
+        route = maze.findRoute(*start, *destination, strategy)
+        assert len(route) == len(maze.findRoute(*start, *destination, "bfs"))
+        if route:
+            assert_valid_route(grid, route, start, destination)
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_open_grid(strategy):
+    grid = [[0] * 30 for _ in range(30)]
+    maze = maze_from_grid(grid)
+    route = maze.findRoute(2, 3, 27, 21, strategy)
+    assert len(route) == shortest_route_length(grid, (2, 3), (27, 21))
+    assert_valid_route(grid, route, (2, 3), (27, 21))
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_wall_start_and_destination(strategy):
+    maze = maze_from_grid([[1, 0, 0], [0, 0, 0], [0, 0, 1]])
+    # like the other strategies, a route may leave a wall start but not end on a wall
+    assert len(maze.findRoute(0, 0, 2, 1, strategy)) == len(
+        maze.findRoute(0, 0, 2, 1, "bfs")
+    )
+    assert maze.findRoute(0, 1, 2, 2, strategy) == []
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_start_is_destination(strategy):
+    maze = maze_from_grid([[0, 0], [0, 0]])
+    assert maze.findRoute(1, 1, 1, 1, strategy) == [(1, 1)]
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_no_route(strategy):
+    maze = maze_from_grid([[0, 1, 0], [0, 1, 0], [0, 1, 0]])
+    assert maze.findRoute(0, 0, 2, 2, strategy) == []
@@ -0,0 +1,67 @@
+import pytest
+
+from conftest import (
+    assert_valid_route,
+    maze_from_grid,
+    random_grid,
+    shortest_route_length,
+)
+
+QUERIES = [((0, 0), (14, 14)), ((3, 7), (12, 1)), ((14, 0), (0, 14)), ((5, 5), (5, 5))]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("strategy", ["bfs", "astar"])
+def test_shortest_strategies_find_a_shortest_route(seed, strategy):
+    grid = random_grid(15, 15, seed)
+    maze = maze_from_grid(grid)
+    for start, destination in QUERIES:
+        grid[start[0]][start[1]] = grid[destination[0]][destination[1]] = 0
+        maze.addCoordinate(*start, 0)
+        maze.addCoordinate(*destination, 0)
+        route = maze.findRoute(*start, *destination, strategy)
+        assert len(route) == shortest_route_length(grid, start, destination)
+        if route:
+            assert_valid_route(grid, route, start, destination)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_dfs_finds_a_route_when_there_is_one(seed):
+    grid = random_grid(15, 15, seed)
+    maze = maze_from_grid(grid)
+    for start, destination in QUERIES:
+        if grid[start[0]][start[1]] or grid[destination[0]][destination[1]]:
+            continue
+        route = maze.findRoute(*start, *destination, "dfs")
+        assert bool(route) == bool(shortest_route_length(grid, start, destination))
+        if route:
+            assert_valid_route(grid, route, start, destination)
+
+
+def test_astar_expands_fewer_nodes_than_bfs():
+    grid = [[0] * 30 for _ in range(30)]
+    maze = maze_from_grid(grid)
+    maze.findRoute(0, 0, 29, 29, "bfs")
+    bfs_expanded_nodes = maze.expanded_nodes
+    maze.findRoute(0, 0, 29, 29, "astar")
+    assert 0 < maze.expanded_nodes < bfs_expanded_nodes
+
+
+def test_default_strategy():
+    maze = maze_from_grid([[0, 0, 0], [1, 1, 0], [0, 0, 0]])
+    maze.route_strategy = "bfs"
+    assert maze.findRoute(0, 0, 2, 0) == maze.findRoute(0, 0, 2, 0, "bfs")
+    assert len(maze.findRoute(0, 0, 2, 0)) == 7
+
+
+def test_unknown_strategy():
+    maze = maze_from_grid([[0, 0]])
+    with pytest.raises(ValueError):
+        maze.findRoute(0, 0, 0, 1, "greedy")
+
+
+@pytest.mark.parametrize("strategy", ["dfs", "bfs", "astar"])
+def test_no_route(strategy):
+    maze = maze_from_grid([[0, 1, 0], [0, 1, 0]])
+    assert maze.findRoute(0, 0, 0, 2, strategy) == []
+    assert maze.findRoute(0, 0, 5, 5, strategy) == []
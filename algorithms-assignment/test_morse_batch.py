@@ -0,0 +1,51 @@
+import multiprocessing
+
+import pytest
+
+import morse_batch
+from morse_batch import MIN_PARALLEL_BATCH_SIZE, morsePartialDecodeBatch
+from practical import morse_encode, morsePartialDecode
+
+WORDS = ["TEST", "DANCE", "MORSE", "CODE", "TRIE", "BATCH", "A", "QUIZ"]
+
+
+def partial_queries(count: int) -> list[list[str]]:
+    queries = []
+    for index in range(count):
+        morse_code = morse_encode(WORDS[index % len(WORDS)])
+        if index % 3:
+            queries.append(["x" + letter[1:] for letter in morse_code])
+        else:
+            # first letter known: decoded by walking the trie
+            queries.append(morse_code[:1] + ["x" + letter[1:] for letter in morse_code[1:]])
+    return queries
+
+
+def test_small_batch_matches_single_decodes(assignment_dir):
+    queries = partial_queries(10)
+    assert morsePartialDecodeBatch(queries) == [
+        morsePartialDecode(query) for query in queries
+    ]
+
+
+def test_small_batch_does_not_start_a_pool(assignment_dir, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("pool started")
+
+    monkeypatch.setattr(morse_batch.multiprocessing, "get_context", fail)
+    queries = partial_queries(MIN_PARALLEL_BATCH_SIZE - 1)
+    assert len(morsePartialDecodeBatch(queries, processes=2)) == len(queries)
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+def test_pool_batch_matches_serial_batch(assignment_dir):
+    queries = partial_queries(MIN_PARALLEL_BATCH_SIZE * 2)
+    assert morsePartialDecodeBatch(queries, processes=2) == morsePartialDecodeBatch(
+        queries, processes=1
+    )
+
+
+def test_empty_batch(assignment_dir):
+    assert morsePartialDecodeBatch([]) == []
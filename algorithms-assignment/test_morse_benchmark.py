@@ -0,0 +1,46 @@
+import os
+
+import morse_benchmark
+from morse_benchmark import run_benchmarks
+from practical import DICTIONARY_FILE_LOC
+
+
+def run(dictionary_file_loc: str, sizes: list[str]) -> list[dict]:
+    records = []
+    run_benchmarks(sizes, 50, 917, dictionary_file_loc, records.append, processes=2)
+    return records
+
+
+def test_records_of_every_benchmark(small_dictionary, monkeypatch):
+    monkeypatch.chdir(os.path.dirname(small_dictionary))
+    records = run(DICTIONARY_FILE_LOC, ["dictionary"])
+    benchmarks = {record["benchmark"] for record in records}
+    assert benchmarks == {"build", "query", "throughput", "batch", "decode"}
+    batch_records = [record for record in records if record["benchmark"] == "batch"]
+    assert [(record["variant"], record["processes"]) for record in batch_records] == [
+        ("serial", 1),
+        ("pool", 2),
+    ]
+    assert all(record["queries_per_second"] > 0 for record in batch_records)
+
+
+def test_batch_records_call_the_batch_api(small_dictionary, monkeypatch):
+    monkeypatch.chdir(os.path.dirname(small_dictionary))
+    calls = []
+
+    def batch(input_string_lists, processes=None):
+        calls.append((len(input_string_lists), processes))
+        return []
+
+    monkeypatch.setattr(morse_benchmark, "morsePartialDecodeBatch", batch)
+    records = run(DICTIONARY_FILE_LOC, ["dictionary"])
+    batch_size = next(
+        record["queries"] for record in records if record["benchmark"] == "batch"
+    )
+    assert calls == [(batch_size, 1), (batch_size, 2)]
+
+
+def test_no_batch_records_for_other_dictionaries(small_dictionary, monkeypatch):
+    monkeypatch.chdir(os.path.dirname(small_dictionary))
+    records = run(DICTIONARY_FILE_LOC, ["5"])
+    assert "batch" not in {record["benchmark"] for record in records}
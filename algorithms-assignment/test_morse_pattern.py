@@ -0,0 +1,82 @@
+import re
+
+import pytest
+
+from conftest import SMALL_DICTIONARY
+from morse_pattern import letter_pattern_codes, morsePatternDecode
+from practical import (
+    MORSE_SYMBOLS,
+    generate_morse_strings_with_trie,
+    get_morse_trie,
+    morse_encode,
+)
+
+PATTERNS = [
+    ["x", "x", "x..", "x"],
+    ["*", "*", "*"],
+    ["*"],
+    ["x", "*"],
+    [".*", "*", "x"],
+    ["-..", "*", "*", "*", "."],
+    ["*", "-"],
+]
+
+
+def brute_force_matches(pattern: list[str]) -> list[str]:
+    regexes = [
+        re.compile(
+            letter_pattern.replace(".", r"\.").replace("x", "[.-]").replace("*", "[.-]*")
+        )
+        for letter_pattern in pattern
+    ]
+    words = sorted({word.upper() for word in SMALL_DICTIONARY})
+    return [
+        word
+        for word in words
+        if len(word) == len(pattern)
+        and all(
+            regex.fullmatch(code) for regex, code in zip(regexes, morse_encode(word))
+        )
+    ]
+
+
+def test_letter_pattern_codes():
+    assert letter_pattern_codes("x..") == ("-..", "...")
+    assert letter_pattern_codes("..") == ("..",)
+    assert letter_pattern_codes("*") == MORSE_SYMBOLS
+    assert letter_pattern_codes(".-*") == tuple(
+        code for code in MORSE_SYMBOLS if code.startswith(".-")
+    )
+    assert letter_pattern_codes("xxxxxxx") == ()
+
+
+@pytest.mark.parametrize("letter_pattern", ["", "a", ". -", "?"])
+def test_invalid_letter_pattern(letter_pattern):
+    with pytest.raises(ValueError):
+        letter_pattern_codes(letter_pattern)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_matches_brute_force(small_dictionary, pattern):
+    matches = morsePatternDecode(pattern, dictionary_file_loc=small_dictionary)
+    assert sorted(matches) == brute_force_matches(pattern)
+
+
+def test_unknown_first_symbols_match_the_partial_decode(small_dictionary):
+    pattern = ["x", "x", "x..", "x"]
+    trie = get_morse_trie(small_dictionary)
+    assert morsePatternDecode(
+        pattern, dictionary_file_loc=small_dictionary
+    ) == generate_morse_strings_with_trie(pattern, trie)
+
+
+def test_limit(small_dictionary):
+    matches = morsePatternDecode(["*", "*", "*"], dictionary_file_loc=small_dictionary)
+    assert len(matches) > 1
+    assert morsePatternDecode(
+        ["*", "*", "*"], limit=1, dictionary_file_loc=small_dictionary
+    ) == matches[:1]
+
+
+def test_unmatchable_letter(small_dictionary):
+    assert morsePatternDecode(["*", "xxxxxxx"], dictionary_file_loc=small_dictionary) == []
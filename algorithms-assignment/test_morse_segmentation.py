@@ -0,0 +1,110 @@
+import pytest
+
+from conftest import SMALL_DICTIONARY
+from morse_segmentation import (
+    MorseSegmentDecoder,
+    countMorseStream,
+    decodeMorseStream,
+    split_word_gaps,
+)
+from practical import build_morse_trie, get_morse_trie, morse_encode
+
+
+def encode_word(word: str) -> str:
+    return "".join(morse_encode(word.upper()))
+
+
+def brute_force_sentences(segment: str, codes: dict) -> list[list[str]]:
+    """Every split of the segment into dictionary word codes, tried exhaustively"""
+    if not segment:
+        return [[]]
+    sentences = []
+    for end in range(1, len(segment) + 1):
+        for word in codes.get(segment[:end], []):
+            for rest in brute_force_sentences(segment[end:], codes):
+                sentences.append([word] + rest)
+    return sentences
+
+
+@pytest.fixture
+def trie_and_codes():
+    words = sorted({word.upper() for word in SMALL_DICTIONARY})
+    codes = {}
+    for word in words:
+        codes.setdefault(encode_word(word), []).append(word)
+    return build_morse_trie([(word, morse_encode(word)) for word in words]), codes
+
+
+def test_split_word_gaps():
+    assert split_word_gaps(" -.. / .-  -\n") == ["-..", ".-", "-"]
+
+
+def test_rejects_other_symbols(trie_and_codes):
+    trie, _ = trie_and_codes
+    with pytest.raises(ValueError):
+        MorseSegmentDecoder("-.x", trie)
+
+
+def test_words_of_a_segment(trie_and_codes):
+    trie, codes = trie_and_codes
+    segment = encode_word("TEA")
+    assert sorted(MorseSegmentDecoder(segment, trie).words()) == sorted(codes[segment])
+
+
+@pytest.mark.parametrize(
+    "sentence", [["TEA", "EAT"], ["A", "AN", "ATE"], ["TEST", "DANCE", "A"]]
+)
+def test_sentences_match_brute_force(trie_and_codes, sentence):
+    trie, codes = trie_and_codes
+    segment = "".join(encode_word(word) for word in sentence)
+    decoder = MorseSegmentDecoder(segment, trie)
+    expected = brute_force_sentences(segment, codes)
+    sentences = list(decoder.iter_sentences())
+    assert sentence in sentences
+    assert sorted(sentences) == sorted(expected)
+    assert decoder.count_sentences() == len(expected)
+
+
+def fibonacci_trie():
+    # "." * n splits into E and EE (".", "..") in fibonacci(n + 1) ways
+    return build_morse_trie([(word, morse_encode(word)) for word in ["E", "EE"]])
+
+
+def test_sentence_limit():
+    decoder = MorseSegmentDecoder("." * 10, fibonacci_trie())
+    assert decoder.count_sentences() == 89
+    assert len(list(decoder.iter_sentences(limit=3))) == 3
+
+
+def test_long_segment_is_counted_without_enumerating():
+    decoder = MorseSegmentDecoder("." * 500, fibonacci_trie())
+    previous, count = 0, 1
+    for _ in range(500):
+        previous, count = count, previous + count
+    assert decoder.count_sentences() == count
+
+
+def test_unspellable_segment(trie_and_codes):
+    trie, _ = trie_and_codes
+    decoder = MorseSegmentDecoder("----", trie)
+    assert decoder.count_sentences() == 0
+    assert list(decoder.iter_sentences()) == []
+
+
+def test_stream_functions(small_dictionary):
+    trie = get_morse_trie(small_dictionary)
+    stream = encode_word("TEST") + " / " + encode_word("DANCE")
+    decoded = decodeMorseStream(stream, dictionary_file_loc=small_dictionary)
+    assert [sorted(words) for words in decoded] == [
+        sorted(MorseSegmentDecoder(encode_word("TEST"), trie).words()),
+        sorted(MorseSegmentDecoder(encode_word("DANCE"), trie).words()),
+    ]
+    assert countMorseStream(stream, dictionary_file_loc=small_dictionary) == len(
+        decoded[0]
+    ) * len(decoded[1])
+    sentences = decodeMorseStream(
+        stream, single_words=False, dictionary_file_loc=small_dictionary
+    )
+    assert countMorseStream(
+        stream, single_words=False, dictionary_file_loc=small_dictionary
+    ) == len(sentences[0]) * len(sentences[1])
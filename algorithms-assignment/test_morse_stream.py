@@ -0,0 +1,100 @@
+import io
+
+import pytest
+
+from morse_stream import (
+    MAX_TOKEN_LENGTH,
+    MorseCodingError,
+    decode_file,
+    decode_stream,
+    encode_file,
+    encode_stream,
+)
+
+TEXT = "HELLO WORLD\nSOS 123\nMORSE CODE\n"
+
+
+def chunked(text: str, chunk_size: int) -> list[str]:
+    return [text[start : start + chunk_size] for start in range(0, len(text), chunk_size)]
+
+
+def encode(text: str, chunk_size: int = 4) -> str:
+    return "".join(encode_stream(chunked(text, chunk_size)))
+
+
+def decode(morse_text: str, chunk_size: int = 4, on_unknown=None) -> str:
+    return "".join(decode_stream(chunked(morse_text, chunk_size), on_unknown))
+
+
+def test_encode():
+    assert encode("HI you") == ".... .. / -.-- --- ..- "
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1000])
+def test_round_trip_across_chunk_boundaries(chunk_size):
+    assert decode(encode(TEXT, chunk_size), chunk_size) == TEXT
+
+
+def test_crlf_round_trip():
+    text = TEXT.replace("\n", "\r\n")
+    morse_text = encode(text)
+    assert morse_text.startswith(".... . .-.. .-.. --- / .-- --- .-. .-.. -.. \r\n")
+    for chunk_size in (1, 2, 5):
+        assert decode(morse_text, chunk_size) == text
+
+
+def test_crlf_morse_file():
+    assert decode(".... ..\r\n... --- ...\r\n") == "HI\r\nSOS\r\n"
+
+
+def test_unknown_character():
+    with pytest.raises(MorseCodingError) as error:
+        encode("AB#C")
+    assert error.value.position == 2
+    skipped = "".join(encode_stream(["A#B"], lambda symbol, position: ""))
+    assert skipped == encode("AB")
+
+
+def test_unknown_token():
+    with pytest.raises(MorseCodingError) as error:
+        decode(".- .-.-.-. -")
+    assert error.value.symbol == ".-.-.-."
+    assert decode(".- ........ -", on_unknown=lambda symbol, position: "?") == "A?T"
+
+
+def test_overlong_token_is_not_buffered():
+    reported = []
+
+    def on_unknown(symbol, position):
+        reported.append((symbol, position))
+        return "?"
+
+    token = "." * 10_000
+    chunks = [".- "] + chunked(token, 16) + [" -"]
+    decoded = []
+    for text in decode_stream(iter(chunks), on_unknown):
+        decoded.append(text)
+        # the whole token is never collected
+        assert len(reported) < 2
+    assert "".join(decoded) == "A?T"
+    assert len(reported) == 1
+    symbol, position = reported[0]
+    assert position == 3
+    assert symbol == "." * (MAX_TOKEN_LENGTH + 1)
+
+
+@pytest.mark.parametrize(
+    "chunks", [[".- " + "-" * 100_000], [".- " + "-" * 100_000 + " -"], ["-" * 50] * 10]
+)
+def test_overlong_token_is_reported_truncated(chunks):
+    with pytest.raises(MorseCodingError) as error:
+        "".join(decode_stream(chunks))
+    assert error.value.symbol == "-" * (MAX_TOKEN_LENGTH + 1)
+
+
+def test_files():
+    morse_file = io.StringIO()
+    encode_file(io.StringIO(TEXT), morse_file, chunk_size=5)
+    text_file = io.StringIO()
+    decode_file(io.StringIO(morse_file.getvalue()), text_file, chunk_size=5)
+    assert text_file.getvalue() == TEXT
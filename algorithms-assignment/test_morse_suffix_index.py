@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+import practical
+from practical import (
+    PRECOMPILED_TRIE_SUFFIX,
+    PrecompiledSuffixIndex,
+    build_morse_suffix_index,
+    build_morse_trie,
+    generate_morse_strings_with_trie,
+    get_morse_suffix_index,
+    get_morse_trie,
+    iter_morse_trie_words,
+    load_morse_dictionary,
+    morse_tails_key,
+    morsePartialDecode,
+)
+
+
+def test_empty_input_decodes_to_nothing(assignment_dir):
+    assert morsePartialDecode([]) == []
+
+
+def test_partial_decode_finds_every_candidate(assignment_dir):
+    assert "TEST" in morsePartialDecode(["x", "x", "x..", "x"])
+
+
+def test_index_is_read_from_the_trie_file(small_dictionary):
+    index = get_morse_suffix_index(small_dictionary)
+    assert os.path.exists(small_dictionary + PRECOMPILED_TRIE_SUFFIX)
+    assert isinstance(index, PrecompiledSuffixIndex)
+    assert dict(index) == build_morse_suffix_index(load_morse_dictionary(small_dictionary))
+
+
+def test_index_does_not_parse_the_dictionary(small_dictionary, monkeypatch):
+    get_morse_trie(small_dictionary)
+    practical._morse_trie_cache.clear()
+
+    def fail(dictionary_file_loc):
+        raise AssertionError("dictionary parsed again")
+
+    monkeypatch.setattr(practical, "load_morse_dictionary", fail)
+    index = get_morse_suffix_index(small_dictionary)
+    assert index[morse_tails_key(["x", "x", "x..", "x"])] == ["TEST", "EESE"]
+
+
+def test_index_without_a_trie_file(small_dictionary, monkeypatch):
+    def fail(trie, dictionary_file_loc):
+        raise OSError("read-only directory")
+
+    monkeypatch.setattr(practical, "save_precompiled_morse_trie", fail)
+    index = get_morse_suffix_index(small_dictionary)
+    assert not os.path.exists(small_dictionary + PRECOMPILED_TRIE_SUFFIX)
+    assert index == build_morse_suffix_index(load_morse_dictionary(small_dictionary))
+
+
+def test_index_lookups(small_dictionary):
+    index = get_morse_suffix_index(small_dictionary)
+    assert index[morse_tails_key(["x-"])] == ["A"]
+    assert index.get("no such key", []) == []
+    with pytest.raises(KeyError):
+        index["no such key"]
+    assert list(index) == sorted(index)
+
+
+def test_index_agrees_with_the_trie(small_dictionary):
+    trie = build_morse_trie(load_morse_dictionary(small_dictionary))
+    index = build_morse_suffix_index(iter_morse_trie_words(trie))
+    for english_word, morse_code in iter_morse_trie_words(trie):
+        query = ["x" + letter[1:] for letter in morse_code]
+        assert index[morse_tails_key(query)] == generate_morse_strings_with_trie(
+            query, trie
+        )
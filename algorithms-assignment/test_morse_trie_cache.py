@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from practical import (
+    build_morse_trie,
+    generate_morse_strings_with_trie,
+    get_morse_trie,
+    load_morse_dictionary,
+    morse_encode,
+    morsePartialDecode,
+    reload_morse_dictionary,
+)
+
+
+def test_trie_is_built_once_per_dictionary(small_dictionary):
+    trie = get_morse_trie(small_dictionary)
+    assert get_morse_trie(small_dictionary) is trie
+
+
+def test_concurrent_first_calls_share_one_trie(small_dictionary):
+    tries = []
+    threads = [
+        threading.Thread(target=lambda: tries.append(get_morse_trie(small_dictionary)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(trie) for trie in tries}) == 1
+
+
+def test_reload_sees_dictionary_changes(small_dictionary):
+    query = ["x" + letter[1:] for letter in morse_encode("CAT")]
+    trie = get_morse_trie(small_dictionary)
+    assert generate_morse_strings_with_trie(query, trie) == []
+    with open(small_dictionary, "a") as f:
+        f.write("cat\n")
+    trie = reload_morse_dictionary(small_dictionary)
+    assert generate_morse_strings_with_trie(query, trie) == ["CAT"]
+
+
+def test_cached_trie_matches_a_fresh_build(small_dictionary):
+    fresh_trie = build_morse_trie(load_morse_dictionary(small_dictionary))
+    cached_trie = get_morse_trie(small_dictionary)
+    for query in (["x", "x", "x..", "x"], ["x-", "x", "x"], ["x-"], ["x", "x"]):
+        assert generate_morse_strings_with_trie(query, cached_trie) == (
+            generate_morse_strings_with_trie(query, fresh_trie)
+        )
+
+
+@pytest.mark.usefixtures("assignment_dir")
+def test_partial_decode_of_the_assignment_examples():
+    assert "TEST" in morsePartialDecode(["x", "x", "x..", "x"])
+    assert "DANCE" in morsePartialDecode(["x..", "x-", "x.", "x.-.", "x"])
@@ -0,0 +1,100 @@
+import os
+
+from practical import (
+    PRECOMPILED_TRIE_HEADER,
+    PRECOMPILED_TRIE_SUFFIX,
+    PrecompiledMorseTrie,
+    PrecompiledTrieNode,
+    build_morse_trie,
+    generate_morse_strings_with_trie,
+    get_morse_trie,
+    load_morse_dictionary,
+    load_precompiled_morse_trie,
+    morse_encode,
+    open_precompiled_morse_trie,
+    save_precompiled_morse_trie,
+)
+
+QUERIES = [
+    ["x", "x", "x..", "x"],
+    ["x..", "x-", "x.", "x.-.", "x"],
+    ["x-"],
+    ["-", ".", "x-"],
+    ["x", "x", "x"],
+]
+
+
+def header_mtime(trie_file_loc: str) -> int:
+    with open(trie_file_loc, "rb") as f:
+        return PRECOMPILED_TRIE_HEADER.unpack(f.read(PRECOMPILED_TRIE_HEADER.size))[4]
+
+
+def test_first_use_writes_the_file(small_dictionary):
+    get_morse_trie(small_dictionary)
+    assert os.path.exists(small_dictionary + PRECOMPILED_TRIE_SUFFIX)
+
+
+def test_loaded_trie_answers_like_the_built_trie(small_dictionary):
+    built_trie = build_morse_trie(load_morse_dictionary(small_dictionary))
+    save_precompiled_morse_trie(built_trie, small_dictionary)
+    loaded_trie = load_precompiled_morse_trie(small_dictionary)
+    assert isinstance(loaded_trie, PrecompiledTrieNode)
+    for query in QUERIES:
+        assert generate_morse_strings_with_trie(query, loaded_trie) == (
+            generate_morse_strings_with_trie(query, built_trie)
+        )
+
+
+def test_nodes_are_read_on_demand(small_dictionary):
+    save_precompiled_morse_trie(
+        build_morse_trie(load_morse_dictionary(small_dictionary)), small_dictionary
+    )
+    root = load_precompiled_morse_trie(small_dictionary)
+    assert "children" not in vars(root)
+    node = root.children[".-"]
+    assert "children" in vars(root) and "children" not in vars(node)
+    assert node.is_end_of_word and node.english_word == "A"
+    assert node.morse_code == [".-"]
+    assert not root.is_end_of_word and root.english_word == "" and root.morse_code == []
+
+
+def test_iter_words_lists_every_word_with_its_code(small_dictionary):
+    save_precompiled_morse_trie(
+        build_morse_trie(load_morse_dictionary(small_dictionary)), small_dictionary
+    )
+    trie = PrecompiledMorseTrie(open_precompiled_morse_trie(small_dictionary))
+    words = dict(trie.iter_words())
+    # "Tea" and "tea" have the same code: the later one is kept, as in the built trie
+    assert words == {
+        word: morse_encode(word)
+        for word in ("TEST", "EESE", "DANCE", "A", "AN", "TEA", "EAT", "ATE")
+    }
+
+
+def test_stale_or_corrupt_files_are_ignored(small_dictionary):
+    trie_file_loc = small_dictionary + PRECOMPILED_TRIE_SUFFIX
+    save_precompiled_morse_trie(
+        build_morse_trie(load_morse_dictionary(small_dictionary)), small_dictionary
+    )
+    with open(small_dictionary, "a") as f:
+        f.write("cat\n")
+    assert load_precompiled_morse_trie(small_dictionary) is None
+
+    with open(trie_file_loc, "wb") as f:
+        f.write(b"MORSETRI")
+    assert load_precompiled_morse_trie(small_dictionary) is None
+    os.remove(trie_file_loc)
+    assert load_precompiled_morse_trie(small_dictionary) is None
+
+
+def test_touched_dictionary_is_hashed_once(small_dictionary):
+    trie_file_loc = small_dictionary + PRECOMPILED_TRIE_SUFFIX
+    save_precompiled_morse_trie(
+        build_morse_trie(load_morse_dictionary(small_dictionary)), small_dictionary
+    )
+    stat = os.stat(small_dictionary)
+    os.utime(small_dictionary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert header_mtime(trie_file_loc) == stat.st_mtime_ns
+
+    assert load_precompiled_morse_trie(small_dictionary) is not None
+    assert header_mtime(trie_file_loc) == stat.st_mtime_ns + 10**9
@@ -0,0 +1,73 @@
+import sys
+
+from conftest import SMALL_DICTIONARY
+from practical import (
+    build_morse_trie,
+    generate_morse_strings_with_trie,
+    iter_morse_strings_with_trie,
+    morse_encode,
+    morse_letter_candidates,
+)
+
+QUERIES = [
+    ["x", "x", "x..", "x"],
+    ["x..", "x-", "x.", "x.-.", "x"],
+    ["x-"],
+    ["x-", "x."],
+    ["-", ".", "x-"],
+    ["-", "x", "x-"],
+    ["x", "x", "x"],
+    [],
+]
+
+
+def recursive_walk(morse_sequence: list[str], node) -> list[str]:
+    """The depth first search the explicit stack walk replaced"""
+    if not morse_sequence:
+        return [node.english_word] if node.is_end_of_word else []
+    result = []
+    for candidate in dict.fromkeys(
+        [morse_sequence[0].replace("x", "-"), morse_sequence[0].replace("x", ".")]
+    ):
+        if candidate in node.children:
+            result.extend(recursive_walk(morse_sequence[1:], node.children[candidate]))
+    return result
+
+
+def small_trie():
+    words = [word.upper() for word in SMALL_DICTIONARY]
+    return build_morse_trie([(word, morse_encode(word)) for word in words])
+
+
+def test_letter_candidates():
+    assert morse_letter_candidates(["x.", "-", "xx"]) == [
+        ("-.", ".."),
+        ("-",),
+        ("--", ".."),
+    ]
+
+
+def test_walk_matches_the_recursive_search():
+    trie = small_trie()
+    for query in QUERIES:
+        assert generate_morse_strings_with_trie(query, trie) == recursive_walk(
+            query, trie
+        )
+
+
+def test_known_letters_give_no_duplicates():
+    trie = small_trie()
+    assert generate_morse_strings_with_trie(morse_encode("TEA"), trie) == ["TEA"]
+
+
+def test_walk_is_lazy():
+    trie = small_trie()
+    matches = iter_morse_strings_with_trie(["x", "x", "x..", "x"], trie)
+    assert next(matches) == "TEST"
+    assert list(matches) == ["EESE"]
+
+
+def test_long_input_does_not_recurse():
+    word = "E" * (sys.getrecursionlimit() * 2)
+    trie = build_morse_trie([(word, morse_encode(word))])
+    assert generate_morse_strings_with_trie(["x"] * len(word), trie) == [word]
@@ -0,0 +1,359 @@
+"""
+    Compact candle records: numeric fields are parsed once and stored either
+    in a __slots__ record or in typed column arrays shared by all rows
+"""
+
+import csv
+import gzip
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import IO, Iterable, Iterator, Optional, Union
+
+from exception_classes import ColumnNotFoundException
+
+# column names of the dataset, in csv order
+CANDLE_COLUMNS = ("time", "high", "low", "open", "close", "volumefrom", "volumeto")
+
+# number of csv rows parsed per chunk by the streaming reader
+CSV_CHUNK_SIZE = 64 * 1024
+
+# array type code per column: signed 64-bit int for timestamps, double for the rest
+COLUMN_TYPE_CODES = {column: "d" for column in CANDLE_COLUMNS}
+COLUMN_TYPE_CODES["time"] = "q"
+
+
+def parse_field(column: str, value: str) -> Union[int, float]:
+    """Parses a raw csv field into its numeric value
+
+    Args:
+        column (str): the column the field belongs to
+        value (str): the raw field value
+
+    Returns:
+        Union[int, float]: int for the "time" column, float otherwise
+    """
+    if column == "time":
+        return int(value)
+    return float(value)
+
+
+class _RecordAccess:
+    """Dict-like read access shared by Candle and CandleView, so existing code
+    using `record["high"]`, `record.get("time")` or `record.keys()` keeps working
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, column: str) -> Union[int, float]:
+        if column not in COLUMN_TYPE_CODES:
+            raise KeyError(column)
+        return getattr(self, column)
+
+    def get(self, column: str, default=None):
+        if column not in COLUMN_TYPE_CODES:
+            return default
+        return getattr(self, column)
+
+    def keys(self) -> tuple[str, ...]:
+        return CANDLE_COLUMNS
+
+    def to_dict(self) -> dict[str, Union[int, float]]:
+        return {column: getattr(self, column) for column in CANDLE_COLUMNS}
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{column}={getattr(self, column)!r}" for column in CANDLE_COLUMNS)
+        return f"{type(self).__name__}({fields})"
+
+
+class Candle(_RecordAccess):
+    """A standalone candle whose fields are parsed once at construction"""
+
+    __slots__ = CANDLE_COLUMNS
+
+    def __init__(
+        self,
+        time: int,
+        high: float,
+        low: float,
+        open: float,
+        close: float,
+        volumefrom: float,
+        volumeto: float,
+    ):
+        self.time = time
+        self.high = high
+        self.low = low
+        self.open = open
+        self.close = close
+        self.volumefrom = volumefrom
+        self.volumeto = volumeto
+
+    @classmethod
+    def from_dict(cls, record: dict[str, str]) -> "Candle":
+        """Builds a candle from a csv.DictReader row
+
+        Args:
+            record (dict[str, str]): a row of the csv file
+
+        Raises:
+            ColumnNotFoundException: if one of the candle columns is missing from the row
+
+        Returns:
+            Candle: the parsed candle
+        """
+        try:
+            return cls(*(parse_field(column, record[column]) for column in CANDLE_COLUMNS))
+        except KeyError:
+            raise ColumnNotFoundException("Error: requested column is missing from dataset")
+
+
+class CandleView(_RecordAccess):
+    """A lightweight view of one row of a CandleTable. Field reads go straight
+    to the table's column arrays, nothing is copied.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "CandleTable", index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    def __getattr__(self, column: str) -> Union[int, float]:
+        # only reached for names that are not slots, i.e. the candle columns
+        try:
+            return self._table.columns[column][self._index]
+        except KeyError:
+            raise AttributeError(column)
+
+
+class CandleCursor(CandleView):
+    """A CandleView that is moved along the table instead of being re-created.
+
+    Used by CandleTable.scan() for row-at-a-time loops that must not allocate
+    per row. A cursor is only valid until the next step of the scan, so it must
+    not be stored (copy it with to_candle() instead).
+    """
+
+    __slots__ = ()
+
+    def to_candle(self) -> Candle:
+        return Candle(*(getattr(self, column) for column in CANDLE_COLUMNS))
+
+
+class CandleTable:
+    """Columnar candle dataset: one typed array per column.
+
+    Each row costs 7 * 8 = 56 bytes, against several hundred bytes for a
+    csv.DictReader row of seven strings.
+    """
+
+    def __init__(self, columns: Optional[dict[str, array]] = None):
+        if columns is None:
+            columns = {
+                column: array(type_code)
+                for column, type_code in COLUMN_TYPE_CODES.items()
+            }
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("all columns must have the same length")
+        if not set(CANDLE_COLUMNS).issubset(columns.keys()):
+            raise ColumnNotFoundException("Error: requested column is missing from dataset")
+        self.columns = columns
+        # derived columns materialized on first use, see derived_columns.py
+        self.derived: dict[str, array] = {}
+        # whether the time column is ascending, checked on first use
+        self._sorted_by_time: Optional[bool] = None
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict[str, str]]) -> "CandleTable":
+        """Builds a table from rows of string (or numeric) fields
+
+        Args:
+            records (Iterable[dict[str, str]]): rows, e.g. from csv.DictReader
+
+        Raises:
+            ColumnNotFoundException: if a row misses one of the candle columns
+
+        Returns:
+            CandleTable: the table
+        """
+        table = cls()
+        for record in records:
+            table.append(record)
+        return table
+
+    @classmethod
+    def from_csv(
+        cls, file_path: str, chunk_size: int = CSV_CHUNK_SIZE
+    ) -> "CandleTable":
+        """Reads a cryptocompare csv file (optionally gzip-compressed, ".gz") into a table
+
+        Args:
+            file_path (str): path of the csv file
+            chunk_size (int, optional): rows parsed per chunk. Defaults to CSV_CHUNK_SIZE.
+
+        Returns:
+            CandleTable: the table
+        """
+        if file_path.endswith(".gz"):
+            with gzip.open(file_path, "rt", newline="") as f:
+                return cls.from_csv_stream(f, chunk_size)
+        with open(file_path, "r", newline="") as f:
+            return cls.from_csv_stream(f, chunk_size)
+
+    @classmethod
+    def from_csv_stream(
+        cls, stream: IO[str], chunk_size: int = CSV_CHUNK_SIZE
+    ) -> "CandleTable":
+        """Builds a table from a csv text stream, one chunk of rows at a time.
+
+        Only the current chunk of raw rows is held in memory; each chunk is parsed
+        column by column straight into the typed arrays, without building a dict
+        per row.
+
+        Args:
+            stream (IO[str]): text stream of csv data, with a header line
+            chunk_size (int, optional): rows parsed per chunk. Defaults to CSV_CHUNK_SIZE.
+
+        Raises:
+            ColumnNotFoundException: if the header misses one of the candle columns
+
+        Returns:
+            CandleTable: the table
+        """
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        if header is None or not set(CANDLE_COLUMNS).issubset(header):
+            raise ColumnNotFoundException("Error: requested column is missing from dataset")
+        positions = [header.index(column) for column in CANDLE_COLUMNS]
+
+        table = cls()
+        while True:
+            chunk = list(islice(reader, chunk_size))
+            if not chunk:
+                break
+            rows = [row for row in chunk if row]
+            for column, position in zip(CANDLE_COLUMNS, positions):
+                parse = int if column == "time" else float
+                table.columns[column].extend(map(parse, (row[position] for row in rows)))
+        return table
+
+    def append(self, record: dict[str, str]):
+        """Parses a row and appends it to the columns
+
+        Args:
+            record (dict[str, str]): the row to append
+
+        Raises:
+            ColumnNotFoundException: if the row misses one of the candle columns
+        """
+        try:
+            values = [parse_field(column, record[column]) for column in CANDLE_COLUMNS]
+        except KeyError:
+            raise ColumnNotFoundException("Error: requested column is missing from dataset")
+        for column, value in zip(CANDLE_COLUMNS, values):
+            self.columns[column].append(value)
+        self._sorted_by_time = None
+        if self.derived:
+            self.derived.clear()
+
+    def __len__(self) -> int:
+        return len(self.columns["time"])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CandleTable(
+                {column: values[index] for column, values in self.columns.items()}
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("candle index out of range")
+        return CandleView(self, index)
+
+    def __iter__(self) -> Iterator[CandleView]:
+        for index in range(len(self)):
+            yield CandleView(self, index)
+
+    def scan(self) -> Iterator[CandleCursor]:
+        """Iterates over the rows through a single reused cursor
+
+        Yields:
+            CandleCursor: the same cursor, positioned on each row in turn
+        """
+        cursor = CandleCursor(self, 0)
+        for index in range(len(self)):
+            cursor._index = index
+            yield cursor
+
+    def column(self, column: str) -> array:
+        """Returns the typed array backing a column
+
+        Args:
+            column (str): the column name
+
+        Raises:
+            ColumnNotFoundException: if the column doesn't exist
+
+        Returns:
+            array: the column values
+        """
+        if column not in self.columns:
+            raise ColumnNotFoundException("Error: requested column is missing from dataset")
+        return self.columns[column]
+
+    def is_sorted_by_time(self) -> bool:
+        """Checks (once, then remembers) whether the rows are in ascending time order
+
+        Returns:
+            bool: True if the time column never decreases
+        """
+        if self._sorted_by_time is None:
+            times = self.columns["time"]
+            self._sorted_by_time = all(map(int.__le__, times, islice(times, 1, None)))
+        return self._sorted_by_time
+
+    def time_range_indices(self, start_timestamp: int, end_timestamp: int) -> tuple[int, int]:
+        """Finds the rows whose time lies in [start_timestamp, end_timestamp]
+        by binary search. Only valid if the table is sorted by time (as the csv is),
+        see is_sorted_by_time
+
+        Args:
+            start_timestamp (int): start of the interval
+            end_timestamp (int): end of the interval (inclusive)
+
+        Returns:
+            tuple[int, int]: the half-open index range [start_idx, end_idx)
+        """
+        times = self.columns["time"]
+        return bisect_left(times, start_timestamp), bisect_right(times, end_timestamp)
+
+    def time_index(self, timestamp: int) -> int:
+        """Returns the index of the record with the given time (binary search,
+        or a linear search if the table isn't sorted by time)
+
+        Args:
+            timestamp (int): the record time
+
+        Returns:
+            int: element index between 0 and len(table). -1 if element not found
+        """
+        times = self.columns["time"]
+        if not self.is_sorted_by_time():
+            try:
+                return times.index(timestamp)
+            except ValueError:
+                return -1
+        index = bisect_left(times, timestamp)
+        if index < len(times) and times[index] == timestamp:
+            return index
+        return -1
+
+    def to_candles(self) -> list[Candle]:
+        """Materializes the table as a list of standalone Candle records"""
+        return [cursor.to_candle() for cursor in self.scan()]
@@ -14,3 +14,18 @@ LONG_WINDOW_SIZE = 10
 
 # total seconds per day: 24 hours * 60 minutes * 60 seconds
 SECONDS_PER_DAY = 24 * 60 * 60
+
+# accepted date formats: a whole day, or a point in time for intraday bars
+DATE_FORMAT = "%d/%m/%Y"
+DATETIME_FORMATS = ("%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S")
+
+# candle (bar) interval in seconds, the dataset has one candle per day
+BAR_INTERVALS = {
+    "1m": 60,
+    "5m": 5 * 60,
+    "15m": 15 * 60,
+    "1h": 60 * 60,
+    "4h": 4 * 60 * 60,
+    "1d": SECONDS_PER_DAY,
+}
+BAR_INTERVAL_SECONDS = BAR_INTERVALS["1d"]
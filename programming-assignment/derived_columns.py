@@ -0,0 +1,323 @@
+"""
+    Registry of derived columns (daily average price, typical price, ...).
+    Each derived column is computed at most once per dataset, on first use,
+    and stored as a typed array next to the table's own columns. A list of csv
+    records is converted to a CandleTable once and the table is kept for the
+    next queries; records missing some candle columns are not converted, only
+    the columns a query needs are parsed from them.
+"""
+
+from array import array
+from operator import is_
+from typing import Callable, Iterable, Optional, Union
+
+from candles import COLUMN_TYPE_CODES, CandleTable, parse_field
+from exception_classes import ColumnNotFoundException
+
+# name -> (base columns it is computed from, function computing it from those columns)
+DERIVED_COLUMNS: dict[str, tuple[tuple[str, ...], Callable[[dict[str, array]], array]]] = {}
+
+# derived columns whose value for a record depends on other records
+CROSS_RECORD_COLUMNS: set[str] = set()
+
+
+def register_derived_column(
+    name: str, requires: tuple[str, ...], row_wise: bool = True
+) -> Callable:
+    """Decorator registering a function as the definition of a derived column
+
+    Args:
+        name (str): the derived column name
+        requires (tuple[str, ...]): the base columns the function reads
+        row_wise (bool, optional): whether a value depends only on its own record.
+            Defaults to True.
+
+    Returns:
+        Callable: the decorator
+    """
+
+    def decorator(compute: Callable[[dict[str, array]], array]):
+        DERIVED_COLUMNS[name] = (requires, compute)
+        if row_wise:
+            CROSS_RECORD_COLUMNS.discard(name)
+        else:
+            CROSS_RECORD_COLUMNS.add(name)
+        return compute
+
+    return decorator
+
+
+def required_columns(name: str) -> tuple[str, ...]:
+    """Returns the base columns needed to get a column
+
+    Args:
+        name (str): a base or derived column name
+
+    Raises:
+        KeyError: if `name` is neither a base column nor a registered derived column
+
+    Returns:
+        tuple[str, ...]: the base columns
+    """
+    if name in COLUMN_TYPE_CODES:
+        return (name,)
+    if name not in DERIVED_COLUMNS:
+        raise KeyError(f"unknown derived column {name!r}")
+    return DERIVED_COLUMNS[name][0]
+
+
+# number of record lists whose CandleTable is kept, see records_table
+MAX_CACHED_DATASETS = 4
+
+# id of a record list -> (the list, its records, its CandleTable). Holding the list
+# means its id can't be reused by another list while the entry exists.
+_records_tables: dict[int, tuple[list, tuple, CandleTable]] = {}
+
+
+def records_table(records: list[dict[str, str]]) -> Optional[CandleTable]:
+    """Returns the CandleTable of a list of csv records, converting the list on the
+    first call only. The table is reused as long as the list holds the same record
+    objects; editing the fields of a record in place isn't noticed, call
+    forget_dataset after doing so.
+
+    Args:
+        records (list[dict[str, str]]): the records
+
+    Returns:
+        Optional[CandleTable]: the table, or None if a record misses one of the
+        candle columns
+    """
+    entry = _records_tables.get(id(records))
+    if (
+        entry is not None
+        and entry[0] is records
+        and len(entry[1]) == len(records)
+        and all(map(is_, entry[1], records))
+    ):
+        return entry[2]
+    try:
+        table = CandleTable.from_records(records)
+    except ColumnNotFoundException:
+        return None
+    _records_tables.pop(id(records), None)
+    if len(_records_tables) >= MAX_CACHED_DATASETS:
+        # drop the oldest entry
+        del _records_tables[next(iter(_records_tables))]
+    _records_tables[id(records)] = (records, tuple(records), table)
+    return table
+
+
+def forget_dataset(records: list[dict[str, str]]):
+    """Drops the CandleTable kept for a list of csv records, e.g. after editing
+    records in place
+
+    Args:
+        records (list[dict[str, str]]): the records
+    """
+    entry = _records_tables.get(id(records))
+    if entry is not None and entry[0] is records:
+        del _records_tables[id(records)]
+
+
+def as_candle_table(data: Union[CandleTable, list[dict[str, str]]]) -> CandleTable:
+    """Returns the CandleTable for a dataset, converting a list of csv records
+    (once per list, see records_table).
+
+    Args:
+        data (Union[CandleTable, list[dict[str, str]]]): the dataset
+
+    Raises:
+        ColumnNotFoundException: if a record misses one of the candle columns
+
+    Returns:
+        CandleTable: the columnar version of the dataset
+    """
+    if isinstance(data, CandleTable):
+        return data
+    if isinstance(data, list):
+        table = records_table(data)
+        if table is not None:
+            return table
+    return CandleTable.from_records(data)
+
+
+def record_columns(
+    records: Iterable[dict[str, str]], names: Iterable[str]
+) -> dict[str, array]:
+    """Parses only the given base columns of csv records into typed arrays
+
+    Args:
+        records (Iterable[dict[str, str]]): the records
+        names (Iterable[str]): the base columns to parse
+
+    Raises:
+        ColumnNotFoundException: if a record misses one of the columns
+
+    Returns:
+        dict[str, array]: the parsed columns
+    """
+    records = records if isinstance(records, list) else list(records)
+    columns = {}
+    try:
+        for name in names:
+            columns[name] = array(
+                COLUMN_TYPE_CODES[name],
+                [parse_field(name, record[name]) for record in records],
+            )
+    except KeyError:
+        raise ColumnNotFoundException("Error: requested column is missing from dataset")
+    return columns
+
+
+def compute_column(columns: dict[str, array], name: str) -> array:
+    """Returns a base column, or computes a derived column, from parsed base columns
+
+    Args:
+        columns (dict[str, array]): base columns, including required_columns(name)
+        name (str): the column name
+
+    Returns:
+        array: the column values
+    """
+    if name in COLUMN_TYPE_CODES:
+        return columns[name]
+    return DERIVED_COLUMNS[name][1](columns)
+
+
+def get_column(data: Union[CandleTable, list[dict[str, str]]], name: str) -> array:
+    """Returns a base or derived column of a dataset. Derived columns are
+    materialized on first use and kept on the table (for a list of csv records,
+    the table records_table keeps); for records missing some candle columns only
+    the columns the result needs are parsed, on every call.
+
+    Args:
+        data (Union[CandleTable, list[dict[str, str]]]): the dataset
+        name (str): the column name
+
+    Raises:
+        KeyError: if `name` is neither a dataset column nor a registered derived column
+        ColumnNotFoundException: if a record misses a column the result needs
+
+    Returns:
+        array: the column values
+    """
+    if not isinstance(data, CandleTable):
+        table = records_table(data) if isinstance(data, list) else None
+        if table is None:
+            return compute_column(record_columns(data, required_columns(name)), name)
+        data = table
+    if name in data.columns:
+        return data.columns[name]
+    if name not in data.derived:
+        data.derived[name] = compute_column(data.columns, name)
+    return data.derived[name]
+
+
+def get_column_in_time_range(
+    data: Union[CandleTable, list[dict[str, str]]],
+    name: str,
+    start_timestamp: int,
+    end_timestamp: int,
+) -> array:
+    """Returns the values of a column for the records between two timestamps.
+    A list of csv records is queried through its CandleTable (see records_table).
+    A table sorted by time is searched with bisect; an unsorted table, or records
+    missing some candle columns, are filtered record by record. Such records are
+    filtered on their time first, and only the matching ones are parsed, unless
+    the column depends on other records.
+
+    Args:
+        data (Union[CandleTable, list[dict[str, str]]]): the dataset
+        name (str): the column name
+        start_timestamp (int): start of the interval
+        end_timestamp (int): end of the interval (inclusive)
+
+    Returns:
+        array: the column values within the interval, in record order
+    """
+    if isinstance(data, list):
+        data = records_table(data) or data
+    if isinstance(data, CandleTable):
+        if data.is_sorted_by_time():
+            start_idx, end_idx = data.time_range_indices(start_timestamp, end_timestamp)
+            return get_column(data, name)[start_idx:end_idx]
+        times, values = data.columns["time"], get_column(data, name)
+    elif name not in CROSS_RECORD_COLUMNS:
+        times = record_columns(data, ("time",))["time"]
+        return compute_column(
+            record_columns(
+                [
+                    record
+                    for timestamp, record in zip(times, data)
+                    if start_timestamp <= timestamp <= end_timestamp
+                ],
+                required_columns(name),
+            ),
+            name,
+        )
+    else:
+        columns = record_columns(data, dict.fromkeys(("time",) + required_columns(name)))
+        times, values = columns["time"], compute_column(columns, name)
+    return array(
+        values.typecode,
+        [
+            value
+            for timestamp, value in zip(times, values)
+            if start_timestamp <= timestamp <= end_timestamp
+        ],
+    )
+
+
+@register_derived_column("daily_avg_price", ("volumeto", "volumefrom"))
+def daily_avg_price(columns: dict[str, array]) -> array:
+    # daily average price: volumeto / volumefrom
+    return array(
+        "d",
+        map(
+            lambda volume_to, volume_from: volume_to / volume_from,
+            columns["volumeto"],
+            columns["volumefrom"],
+        ),
+    )
+
+
+@register_derived_column("typical_price", ("high", "low", "close"))
+def typical_price(columns: dict[str, array]) -> array:
+    # typical price: (high + low + close) / 3
+    return array(
+        "d",
+        map(
+            lambda high, low, close: (high + low + close) / 3.0,
+            columns["high"],
+            columns["low"],
+            columns["close"],
+        ),
+    )
+
+
+@register_derived_column("price_range", ("high", "low"))
+def price_range(columns: dict[str, array]) -> array:
+    # daily range: high - low
+    return array(
+        "d",
+        map(lambda high, low: high - low, columns["high"], columns["low"]),
+    )
+
+
+@register_derived_column("returns", ("close",), row_wise=False)
+def returns(columns: dict[str, array]) -> array:
+    # simple close-to-close return, 0 for the first record
+    close = columns["close"]
+    if len(close) == 0:
+        return array("d")
+    return array(
+        "d",
+        [0.0]
+        + list(
+            map(
+                lambda previous, current: current / previous - 1.0,
+                close[:-1],
+                close[1:],
+            )
+        ),
+    )
@@ -1,17 +1,69 @@
 import calendar
 import time
+from constants import (
+    DATE_FORMAT,
+    DATETIME_FORMATS,
+    SECONDS_PER_DAY,
+    BAR_INTERVAL_SECONDS,
+)
+from candles import CandleTable
+from derived_columns import get_column, records_table
 
 
 def date_to_timestamp(input_date: str) -> int:
-    """This utility function converts date from string format "dd/mm/yyyy" to UNIX timestamp
+    """This utility function converts date from string format "dd/mm/yyyy" (or "dd/mm/yyyy HH:MM[:SS]") to UNIX timestamp
 
     Args:
         input_date (str): the input date string in format "dd/mm/yyyy" that we want to convert to timestamp
 
+    Raises:
+        ValueError: if the input date doesn't match any of the accepted formats
+
     Returns:
         int: the corresponding timestamp value of the passed string date value
     """
-    return calendar.timegm(time.strptime(input_date, "%d/%m/%Y"))
+    for date_format in (DATE_FORMAT,) + DATETIME_FORMATS:
+        try:
+            return calendar.timegm(time.strptime(input_date, date_format))
+        except ValueError:
+            continue
+    raise ValueError(f"time data {input_date!r} does not match format {DATE_FORMAT!r}")
+
+
+def date_range_to_timestamps(start_date: str, end_date: str) -> tuple[int, int]:
+    """Converts a date range to an inclusive timestamp interval.
+    An end date without a time of day covers that whole day, so that intraday
+    bars of the last day are included (daily bars are unaffected).
+
+    Args:
+        start_date (str): start date in "dd/mm/yyyy" or "dd/mm/yyyy HH:MM[:SS]" format
+        end_date (str): end date in "dd/mm/yyyy" or "dd/mm/yyyy HH:MM[:SS]" format
+
+    Returns:
+        tuple[int, int]: start and end timestamps
+    """
+    start_timestamp, end_timestamp = date_to_timestamp(start_date), date_to_timestamp(
+        end_date
+    )
+    if " " not in end_date.strip():
+        end_timestamp += SECONDS_PER_DAY - 1
+    return start_timestamp, end_timestamp
+
+
+def bar_label_format(bar_interval: int = BAR_INTERVAL_SECONDS) -> str:
+    """Returns the date format that identifies a bar uniquely for a bar interval
+
+    Args:
+        bar_interval (int, optional): bar interval in seconds. Defaults to BAR_INTERVAL_SECONDS.
+
+    Returns:
+        str: "%d/%m/%Y" for daily (or longer) bars, a date and time format otherwise
+    """
+    if bar_interval % SECONDS_PER_DAY == 0:
+        return DATE_FORMAT
+    if bar_interval % 60 == 0:
+        return DATETIME_FORMATS[0]
+    return DATETIME_FORMATS[1]
 
 
 def timestamp_to_date(input_timestamp: int, format: str = "%d/%m/%Y") -> str:
@@ -44,9 +96,7 @@ def filter_data_by_date_range(
         list[dict[str, str]]: filtered dataset that includes only records which fall in the filtering date interval
     """
     # convert from string format to timestamp
-    start_timestamp, end_timestamp = date_to_timestamp(start_date), date_to_timestamp(
-        end_date
-    )
+    start_timestamp, end_timestamp = date_range_to_timestamps(start_date, end_date)
 
     filtered_data = list(
         filter(
@@ -92,16 +142,19 @@ def calculate_window_moving_average(
     """
     # calculate window start and end indices
     # take into account cases when the date is very close to the start of the start of the dataset
-    end_idx = get_record_index(data, dt) + 1
-    start_idx = max(0, end_idx - window_size)
-
-    # extract list of the daily average prices (volumeto / volumefrom) for the corresponding dates
-    daily_avg_price_list = list(
-        map(
-            lambda record: float(record["volumeto"]) / float(record["volumefrom"]),
-            data[start_idx:end_idx],
-        )
-    )
+    # daily average prices (volumeto / volumefrom) for the corresponding dates:
+    # a slice of the table's cached column, or parsed from the window's records
+    # when the records can't be converted to a table
+    if isinstance(data, list):
+        data = records_table(data) or data
+    if isinstance(data, CandleTable):
+        end_idx = data.time_index(dt) + 1
+        start_idx = max(0, end_idx - window_size)
+        daily_avg_price_list = get_column(data, "daily_avg_price")[start_idx:end_idx]
+    else:
+        end_idx = get_record_index(data, dt) + 1
+        start_idx = max(0, end_idx - window_size)
+        daily_avg_price_list = get_column(data[start_idx:end_idx], "daily_avg_price")
 
     # return the window average
     return sum(daily_avg_price_list) * 1.0 / len(daily_avg_price_list)
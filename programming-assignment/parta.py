@@ -1,5 +1,6 @@
 import csv
-from helpers import filter_data_by_date_range
+from helpers import filter_data_by_date_range, date_range_to_timestamps
+from derived_columns import get_column_in_time_range
 
 
 # highest_price(data, start_date, end_date) -> float
@@ -41,13 +42,12 @@ def max_volume(data, start_date, end_date):
 # start_date: string in "dd/mm/yyyy" format
 # start_date: string in "dd/mm/yyyy" format
 def best_avg_price(data, start_date, end_date) -> float:
-    filtered_data = filter_data_by_date_range(data, start_date, end_date)
-    max_avg_price = max(
-        map(
-            lambda record: float(record["volumeto"]) / float(record["volumefrom"]),
-            filtered_data,
-        )
+    daily_averages = get_column_in_time_range(
+        data,
+        "daily_avg_price",
+        *date_range_to_timestamps(start_date, end_date),
     )
+    max_avg_price = max(daily_averages)
     return max_avg_price
 
 
@@ -56,12 +56,10 @@ def best_avg_price(data, start_date, end_date) -> float:
 # start_date: string in "dd/mm/yyyy" format
 # start_date: string in "dd/mm/yyyy" format
 def moving_average(data, start_date, end_date) -> float:
-    filtered_data = filter_data_by_date_range(data, start_date, end_date)
-    daily_averages = list(
-        map(
-            lambda record: float(record["volumeto"]) / float(record["volumefrom"]),
-            filtered_data,
-        )
+    daily_averages = get_column_in_time_range(
+        data,
+        "daily_avg_price",
+        *date_range_to_timestamps(start_date, end_date),
     )
     moving_avg = sum(daily_averages) * 1.0 / len(daily_averages)
     return round(moving_avg, 2)
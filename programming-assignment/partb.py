@@ -6,7 +6,8 @@ from exception_classes import (
     OutOfRangeDateException,
     InvalidDateRangeException,
 )
-from helpers import filter_data_by_date_range
+from helpers import filter_data_by_date_range, date_range_to_timestamps
+from derived_columns import get_column_in_time_range
 from exception_handling import validate_input_arguments
 
 
@@ -89,13 +90,12 @@ def best_avg_price(data, start_date, end_date):
         columns_to_check = ["time", "volumeto", "volumefrom"]
         validate_input_arguments(data, start_date, end_date, columns_to_check)
 
-        filtered_data = filter_data_by_date_range(data, start_date, end_date)
-        max_avg_price = max(
-            map(
-                lambda record: float(record["volumeto"]) / float(record["volumefrom"]),
-                filtered_data,
-            )
+        daily_averages = get_column_in_time_range(
+            data,
+            "daily_avg_price",
+            *date_range_to_timestamps(start_date, end_date),
         )
+        max_avg_price = max(daily_averages)
         return max_avg_price
     except (
         ColumnNotFoundException,
@@ -116,12 +116,10 @@ def moving_average(data, start_date, end_date):
         columns_to_check = ["time", "volumeto", "volumefrom"]
         validate_input_arguments(data, start_date, end_date, columns_to_check)
 
-        filtered_data = filter_data_by_date_range(data, start_date, end_date)
-        daily_averages = list(
-            map(
-                lambda record: float(record["volumeto"]) / float(record["volumefrom"]),
-                filtered_data,
-            )
+        daily_averages = get_column_in_time_range(
+            data,
+            "daily_avg_price",
+            *date_range_to_timestamps(start_date, end_date),
         )
         moving_avg = sum(daily_averages) * 1.0 / len(daily_averages)
         return round(moving_avg, 2)
@@ -1,30 +1,34 @@
 import csv
 from helpers import (
-    filter_data_by_date_range,
+    date_range_to_timestamps,
     timestamp_to_date,
+    bar_label_format,
     calculate_window_moving_average,
 )
-from constants import SHORT_WINDOW_SIZE, LONG_WINDOW_SIZE
+from derived_columns import get_column_in_time_range
+from constants import SHORT_WINDOW_SIZE, LONG_WINDOW_SIZE, BAR_INTERVAL_SECONDS
 
 
 # moving_avg_short(data, start_date, end_date) -> dict
 # data: the data from a csv file
 # start_date: string in "dd/mm/yyyy" format
 # start_date: string in "dd/mm/yyyy" format
+# bar_interval: candle interval in seconds, one day by default
 def moving_avg_short(
-    data: list[dict[str, str]], start_date: str, end_date: str
+    data: list[dict[str, str]],
+    start_date: str,
+    end_date: str,
+    bar_interval: int = BAR_INTERVAL_SECONDS,
 ) -> dict[str, float]:
     # List of dates between `start_date` and `end_date`
-    dates_list = list(
-        map(
-            lambda record: int(record.get("time")),
-            filter_data_by_date_range(data, start_date, end_date),
-        )
+    dates_list = get_column_in_time_range(
+        data, "time", *date_range_to_timestamps(start_date, end_date)
     )
 
-    # store the moving average value for each date
+    # store the moving average value for each date (each bar for intraday data)
+    label_format = bar_label_format(bar_interval)
     short_moving_avg_dict = {
-        timestamp_to_date(dt): calculate_window_moving_average(
+        timestamp_to_date(dt, label_format): calculate_window_moving_average(
             data, dt, SHORT_WINDOW_SIZE
         )
         for dt in dates_list
@@ -37,20 +41,22 @@ def moving_avg_short(
 # data: the data from a csv file
 # start_date: string in "dd/mm/yyyy" format
 # start_date: string in "dd/mm/yyyy" format
+# bar_interval: candle interval in seconds, one day by default
 def moving_avg_long(
-    data: list[dict[str, str]], start_date: str, end_date: str
+    data: list[dict[str, str]],
+    start_date: str,
+    end_date: str,
+    bar_interval: int = BAR_INTERVAL_SECONDS,
 ) -> dict[str, float]:
     # List of dates betwenn `start_date` and `end_date`
-    dates_list = list(
-        map(
-            lambda record: int(record.get("time")),
-            filter_data_by_date_range(data, start_date, end_date),
-        )
+    dates_list = get_column_in_time_range(
+        data, "time", *date_range_to_timestamps(start_date, end_date)
     )
 
-    # store the moving average value for each date
+    # store the moving average value for each date (each bar for intraday data)
+    label_format = bar_label_format(bar_interval)
     long_moving_avg_dict = {
-        timestamp_to_date(dt): calculate_window_moving_average(
+        timestamp_to_date(dt, label_format): calculate_window_moving_average(
             data, dt, LONG_WINDOW_SIZE
         )
         for dt in dates_list
@@ -125,9 +131,12 @@ def find_sell_list(
 # data: the data from a csv file
 # start_date: string in "dd/mm/yyyy" format
 # start_date: string in "dd/mm/yyyy" format
-def crossover_method(data, start_date, end_date) -> list[list[str], list[str]]:
-    short_moving_avg_dict = moving_avg_short(data, start_date, end_date)
-    long_moving_avg_dict = moving_avg_long(data, start_date, end_date)
+# bar_interval: candle interval in seconds, one day by default
+def crossover_method(
+    data, start_date, end_date, bar_interval: int = BAR_INTERVAL_SECONDS
+) -> list[list[str], list[str]]:
+    short_moving_avg_dict = moving_avg_short(data, start_date, end_date, bar_interval)
+    long_moving_avg_dict = moving_avg_long(data, start_date, end_date, bar_interval)
 
     buy_dict = find_buy_list(short_moving_avg_dict, long_moving_avg_dict)
     sell_dict = find_sell_list(short_moving_avg_dict, long_moving_avg_dict)
@@ -11,8 +11,9 @@ from linear_regression import (
     calculate_line_slope,
     calculate_line_y_intercept,
 )
-from constants import SECONDS_PER_DAY
-from helpers import filter_data_by_date_range
+from constants import BAR_INTERVAL_SECONDS
+from helpers import filter_data_by_date_range, date_range_to_timestamps
+from derived_columns import get_column_in_time_range
 from exception_handling import validate_input_arguments
 
 
@@ -21,6 +22,7 @@ from exception_handling import validate_input_arguments
 # 	start date
 # 	end date
 # 	data
+# 	bar interval (seconds)
 # Functions
 # 	highest_price(data, start_date, end_date) -> float
 # 	lowest_price(data, start_date, end_date) -> float
@@ -28,10 +30,18 @@ from exception_handling import validate_input_arguments
 # 	best_avg_price(data, start_date, end_date) -> float
 # 	moving_average(data, start_date, end_date) -> float
 class Investment:
-    def __init__(self, data: list[dict[str, str]], start_date: str, end_date: str):
+    def __init__(
+        self,
+        data: list[dict[str, str]],
+        start_date: str,
+        end_date: str,
+        bar_interval: int = BAR_INTERVAL_SECONDS,
+    ):
         self.data = data
         self.start_date = start_date
         self.end_date = end_date
+        # candle interval in seconds, one day for the cryptocompare dataset
+        self.bar_interval = bar_interval
 
     def highest_price(
         self,
@@ -143,14 +153,12 @@ class Investment:
             columns_to_check = ["time", "volumeto", "volumefrom"]
             validate_input_arguments(data, start_date, end_date, columns_to_check)
 
-            filtered_data = filter_data_by_date_range(data, start_date, end_date)
-            max_avg_price = max(
-                map(
-                    lambda record: float(record["volumeto"])
-                    / float(record["volumefrom"]),
-                    filtered_data,
-                )
+            daily_averages = get_column_in_time_range(
+                data,
+                "daily_avg_price",
+                *date_range_to_timestamps(start_date, end_date),
             )
+            max_avg_price = max(daily_averages)
             return max_avg_price
         except (
             ColumnNotFoundException,
@@ -178,13 +186,10 @@ class Investment:
             columns_to_check = ["time", "volumeto", "volumefrom"]
             validate_input_arguments(data, start_date, end_date, columns_to_check)
 
-            filtered_data = filter_data_by_date_range(data, start_date, end_date)
-            daily_averages = list(
-                map(
-                    lambda record: float(record["volumeto"])
-                    / float(record["volumefrom"]),
-                    filtered_data,
-                )
+            daily_averages = get_column_in_time_range(
+                data,
+                "daily_avg_price",
+                *date_range_to_timestamps(start_date, end_date),
             )
             moving_avg = sum(daily_averages) * 1.0 / len(daily_averages)
             return round(moving_avg, 2)
@@ -201,27 +206,30 @@ class Investment:
 # predict_next_average(investment) -> float
 # investment: Investment type
 def predict_next_average(investment: Investment) -> float:
-    # filter data by start_date and end_date intervals
-    # start_timestamp, end_timestamp = date_to_timestamp(investment.start_date), date_to_timestamp(investment.end_date)
-    # data = list(filter(lambda x: start_timestamp <= int(x.get("time")) <= end_timestamp, investment.data))
-    data = filter_data_by_date_range(
-        investment.data, investment.start_date, investment.end_date
+    # start_date and end_date interval as timestamps
+    start_timestamp, end_timestamp = date_range_to_timestamps(
+        investment.start_date, investment.end_date
     )
 
     # building x and y vectors
-    x_list = list(map(lambda record: float(record.get("time")), data))
-    y_list = list(
+    x_list = list(
         map(
-            lambda record: float(record["volumeto"]) / float(record["volumefrom"]), data
+            float,
+            get_column_in_time_range(
+                investment.data, "time", start_timestamp, end_timestamp
+            ),
         )
     )
+    y_list = get_column_in_time_range(
+        investment.data, "daily_avg_price", start_timestamp, end_timestamp
+    )
 
     # calculating slope and y-intercept of the regression line
     line_slope = calculate_line_slope(x_list, y_list)
     line_y_intercept = calculate_line_y_intercept(x_list, y_list, line_slope)
 
-    # getting prediction for the next day
-    sample_x = x_list[-1] + SECONDS_PER_DAY
+    # getting prediction for the next bar (the next day for daily candles)
+    sample_x = x_list[-1] + investment.bar_interval
     prediction = line_slope * sample_x + line_y_intercept
 
     return prediction
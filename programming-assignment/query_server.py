@@ -0,0 +1,327 @@
+"""
+    Long-running query server: loads the dataset once and answers part A-D
+    queries over a Unix socket using line-delimited JSON.
+
+    Request:  {"id": 1, "query": "highest_price", "start_date": "01/01/2016", "end_date": "31/01/2016"}
+    Response: {"id": 1, "ok": true, "result": 462.92}
+              {"id": 1, "ok": false, "error": "Error: date value is out of range"}
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+from candles import CandleTable
+from derived_columns import get_column_in_time_range
+from exception_classes import (
+    ColumnNotFoundException,
+    InvalidDateTypeException,
+    OutOfRangeDateException,
+    InvalidDateRangeException,
+)
+from exception_handling import validate_input_arguments
+from helpers import date_range_to_timestamps
+from partc import crossover_method
+from partd import Investment, predict_next_average, classify_trend
+
+DEFAULT_SOCKET_PATH = "/tmp/cs917_query.sock"
+DEFAULT_DATASET_PATH = "cryptocompare_btc.csv"
+
+# columns each query needs, checked by validate_input_arguments
+QUERY_COLUMNS = {
+    "highest_price": ["time", "high"],
+    "lowest_price": ["time", "low"],
+    "max_volume": ["time", "volumefrom"],
+    "best_avg_price": ["time", "volumeto", "volumefrom"],
+    "moving_average": ["time", "volumeto", "volumefrom"],
+    "crossover_method": ["time", "volumeto", "volumefrom"],
+    "predict_next_average": ["time", "volumeto", "volumefrom"],
+    "classify_trend": ["time", "high", "low"],
+}
+
+VALIDATION_EXCEPTIONS = (
+    ColumnNotFoundException,
+    InvalidDateTypeException,
+    OutOfRangeDateException,
+    InvalidDateRangeException,
+)
+
+
+class QueryEngine:
+    """Holds the loaded dataset and answers queries against it"""
+
+    def __init__(self, table: CandleTable):
+        self.table = table
+        self.columns = table.columns
+
+    def range_column(self, name: str, start_date: str, end_date: str) -> array:
+        """Returns a column over the rows between two dates. Like the part A-D
+        functions, this goes through get_column_in_time_range, which only uses
+        binary search on a table sorted by time
+
+        Args:
+            name (str): the column name
+            start_date (str): start date in "dd/mm/yyyy" format
+            end_date (str): end date in "dd/mm/yyyy" format
+
+        Raises:
+            OutOfRangeDateException: if no row lies between the dates
+
+        Returns:
+            array: the column values within the range
+        """
+        values = get_column_in_time_range(
+            self.table, name, *date_range_to_timestamps(start_date, end_date)
+        )
+        if not values:
+            raise OutOfRangeDateException("Error: no data in the date range")
+        return values
+
+    def highest_price(self, start_date: str, end_date: str) -> float:
+        return max(self.range_column("high", start_date, end_date))
+
+    def lowest_price(self, start_date: str, end_date: str) -> float:
+        return min(self.range_column("low", start_date, end_date))
+
+    def max_volume(self, start_date: str, end_date: str) -> float:
+        return max(self.range_column("volumefrom", start_date, end_date))
+
+    def daily_averages(self, start_date: str, end_date: str) -> array:
+        return self.range_column("daily_avg_price", start_date, end_date)
+
+    def best_avg_price(self, start_date: str, end_date: str) -> float:
+        return max(self.daily_averages(start_date, end_date))
+
+    def moving_average(self, start_date: str, end_date: str) -> float:
+        daily_averages = self.daily_averages(start_date, end_date)
+        return round(sum(daily_averages) * 1.0 / len(daily_averages), 2)
+
+    def crossover_method(self, start_date: str, end_date: str) -> list[list[str]]:
+        return crossover_method(self.table, start_date, end_date)
+
+    def predict_next_average(self, start_date: str, end_date: str) -> float:
+        return predict_next_average(Investment(self.table, start_date, end_date))
+
+    def classify_trend(self, start_date: str, end_date: str) -> str:
+        return classify_trend(Investment(self.table, start_date, end_date))
+
+
+# queries doing per-date work over the range, run in the worker processes. The
+# range aggregates are a binary search plus one slice scan and are answered inline.
+SLOW_QUERIES = {"crossover_method", "predict_next_average", "classify_trend"}
+
+# longest request line accepted, in bytes
+MAX_REQUEST_SIZE = 64 * 1024
+
+
+def error_response(request_id: Any, ex: Exception) -> dict[str, Any]:
+    """Builds the reply to a request that failed
+
+    Args:
+        request_id (Any): the id of the request
+        ex (Exception): the exception raised while answering it
+
+    Returns:
+        dict[str, Any]: the error response
+    """
+    if isinstance(ex, VALIDATION_EXCEPTIONS + (ValueError, TypeError)):
+        # ValueError/TypeError: malformed JSON, unknown query, empty date range, ...
+        message = str(ex)
+    else:
+        # e.g. ZeroDivisionError from a regression over a single bar
+        message = f"Error: {type(ex).__name__}: {ex}"
+    return {"id": request_id, "ok": False, "error": message}
+
+
+def answer_request(engine: QueryEngine, request: dict[str, Any]) -> dict[str, Any]:
+    """Validates and answers one request synchronously. Never raises: any
+    exception becomes an error response
+
+    Args:
+        engine (QueryEngine): the engine holding the dataset
+        request (dict[str, Any]): the decoded request
+
+    Returns:
+        dict[str, Any]: the response
+    """
+    request_id = request.get("id")
+    try:
+        query = request.get("query")
+        if query not in QUERY_COLUMNS:
+            raise ValueError(f"Error: unknown query {query!r}")
+        start_date, end_date = request.get("start_date"), request.get("end_date")
+        if not isinstance(start_date, str) or not isinstance(end_date, str):
+            raise InvalidDateTypeException("Error: invalid date value")
+        validate_input_arguments(
+            engine.table, start_date, end_date, QUERY_COLUMNS[query]
+        )
+        query_function: Callable = getattr(engine, query)
+        result = query_function(start_date, end_date)
+        return {"id": request_id, "ok": True, "result": result}
+    except Exception as ex:
+        return error_response(request_id, ex)
+
+
+# the engine of a worker process, set by _init_worker
+_worker_engine = None
+
+
+def _init_worker(table: CandleTable):
+    global _worker_engine
+    _worker_engine = QueryEngine(table)
+
+
+def _answer_in_worker(request: dict[str, Any]) -> dict[str, Any]:
+    return answer_request(_worker_engine, request)
+
+
+class QueryServer:
+    """asyncio Unix socket server. Every client connection is its own task, so
+    many clients are served concurrently; CPU-heavy queries go to a pool of
+    worker processes (each holding its own copy of the dataset), so they run
+    in parallel and don't block the event loop.
+    """
+
+    def __init__(self, engine: QueryEngine, socket_path: str, max_workers: int = 4):
+        self.engine = engine
+        self.socket_path = socket_path
+        # workers are spawned, not forked: a forked worker would inherit the client
+        # sockets open at the time and keep those connections from ever closing
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(engine.table,),
+        )
+        self.server = None
+
+    def answer(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Answers one request synchronously in this process, see answer_request
+
+        Args:
+            request (dict[str, Any]): the decoded request
+
+        Returns:
+            dict[str, Any]: the response
+        """
+        return answer_request(self.engine, request)
+
+    async def handle_request(self, line: bytes) -> dict[str, Any]:
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Error: request must be a JSON object")
+            request_id = request.get("id")
+            if request.get("query") in SLOW_QUERIES:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self.executor, _answer_in_worker, request
+                )
+            return self.answer(request)
+        except Exception as ex:
+            # malformed JSON, or the worker pool failing (e.g. a worker was killed)
+            return error_response(request_id, ex)
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as ex:
+                    # the client closed the connection, maybe after an unterminated request
+                    line = ex.partial
+                    if not line.strip():
+                        break
+                except asyncio.LimitOverrunError:
+                    # the rest of the line can't be told apart from the next request
+                    response = {
+                        "id": None,
+                        "ok": False,
+                        "error": "Error: request too long",
+                    }
+                    writer.write(json.dumps(response).encode() + b"\n")
+                    await writer.drain()
+                    break
+                if not line.strip():
+                    continue
+                response = await self.handle_request(line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.server = await asyncio.start_unix_server(
+            self.handle_client, path=self.socket_path, limit=MAX_REQUEST_SIZE
+        )
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+        self.executor.shutdown(wait=False)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class QueryClient:
+    """Minimal blocking client keeping one connection open for many queries"""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path)
+        self.stream = self.sock.makefile("rwb")
+        self.next_id = 0
+
+    def query(self, query: str, start_date: str, end_date: str) -> dict[str, Any]:
+        self.next_id += 1
+        request = {
+            "id": self.next_id,
+            "query": query,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+        self.stream.write(json.dumps(request).encode() + b"\n")
+        self.stream.flush()
+        return json.loads(self.stream.readline())
+
+    def close(self):
+        self.stream.close()
+        self.sock.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CS917 dataset query server")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH)
+    parser.add_argument("--data", default=DEFAULT_DATASET_PATH)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    query_server = QueryServer(
+        QueryEngine(CandleTable.from_csv(args.data)), args.socket, args.workers
+    )
+    print(f"serving {args.data} on {args.socket}")
+    try:
+        asyncio.run(query_server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        query_server.close()
@@ -0,0 +1,124 @@
+"""
+    Rolling-window statistics computed for every record in one fused O(n) pass:
+    monotonic deques for the rolling max/min, running sums for mean, volatility and volume
+"""
+
+from array import array
+from collections import deque
+from math import sqrt
+from typing import Union
+
+from candles import CandleTable
+from derived_columns import as_candle_table, get_column
+from helpers import date_range_to_timestamps
+
+ROLLING_STATISTICS = (
+    "rolling_high",  # highest "high" in the window
+    "rolling_low",  # lowest "low" in the window
+    "rolling_mean",  # mean of the daily average price
+    "rolling_volatility",  # standard deviation of the daily average price
+    "rolling_volume",  # total "volumefrom" in the window
+)
+
+
+def rolling_statistics(
+    data: Union[CandleTable, list[dict[str, str]]], window_size: int
+) -> dict[str, array]:
+    """Computes all rolling statistics for every record of the dataset.
+
+    The window of record i covers records max(0, i - window_size + 1)..i, the same
+    window as helpers.calculate_window_moving_average, so the first windows are partial.
+
+    Args:
+        data (Union[CandleTable, list[dict[str, str]]]): the dataset
+        window_size (int): the window size
+
+    Raises:
+        ValueError: if window_size is smaller than 1
+
+    Returns:
+        dict[str, array]: one array per statistic in ROLLING_STATISTICS, aligned with the records
+    """
+    if window_size < 1:
+        raise ValueError("window size must be at least 1")
+
+    table = as_candle_table(data)
+    high, low = table.columns["high"], table.columns["low"]
+    volume = table.columns["volumefrom"]
+    price = get_column(table, "daily_avg_price")
+
+    result = {statistic: array("d") for statistic in ROLLING_STATISTICS}
+    rolling_high, rolling_low = result["rolling_high"], result["rolling_low"]
+    rolling_mean = result["rolling_mean"]
+    rolling_volatility = result["rolling_volatility"]
+    rolling_volume = result["rolling_volume"]
+
+    # indices whose values are decreasing (max) / increasing (min); the front is the window extreme
+    max_deque, min_deque = deque(), deque()
+    price_sum = price_square_sum = volume_sum = 0.0
+
+    for idx in range(len(table)):
+        # values entering the window
+        while max_deque and high[max_deque[-1]] <= high[idx]:
+            max_deque.pop()
+        max_deque.append(idx)
+        while min_deque and low[min_deque[-1]] >= low[idx]:
+            min_deque.pop()
+        min_deque.append(idx)
+        price_sum += price[idx]
+        price_square_sum += price[idx] * price[idx]
+        volume_sum += volume[idx]
+
+        # value leaving the window
+        expired_idx = idx - window_size
+        if expired_idx >= 0:
+            if max_deque[0] == expired_idx:
+                max_deque.popleft()
+            if min_deque[0] == expired_idx:
+                min_deque.popleft()
+            price_sum -= price[expired_idx]
+            price_square_sum -= price[expired_idx] * price[expired_idx]
+            volume_sum -= volume[expired_idx]
+
+        count = min(idx + 1, window_size)
+        mean = price_sum / count
+        # population variance; clamp rounding noise of the running sums at 0
+        variance = max(0.0, price_square_sum / count - mean * mean)
+
+        rolling_high.append(high[max_deque[0]])
+        rolling_low.append(low[min_deque[0]])
+        rolling_mean.append(mean)
+        rolling_volatility.append(sqrt(variance))
+        rolling_volume.append(volume_sum)
+
+    return result
+
+
+def rolling_statistics_by_date(
+    data: Union[CandleTable, list[dict[str, str]]],
+    start_date: str,
+    end_date: str,
+    window_size: int,
+) -> dict[str, dict[int, float]]:
+    """Rolling statistics for the records between two dates, keyed by statistic then timestamp.
+    Windows may reach back before `start_date`, like partc's moving averages.
+
+    Args:
+        data (Union[CandleTable, list[dict[str, str]]]): the dataset
+        start_date (str): start date in "dd/mm/yyyy" format
+        end_date (str): end date in "dd/mm/yyyy" format
+        window_size (int): the window size
+
+    Returns:
+        dict[str, dict[int, float]]: {statistic: {timestamp: value}}
+    """
+    table = as_candle_table(data)
+    start_idx, end_idx = table.time_range_indices(
+        *date_range_to_timestamps(start_date, end_date)
+    )
+    statistics = rolling_statistics(table, window_size)
+    times = table.columns["time"][start_idx:end_idx]
+    return {
+        statistic: dict(zip(times, values[start_idx:end_idx]))
+        for statistic, values in statistics.items()
+    }
@@ -0,0 +1,83 @@
+import gzip
+import io
+import os
+
+import pytest
+
+from candles import CandleTable
+from constants import BAR_INTERVALS, SECONDS_PER_DAY
+from helpers import bar_label_format, date_range_to_timestamps, date_to_timestamp
+from partc import crossover_method
+from partd import Investment, predict_next_average
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), "cryptocompare_btc.csv")
+
+
+def test_date_and_datetime_formats():
+    assert date_to_timestamp("02/01/2016") == date_to_timestamp("01/01/2016") + 86400
+    day_start = date_to_timestamp("01/01/2016")
+    assert date_to_timestamp("01/01/2016 01:30") == day_start + 5400
+    assert date_to_timestamp("01/01/2016 00:00:07") == day_start + 7
+    with pytest.raises(ValueError):
+        date_to_timestamp("2016-01-01")
+
+
+def test_date_only_end_date_covers_the_whole_day():
+    start_timestamp, end_timestamp = date_range_to_timestamps(
+        "01/01/2016", "01/01/2016"
+    )
+    assert end_timestamp - start_timestamp == SECONDS_PER_DAY - 1
+    _, end_timestamp = date_range_to_timestamps("01/01/2016", "01/01/2016 12:00")
+    assert end_timestamp == start_timestamp + 12 * 3600
+
+
+def test_bar_label_formats():
+    assert bar_label_format(BAR_INTERVALS["1d"]) == "%d/%m/%Y"
+    assert bar_label_format(BAR_INTERVALS["1h"]) == "%d/%m/%Y %H:%M"
+    assert bar_label_format(30) == "%d/%m/%Y %H:%M:%S"
+
+
+def hourly_csv(hours: int) -> str:
+    start_timestamp = date_to_timestamp("01/01/2020")
+    lines = ["time,high,low,open,close,volumefrom,volumeto"]
+    for hour in range(hours):
+        price = 100.0 + hour
+        lines.append(
+            f"{start_timestamp + hour * 3600},"
+            f"{price + 1},{price - 1},{price},{price},1.0,{price}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def test_streaming_ingestion_in_chunks(tmp_path):
+    text = hourly_csv(100)
+    table = CandleTable.from_csv_stream(io.StringIO(text), chunk_size=7)
+    assert len(table) == 100
+    assert list(table.column("close")) == [100.0 + hour for hour in range(100)]
+
+    gzip_path = tmp_path / "hourly.csv.gz"
+    with gzip.open(gzip_path, "wt") as f:
+        f.write(text)
+    assert list(CandleTable.from_csv(str(gzip_path)).column("time")) == list(
+        table.column("time")
+    )
+
+
+def test_intraday_crossover_labels_and_prediction():
+    table = CandleTable.from_csv_stream(io.StringIO(hourly_csv(48)))
+    buy_list, sell_list = crossover_method(
+        table, "01/01/2020 00:00", "02/01/2020", BAR_INTERVALS["1h"]
+    )
+    # the windows are the same until the short one is full, then the short one leads
+    assert buy_list == ["01/01/2020 03:00"] and sell_list == []
+    # prices rise by 1 per hour: the next bar is predicted one hour later
+    investment = Investment(table, "01/01/2020", "01/01/2020", BAR_INTERVALS["1h"])
+    assert predict_next_average(investment) == pytest.approx(124.0)
+
+
+def test_daily_dataset_is_unchanged():
+    table = CandleTable.from_csv(DATASET_PATH)
+    assert crossover_method(table, "01/05/2017", "12/06/2017") == [
+        ["01/06/2017"],
+        ["28/05/2017"],
+    ]
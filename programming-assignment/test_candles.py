@@ -0,0 +1,79 @@
+import csv
+import os
+import pickle
+
+import pytest
+
+from candles import CANDLE_COLUMNS, Candle, CandleTable
+from exception_classes import ColumnNotFoundException
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), "cryptocompare_btc.csv")
+
+
+@pytest.fixture(scope="module")
+def records() -> list[dict[str, str]]:
+    with open(DATASET_PATH, "r") as f:
+        return list(csv.DictReader(f))[:50]
+
+
+def test_candle_parses_fields_once(records):
+    candle = Candle.from_dict(records[0])
+    assert candle.time == int(records[0]["time"])
+    assert candle["high"] == float(records[0]["high"])
+    assert candle.get("missing", 1) == 1
+    assert candle.keys() == CANDLE_COLUMNS
+    assert candle.to_dict() == {
+        column: (int if column == "time" else float)(records[0][column])
+        for column in CANDLE_COLUMNS
+    }
+    with pytest.raises(KeyError):
+        candle["missing"]
+
+
+def test_candle_without_a_column(records):
+    record = dict(records[0])
+    del record["close"]
+    with pytest.raises(ColumnNotFoundException):
+        Candle.from_dict(record)
+    with pytest.raises(ColumnNotFoundException):
+        CandleTable.from_records([record])
+
+
+def test_table_rows_read_like_records(records):
+    table = CandleTable.from_records(records)
+    assert len(table) == len(records)
+    for view, record in zip(table, records):
+        assert view["time"] == int(record["time"])
+        assert view.low == float(record["low"])
+    assert table[-1].time == int(records[-1]["time"])
+    with pytest.raises(IndexError):
+        table[len(records)]
+
+
+def test_scan_reuses_one_cursor(records):
+    table = CandleTable.from_records(records)
+    cursors = {id(cursor) for cursor in table.scan()}
+    assert len(cursors) == 1
+    assert [candle.to_dict() for candle in table.to_candles()] == [
+        Candle.from_dict(record).to_dict() for record in records
+    ]
+
+
+def test_slices_and_time_lookups(records):
+    table = CandleTable.from_records(records)
+    part = table[10:20]
+    assert isinstance(part, CandleTable) and len(part) == 10
+    assert table.time_index(int(records[7]["time"])) == 7
+    assert table.time_index(0) == -1
+    start_idx, end_idx = table.time_range_indices(
+        int(records[3]["time"]), int(records[5]["time"])
+    )
+    assert (start_idx, end_idx) == (3, 6)
+
+
+def test_table_is_picklable(records):
+    table = CandleTable.from_records(records)
+    copy = pickle.loads(pickle.dumps(table))
+    assert list(copy.column("close")) == list(table.column("close"))
+    with pytest.raises(ColumnNotFoundException):
+        table.column("missing")
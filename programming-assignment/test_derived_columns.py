@@ -0,0 +1,165 @@
+import csv
+import os
+
+import pytest
+
+import parta
+from candles import CandleTable
+import derived_columns
+from derived_columns import (
+    DERIVED_COLUMNS,
+    forget_dataset,
+    get_column,
+    get_column_in_time_range,
+)
+from helpers import calculate_window_moving_average, date_to_timestamp
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), "cryptocompare_btc.csv")
+
+
+@pytest.fixture(scope="module")
+def records() -> list[dict[str, str]]:
+    with open(DATASET_PATH, "r") as f:
+        return list(csv.DictReader(f))
+
+
+def daily_averages_by_filter(records, start_timestamp, end_timestamp):
+    return [
+        float(record["volumeto"]) / float(record["volumefrom"])
+        for record in records
+        if start_timestamp <= int(record["time"]) <= end_timestamp
+    ]
+
+
+def test_list_and_table_agree_with_linear_filter(records):
+    start_timestamp = date_to_timestamp("01/01/2016")
+    end_timestamp = date_to_timestamp("31/01/2016")
+    expected = daily_averages_by_filter(records, start_timestamp, end_timestamp)
+    table = CandleTable.from_records(records)
+    for data in (records, table):
+        values = get_column_in_time_range(
+            data, "daily_avg_price", start_timestamp, end_timestamp
+        )
+        assert list(values) == pytest.approx(expected)
+
+
+def test_records_with_only_the_needed_columns(records):
+    partial = [
+        {column: record[column] for column in ("time", "volumeto", "volumefrom")}
+        for record in records
+    ]
+    assert parta.moving_average(partial, "01/01/2016", "31/01/2016") == (
+        parta.moving_average(records, "01/01/2016", "31/01/2016")
+    )
+    assert parta.best_avg_price(partial, "01/01/2016", "31/01/2016") == (
+        parta.best_avg_price(records, "01/01/2016", "31/01/2016")
+    )
+
+
+def test_in_place_edit_of_records_is_seen(records):
+    data = [dict(record) for record in records[:10]]
+    first = get_column(data, "daily_avg_price")[0]
+    data[0]["volumeto"] = str(float(data[0]["volumeto"]) * 2)
+    forget_dataset(data)
+    assert get_column(data, "daily_avg_price")[0] == pytest.approx(2 * first)
+
+
+def test_unsorted_records_and_tables(records):
+    data = list(reversed(records))
+    start_timestamp = date_to_timestamp("01/02/2016")
+    end_timestamp = date_to_timestamp("28/02/2016")
+    expected = daily_averages_by_filter(data, start_timestamp, end_timestamp)
+    table = CandleTable.from_records(data)
+    assert not table.is_sorted_by_time()
+    for dataset in (data, table):
+        values = get_column_in_time_range(
+            dataset, "daily_avg_price", start_timestamp, end_timestamp
+        )
+        assert list(values) == pytest.approx(expected)
+    assert parta.best_avg_price(data, "01/02/2016", "28/02/2016") == max(expected)
+
+
+def test_window_moving_average_on_table_and_records(records):
+    table = CandleTable.from_records(records)
+    dt = int(records[100]["time"])
+    expected = sum(daily_averages_by_filter(records[91:101], 0, 2**62)) / 10
+    assert calculate_window_moving_average(records, dt, 10) == pytest.approx(expected)
+    assert calculate_window_moving_average(table, dt, 10) == pytest.approx(expected)
+
+
+def test_derived_columns_are_cached_on_tables(records):
+    table = CandleTable.from_records(records[:5])
+    assert get_column(table, "price_range") is get_column(table, "price_range")
+    assert list(get_column(table, "price_range")) == pytest.approx(
+        [float(record["high"]) - float(record["low"]) for record in records[:5]]
+    )
+    assert get_column(records[:5], "returns")[0] == 0.0
+
+
+def test_derived_columns_are_computed_once_for_records(records, monkeypatch):
+    requires, compute = DERIVED_COLUMNS["daily_avg_price"]
+    calls = []
+
+    def counting_compute(columns):
+        calls.append(len(columns["volumeto"]))
+        return compute(columns)
+
+    monkeypatch.setitem(DERIVED_COLUMNS, "daily_avg_price", (requires, counting_compute))
+    data = list(records)
+    for _ in range(3):
+        parta.best_avg_price(data, "01/02/2016", "28/02/2016")
+        parta.moving_average(data, "01/02/2016", "28/02/2016")
+        calculate_window_moving_average(data, date_to_timestamp("28/02/2016"), 10)
+    assert calls == [len(data)]
+
+    # a changed list is converted again
+    data.append(dict(data[-1]))
+    parta.best_avg_price(data, "01/02/2016", "28/02/2016")
+    assert calls == [len(data) - 1, len(data)]
+
+
+def test_partial_records_parse_only_the_rows_in_range(records, monkeypatch):
+    requires, compute = DERIVED_COLUMNS["daily_avg_price"]
+    calls = []
+
+    def counting_compute(columns):
+        calls.append(len(columns["volumeto"]))
+        return compute(columns)
+
+    monkeypatch.setitem(DERIVED_COLUMNS, "daily_avg_price", (requires, counting_compute))
+    partial = [
+        {column: record[column] for column in ("time", "volumeto", "volumefrom")}
+        for record in records
+    ]
+    start_timestamp = date_to_timestamp("01/01/2016")
+    end_timestamp = date_to_timestamp("31/01/2016")
+    values = get_column_in_time_range(
+        partial, "daily_avg_price", start_timestamp, end_timestamp
+    )
+    assert list(values) == pytest.approx(
+        daily_averages_by_filter(records, start_timestamp, end_timestamp)
+    )
+    assert calls == [len(values)]
+
+    # returns depend on the previous record, so they are computed on all records
+    closes = [{"time": record["time"], "close": record["close"]} for record in records]
+    assert get_column_in_time_range(
+        closes, "returns", start_timestamp, end_timestamp
+    ) == get_column_in_time_range(
+        CandleTable.from_records(records), "returns", start_timestamp, end_timestamp
+    )
+
+
+def test_records_tables_are_bounded(records):
+    datasets = [records[:n] for n in range(1, derived_columns.MAX_CACHED_DATASETS + 3)]
+    for data in datasets:
+        get_column(data, "daily_avg_price")
+    assert len(derived_columns._records_tables) <= derived_columns.MAX_CACHED_DATASETS
+    assert derived_columns.records_table(datasets[-1]) is derived_columns.as_candle_table(
+        datasets[-1]
+    )
+
+
+def test_unknown_column():
+    with pytest.raises(KeyError):
+        get_column([], "no_such_column")
@@ -0,0 +1,171 @@
+import asyncio
+import csv
+import json
+import os
+import tempfile
+
+import pytest
+
+import parta
+from candles import CandleTable
+from partc import crossover_method
+from helpers import date_range_to_timestamps
+from query_server import (
+    MAX_REQUEST_SIZE,
+    QueryEngine,
+    QueryServer,
+    answer_request,
+)
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), "cryptocompare_btc.csv")
+
+
+@pytest.fixture(scope="module")
+def records() -> list[dict[str, str]]:
+    with open(DATASET_PATH, "r") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.fixture(scope="module")
+def query_server():
+    with tempfile.TemporaryDirectory() as directory:
+        server = QueryServer(
+            QueryEngine(CandleTable.from_csv(DATASET_PATH)),
+            os.path.join(directory, "query.sock"),
+            max_workers=2,
+        )
+        yield server
+        server.close()
+
+
+def exchange(query_server: QueryServer, payload: bytes) -> list[dict]:
+    """Starts the server, sends raw bytes on one connection and reads every reply"""
+
+    async def run() -> list[dict]:
+        await query_server.start()
+        try:
+            reader, writer = await asyncio.open_unix_connection(
+                query_server.socket_path
+            )
+            writer.write(payload)
+            await writer.drain()
+            writer.write_eof()
+            replies = [json.loads(line) async for line in reader]
+            writer.close()
+            return replies
+        finally:
+            query_server.server.close()
+            await query_server.server.wait_closed()
+
+    return asyncio.run(run())
+
+
+def request(
+    request_id, query, start_date="01/01/2016", end_date="31/01/2016"
+) -> bytes:
+    request = {
+        "id": request_id,
+        "query": query,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+    return json.dumps(request).encode() + b"\n"
+
+
+def test_range_queries_match_parta(query_server, records):
+    replies = exchange(
+        query_server, request(1, "highest_price") + request(2, "moving_average")
+    )
+    assert [reply["result"] for reply in replies] == [
+        parta.highest_price(records, "01/01/2016", "31/01/2016"),
+        parta.moving_average(records, "01/01/2016", "31/01/2016"),
+    ]
+    assert [(reply["id"], reply["ok"]) for reply in replies] == [(1, True), (2, True)]
+
+
+def test_slow_query_runs_in_worker_process(query_server, records):
+    replies = exchange(
+        query_server, request(3, "crossover_method", "01/05/2017", "12/06/2017")
+    )
+    expected = crossover_method(records, "01/05/2017", "12/06/2017")
+    assert replies == [{"id": 3, "ok": True, "result": expected}]
+
+
+def test_failing_query_gets_an_error_reply(query_server):
+    # a regression over a single bar divides by zero
+    replies = exchange(
+        query_server,
+        request(4, "predict_next_average", "01/01/2016", "01/01/2016")
+        + request(5, "max_volume"),
+    )
+    assert replies[0]["id"] == 4 and replies[0]["ok"] is False
+    assert "ZeroDivisionError" in replies[0]["error"]
+    assert replies[1]["id"] == 5 and replies[1]["ok"] is True
+
+
+def test_invalid_requests(query_server):
+    replies = exchange(
+        query_server,
+        b"not json\n"
+        + request(6, "no_such_query")
+        + b"[1, 2]\n"
+        + request(7, "highest_price", "2016-01-01"),
+    )
+    assert [reply["ok"] for reply in replies] == [False] * 4
+    assert replies[1]["id"] == 6 and replies[3]["id"] == 7
+
+
+def test_unterminated_last_request_is_answered(query_server):
+    replies = exchange(query_server, request(8, "lowest_price").rstrip(b"\n"))
+    assert replies[0]["id"] == 8 and replies[0]["ok"] is True
+
+
+def test_too_long_request_closes_the_connection(query_server):
+    replies = exchange(
+        query_server, b" " * (2 * MAX_REQUEST_SIZE) + b"\n" + request(9, "lowest_price")
+    )
+    assert replies == [{"id": None, "ok": False, "error": "Error: request too long"}]
+
+
+@pytest.mark.parametrize(
+    "query", ["highest_price", "lowest_price", "max_volume", "best_avg_price"]
+)
+def test_unsorted_table_gives_the_same_answers(records, query):
+    sorted_engine = QueryEngine(CandleTable.from_records(records))
+    unsorted_engine = QueryEngine(CandleTable.from_records(records[::-1]))
+    assert not unsorted_engine.table.is_sorted_by_time()
+    query_request = {
+        "id": 1,
+        "query": query,
+        "start_date": "01/01/2016",
+        "end_date": "31/01/2016",
+    }
+    assert answer_request(unsorted_engine, query_request) == answer_request(
+        sorted_engine, query_request
+    )
+
+
+@pytest.mark.parametrize("query", ["highest_price", "moving_average"])
+def test_range_without_rows_gets_an_error_reply(records, query):
+    # a dataset with a gap: January 2016 removed
+    start_timestamp, end_timestamp = date_range_to_timestamps(
+        "01/01/2016", "31/01/2016"
+    )
+    engine = QueryEngine(
+        CandleTable.from_records(
+            record
+            for record in records
+            if not start_timestamp <= int(record["time"]) <= end_timestamp
+        )
+    )
+    query_request = {
+        "id": 7,
+        "query": query,
+        "start_date": "05/01/2016",
+        "end_date": "20/01/2016",
+    }
+    assert answer_request(engine, query_request) == {
+        "id": 7,
+        "ok": False,
+        "error": "Error: no data in the date range",
+    }
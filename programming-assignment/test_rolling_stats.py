@@ -0,0 +1,62 @@
+import csv
+import os
+import statistics
+
+import pytest
+
+from candles import CandleTable
+from helpers import calculate_window_moving_average
+from rolling_stats import (
+    ROLLING_STATISTICS,
+    rolling_statistics,
+    rolling_statistics_by_date,
+)
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), "cryptocompare_btc.csv")
+
+
+@pytest.fixture(scope="module")
+def records() -> list[dict[str, str]]:
+    with open(DATASET_PATH, "r") as f:
+        return list(csv.DictReader(f))[:200]
+
+
+@pytest.mark.parametrize("window_size", [1, 3, 10, 250])
+def test_matches_naive_windows(records, window_size):
+    result = rolling_statistics(records, window_size)
+    assert set(result) == set(ROLLING_STATISTICS)
+    for idx in range(len(records)):
+        window = records[max(0, idx - window_size + 1) : idx + 1]
+        prices = [float(r["volumeto"]) / float(r["volumefrom"]) for r in window]
+        assert result["rolling_high"][idx] == max(float(r["high"]) for r in window)
+        assert result["rolling_low"][idx] == min(float(r["low"]) for r in window)
+        assert result["rolling_mean"][idx] == pytest.approx(
+            statistics.fmean(prices)
+        )
+        assert result["rolling_volatility"][idx] == pytest.approx(
+            # running sums leave some rounding noise
+            statistics.pstdev(prices), abs=1e-3
+        )
+        assert result["rolling_volume"][idx] == pytest.approx(
+            sum(float(r["volumefrom"]) for r in window)
+        )
+
+
+def test_rolling_mean_matches_partc_window(records):
+    table = CandleTable.from_records(records)
+    result = rolling_statistics(table, 10)
+    for idx in (0, 5, 9, 150):
+        dt = table[idx].time
+        assert result["rolling_mean"][idx] == pytest.approx(
+            calculate_window_moving_average(table, dt, 10)
+        )
+
+
+def test_by_date(records):
+    result = rolling_statistics_by_date(records, "01/05/2015", "03/05/2015", 3)
+    assert list(result["rolling_high"]) == [int(r["time"]) for r in records[3:6]]
+
+
+def test_window_size_must_be_positive(records):
+    with pytest.raises(ValueError):
+        rolling_statistics(records, 0)